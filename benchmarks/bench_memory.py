@@ -0,0 +1,268 @@
+"""
+Benchmark de memória das estruturas mantidas por documento
+
+Para cada forma e tamanho do corpus (ver xml_corpus.py), carrega o
+documento como a interface faz (linha de base, uma versão alterada e o
+grid) e mede os bytes por elemento de cada estrutura retida:
+    initial_state       linha de base do parser
+    intermediate_state  versão anterior, usada no diff da próxima leitura
+    _element_cache      último resultado de parse_file_and_get_changes
+    grid_rows           GridViewModel (linhas, índice de busca e delta builder),
+                        que substitui os itens do Treeview
+    process_rss         aumento do RSS do processo com tudo carregado
+
+As estruturas são medidas com tracemalloc pelos bytes liberados ao
+descartar cada uma, nesta ordem: grid, cache, versão anterior, linha de
+base. Objetos compartilhados (ex.: textos iguais) contam para a última
+estrutura que os mantém. O RSS é medido numa passada separada, sem
+tracemalloc, e inclui a memória do lxml.
+
+Com --check, compara os bytes por elemento com os limites gravados em
+memory_thresholds.json e termina com código 1 se algum for ultrapassado;
+--update-thresholds regrava os limites a partir da medição atual.
+
+Uso:
+    python benchmarks/bench_memory.py [--shapes flat,wide] [--nodes 10000,100000]
+                                      [--check] [--update-thresholds] [--output resultados.json]
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gui.view_model import GridViewModel
+from utils.metrics import process_rss_bytes
+from utils.xml_parser import XMLParser
+from xml_corpus import SHAPES, write_corpus, write_document
+from bench_parser import CHANGE_FRACTION, environment
+
+STRUCTURES = ('initial_state', 'intermediate_state', '_element_cache', 'grid_rows', 'process_rss')
+
+# Limites de bytes por elemento, por estrutura e forma do corpus
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory_thresholds.json')
+
+# Folga aplicada sobre a medição ao regravar os limites
+THRESHOLD_MARGIN = 0.25
+
+# O RSS varia com o alocador e a plataforma (memória liberada é reaproveitada
+# sem voltar ao sistema): só é verificado com --check-rss, com folga maior
+RSS_STRUCTURES = ('process_rss',)
+RSS_THRESHOLD_MARGIN = 1.0
+
+def load_document(original: str, changed: str, work_path: str):
+    """
+    Carrega um documento como a interface: linha de base, versão alterada e grid
+
+    Returns:
+        tuple: (parser, view_model, número de elementos)
+    """
+    shutil.copyfile(original, work_path)
+    parser = XMLParser()
+    parser.parse_file_and_get_changes(work_path)
+    shutil.copyfile(changed, work_path)
+    data = parser.parse_file_and_get_changes(work_path)[0]
+    view_model = GridViewModel()
+    view_model.load(data)
+    view_model.delta_builder.reset(data)
+    return parser, view_model, len(data)
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def measure_structures(original: str, changed: str, work_path: str):
+    """
+    Bytes retidos por cada estrutura, medidos ao descartá-las
+
+    Returns:
+        tuple: ({estrutura: bytes}, número de elementos)
+    """
+    tracemalloc.start()
+    try:
+        parser, view_model, elements = load_document(original, changed, work_path)
+        sizes = {}
+
+        before = _traced()
+        del view_model
+        sizes['grid_rows'] = before - _traced()
+
+        before = _traced()
+        parser._element_cache.clear()
+        sizes['_element_cache'] = before - _traced()
+
+        before = _traced()
+        parser.intermediate_state = None
+        sizes['intermediate_state'] = before - _traced()
+
+        before = _traced()
+        parser.initial_state = None
+        sizes['initial_state'] = before - _traced()
+    finally:
+        tracemalloc.stop()
+    return sizes, elements
+
+def measure_rss(original: str, changed: str, work_path: str):
+    """Aumento do RSS com o documento carregado (None se não for possível medir)"""
+    gc.collect()
+    before = process_rss_bytes()
+    parser, view_model, _ = load_document(original, changed, work_path)
+    gc.collect()
+    after = process_rss_bytes()
+    del parser, view_model
+    if before is None or after is None:
+        return None
+    return max(0, after - before)
+
+def run(shapes, sizes, corpus_dir: str, seed: int = 0):
+    """
+    Executa o benchmark sobre o corpus (gerado em corpus_dir se ainda não existir)
+
+    Returns:
+        List[Dict]: Uma linha de resultado por forma, tamanho e estrutura
+    """
+    originals = write_corpus(corpus_dir, shapes, sizes, seed)
+    changed = write_corpus(corpus_dir, shapes, sizes, seed, CHANGE_FRACTION)
+    work_path = os.path.join(corpus_dir, 'bench-memory-work.xml')
+
+    # Aquecimento: a primeira carga também paga inicializações únicas (lxml, módulos)
+    warm_up = os.path.join(corpus_dir, 'bench-memory-warm-up.xml')
+    write_document(warm_up, 'flat', 100, seed)
+    load_document(warm_up, warm_up, work_path)
+    os.remove(warm_up)
+
+    results = []
+    try:
+        for original, modified in zip(originals, changed):
+            # RSS primeiro, sem o custo do próprio tracemalloc
+            rss = measure_rss(original['path'], modified['path'], work_path)
+            gc.collect()
+            sizes_by_structure, elements = measure_structures(original['path'], modified['path'], work_path)
+            sizes_by_structure['process_rss'] = rss
+            for structure in STRUCTURES:
+                size = sizes_by_structure.get(structure)
+                if size is None:
+                    continue
+                results.append({
+                    'shape': original['shape'],
+                    'nodes': original['nodes'],
+                    'elements': elements,
+                    'structure': structure,
+                    'bytes': size,
+                    'bytes_per_node': round(size / max(1, elements), 1),
+                })
+    finally:
+        if os.path.exists(work_path):
+            os.remove(work_path)
+    return results
+
+def load_thresholds(path: str = THRESHOLDS_FILE):
+    """Limites gravados: {estrutura: {forma: bytes por elemento}}"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def check_thresholds(results, thresholds, include_rss: bool = False):
+    """
+    Compara os resultados com os limites
+
+    Returns:
+        List[str]: Descrição de cada limite ultrapassado
+    """
+    violations = []
+    for result in results:
+        if result['structure'] in RSS_STRUCTURES and not include_rss:
+            continue
+        limit = thresholds.get(result['structure'], {}).get(result['shape'])
+        if limit is not None and result['bytes_per_node'] > limit:
+            violations.append(
+                f"{result['structure']} ({result['shape']}, {result['nodes']} nós): "
+                f"{result['bytes_per_node']:.1f} bytes/elemento, limite {limit:.1f}"
+            )
+    return violations
+
+def updated_thresholds(results, thresholds, margin: float = THRESHOLD_MARGIN):
+    """Limites com as formas e estruturas medidas substituídas pelo maior valor medido mais a folga"""
+    updated = {structure: dict(values) for structure, values in thresholds.items()}
+    measured = {}
+    for result in results:
+        key = (result['structure'], result['shape'])
+        measured[key] = max(measured.get(key, 0), result['bytes_per_node'])
+    for (structure, shape), value in measured.items():
+        if structure in RSS_STRUCTURES:
+            if not value:
+                # Sem aumento visível do RSS: não há base para um limite
+                continue
+            value *= 1 + RSS_THRESHOLD_MARGIN
+        updated.setdefault(structure, {})[shape] = round(value * (1 + margin), 1)
+    return updated
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de memória por elemento")
+    parser.add_argument('--shapes', default=','.join(SHAPES), help="Formas do corpus, separadas por vírgula")
+    parser.add_argument('--nodes', default='10000,100000', help="Tamanhos, separados por vírgula")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do corpus")
+    parser.add_argument('--corpus', help="Diretório do corpus (reaproveitado entre execuções; padrão: temporário)")
+    parser.add_argument('--output', help="Grava os resultados em JSON neste arquivo")
+    parser.add_argument('--json', action='store_true', help="Emite os resultados em JSON na saída padrão")
+    parser.add_argument('--check', action='store_true', help="Falha se algum limite de bytes por elemento for ultrapassado")
+    parser.add_argument('--check-rss', action='store_true', help="Também verifica o limite do RSS")
+    parser.add_argument('--thresholds', default=THRESHOLDS_FILE, help="Arquivo de limites")
+    parser.add_argument('--update-thresholds', action='store_true', help="Regrava os limites a partir desta medição")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.nodes.split(',') if size]
+    shapes = args.shapes.split(',')
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix='xmlwatcher-corpus-')
+    try:
+        results = run(shapes, sizes, corpus_dir, args.seed)
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        'benchmark': 'memory',
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'change_fraction': CHANGE_FRACTION,
+        'environment': environment(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'forma':<11} {'nós':>8} {'elementos':>9} {'estrutura':<19} {'MiB':>9} {'bytes/elem':>10}")
+        for result in results:
+            print(f"{result['shape']:<11} {result['nodes']:>8} {result['elements']:>9} {result['structure']:<19} "
+                  f"{result['bytes'] / 1048576:>9.1f} {result['bytes_per_node']:>10.1f}")
+
+    thresholds = load_thresholds(args.thresholds)
+    if args.update_thresholds:
+        with open(args.thresholds, 'w', encoding='utf-8') as f:
+            json.dump(updated_thresholds(results, thresholds), f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Limites gravados em {args.thresholds}", file=sys.stderr)
+    elif args.check:
+        violations = check_thresholds(results, thresholds, args.check_rss)
+        for violation in violations:
+            print(f"Limite ultrapassado: {violation}", file=sys.stderr)
+        if violations:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
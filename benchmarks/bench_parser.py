@@ -0,0 +1,158 @@
+"""
+Benchmark do parser XML sobre o corpus sintético
+
+Para cada forma e tamanho do corpus (ver xml_corpus.py), mede
+separadamente:
+    parse_file                  primeira leitura (lxml + extração da linha de base)
+    _extract_elements           só a extração, sobre a árvore já carregada
+    _compare_states             comparação da linha de base com a versão alterada
+    parse_file_and_get_changes  releitura da versão alterada com a linha de base já carregada
+
+Os resultados saem em JSON (um documento com a versão do Python, do lxml
+e da plataforma), para comparar execuções entre versões.
+
+Uso:
+    python benchmarks/bench_parser.py [--shapes flat,wide] [--nodes 10000,100000,1000000]
+                                      [--rounds R] [--corpus DIR] [--output resultados.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.xml_parser import XMLParser
+from xml_corpus import SHAPES, write_corpus
+
+# Fração dos valores alterados na segunda versão de cada documento
+CHANGE_FRACTION = 0.01
+
+STAGES = ('parse_file', '_extract_elements', '_compare_states', 'parse_file_and_get_changes')
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+def measure(path: str, changed_path: str, rounds: int):
+    """
+    Mede as etapas do parser para um documento e sua versão alterada
+
+    Returns:
+        Dict: Tempos (ms) por etapa, número de elementos e de alterações
+    """
+    times = {stage: [] for stage in STAGES}
+    elements = changes = 0
+    for _ in range(rounds):
+        # Parser novo a cada rodada: nenhuma etapa é servida de cache
+        parser = XMLParser()
+        elapsed, baseline = _timed(parser.parse_file, path)
+        times['parse_file'].append(elapsed)
+        elements = len(baseline)
+
+        root = parser._parse_root(changed_path)
+        elapsed, current = _timed(parser._extract_elements, root)
+        times['_extract_elements'].append(elapsed)
+        del root
+
+        elapsed, _ = _timed(parser._compare_states, baseline, current)
+        times['_compare_states'].append(elapsed)
+        del current
+
+        elapsed, result = _timed(parser.parse_file_and_get_changes, changed_path)
+        times['parse_file_and_get_changes'].append(elapsed)
+        changes = len(result[1])
+    return {'times': times, 'elements': elements, 'changes': changes}
+
+def run(shapes, sizes, rounds: int, corpus_dir: str, seed: int = 0):
+    """
+    Executa o benchmark sobre o corpus (gerado em corpus_dir se ainda não existir)
+
+    Returns:
+        List[Dict]: Uma linha de resultado por forma, tamanho e etapa
+    """
+    originals = write_corpus(corpus_dir, shapes, sizes, seed)
+    changed = write_corpus(corpus_dir, shapes, sizes, seed, CHANGE_FRACTION)
+
+    results = []
+    for original, modified in zip(originals, changed):
+        measured = measure(original['path'], modified['path'], rounds)
+        for stage in STAGES:
+            values = measured['times'][stage]
+            results.append({
+                'shape': original['shape'],
+                'nodes': original['nodes'],
+                'bytes': original['bytes'],
+                'elements': measured['elements'],
+                'changes': measured['changes'],
+                'stage': stage,
+                'rounds': rounds,
+                'median_ms': round(statistics.median(values), 3),
+                'min_ms': round(min(values), 3),
+                'max_ms': round(max(values), 3),
+            })
+    return results
+
+def environment():
+    """Versões e plataforma, gravadas junto com os resultados"""
+    from lxml import etree
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'lxml': '.'.join(str(part) for part in etree.LXML_VERSION),
+        'libxml2': '.'.join(str(part) for part in etree.LIBXML_VERSION),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do parser XML")
+    parser.add_argument('--shapes', default=','.join(SHAPES), help="Formas do corpus, separadas por vírgula")
+    parser.add_argument('--nodes', default='10000,100000,1000000', help="Tamanhos, separados por vírgula")
+    parser.add_argument('--rounds', type=int, default=3, help="Repetições por documento")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do corpus")
+    parser.add_argument('--corpus', help="Diretório do corpus (reaproveitado entre execuções; padrão: temporário)")
+    parser.add_argument('--output', help="Grava os resultados em JSON neste arquivo")
+    parser.add_argument('--json', action='store_true', help="Emite os resultados em JSON na saída padrão")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.nodes.split(',') if size]
+    shapes = args.shapes.split(',')
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix='xmlwatcher-corpus-')
+    try:
+        results = run(shapes, sizes, args.rounds, corpus_dir, args.seed)
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        'benchmark': 'parser',
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'change_fraction': CHANGE_FRACTION,
+        'environment': environment(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'forma':<11} {'nós':>8} {'elementos':>9} {'etapa':<27} {'mediana ms':>10} {'mín ms':>9}")
+        for result in results:
+            print(f"{result['shape']:<11} {result['nodes']:>8} {result['elements']:>9} {result['stage']:<27} "
+                  f"{result['median_ms']:>10.1f} {result['min_ms']:>9.1f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
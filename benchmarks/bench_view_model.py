@@ -0,0 +1,160 @@
+"""
+Benchmark do view-model do grid (sem display)
+
+Gera um documento sintético, carrega o GridViewModel e reproduz diffs de
+tamanhos crescentes pelo mesmo caminho usado pela interface: o delta é
+montado como na thread de trabalho e aplicado como na thread da
+interface, seguido da leitura da janela visível que o grid desenharia.
+
+Uso:
+    python benchmarks/bench_view_model.py [--elements N] [--changes 10,1000] [--rounds R]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.view_model import GridViewModel, VIEW_MODE_FLAT, VIEW_MODE_TREE, VIEW_MODE_CHANGES
+
+# Linhas lidas por quadro (janela visível mais a margem do grid virtual)
+WINDOW_ROWS = 45
+
+def make_document(elements: int, children: int = 8):
+    """
+    Gera elementos no formato retornado pelo parser
+
+    Args:
+        elements (int): Número aproximado de elementos
+        children (int): Filhos por registro
+
+    Returns:
+        List[Dict]: Elementos na ordem do documento
+    """
+    data = [{'xpath': '/root', 'tag': 'root', 'value': '', 'parent_number': 1, 'modified': False}]
+    records = max(1, elements // (children + 1))
+    for i in range(records):
+        base = f'/root/record[{i + 1}]'
+        data.append({'xpath': base, 'tag': 'record', 'value': '', 'parent_number': i + 2, 'modified': False})
+        for j in range(children):
+            data.append({
+                'xpath': f'{base}/field{j}',
+                'tag': f'field{j}',
+                'value': f'v{i}-{j}',
+                'parent_number': i + 2,
+                'modified': False
+            })
+    return data
+
+def mutate(data, count: int, rng: random.Random):
+    """
+    Altera count valores folha, como o parser reportaria
+
+    Returns:
+        tuple: (novos dados, últimas alterações)
+    """
+    data = list(data)
+    leaves = [i for i, element in enumerate(data) if element['tag'].startswith('field')]
+    changes = []
+    for index in rng.sample(leaves, min(count, len(leaves))):
+        element = dict(data[index])
+        element['initial_value'] = element.get('initial_value', element['value'])
+        element['value'] = f"{element['value']}*"
+        element['modified'] = True
+        element['change_type'] = 'modified'
+        data[index] = element
+        changes.append(element)
+    return data, changes
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(elements: int, change_sizes, rounds: int, mode: str, seed: int = 1):
+    """
+    Executa o benchmark para um modo de visualização
+
+    Returns:
+        List[Dict]: Uma linha de resultado por tamanho de diff
+    """
+    rng = random.Random(seed)
+    initial = make_document(elements)
+    model = GridViewModel()
+
+    started = time.perf_counter()
+    model.load(initial)
+    model.delta_builder.reset(initial)
+    model.set_view_mode(mode)
+    if mode == VIEW_MODE_TREE:
+        model.tree.expand('/root')
+    model.render_window(0, WINDOW_ROWS)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    results = []
+    for size in change_sizes:
+        build_times = []
+        apply_times = []
+        for _ in range(rounds):
+            data, changes = mutate(initial, size, rng)
+
+            # Thread de trabalho: monta o delta
+            started = time.perf_counter()
+            delta, version = model.delta_builder.build(data, changes)
+            build_times.append((time.perf_counter() - started) * 1000)
+
+            # Thread da interface: aplica, localiza o alvo e lê a janela visível
+            started = time.perf_counter()
+            model.apply_delta(delta)
+            model.delta_builder.commit(version)
+            target = model.change_target(changes)
+            model.render_window(max(0, (target or 0) - WINDOW_ROWS // 3), WINDOW_ROWS)
+            apply_times.append((time.perf_counter() - started) * 1000)
+
+            # Volta ao estado inicial para a próxima rodada (mesmo caminho, não medido)
+            delta, version = model.delta_builder.build(initial, changes)
+            model.apply_delta(delta)
+            model.delta_builder.commit(version)
+
+        results.append({
+            'mode': mode,
+            'elements': len(initial),
+            'changes': size,
+            'load_ms': round(load_ms, 2),
+            'build_median_ms': round(statistics.median(build_times), 3),
+            'apply_median_ms': round(statistics.median(apply_times), 3),
+            'apply_p95_ms': round(percentile(apply_times, 0.95), 3),
+        })
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do view-model do grid")
+    parser.add_argument('--elements', type=int, default=200_000, help="Elementos do documento sintético")
+    parser.add_argument('--changes', default='1,100,1000,10000', help="Tamanhos de diff, separados por vírgula")
+    parser.add_argument('--rounds', type=int, default=5, help="Repetições por tamanho")
+    parser.add_argument('--modes', default=f'{VIEW_MODE_FLAT},{VIEW_MODE_TREE},{VIEW_MODE_CHANGES}',
+                        help="Modos de visualização medidos")
+    parser.add_argument('--json', action='store_true', help="Emite os resultados em JSON Lines")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.changes.split(',') if size]
+    header = f"{'modo':<8} {'elementos':>10} {'alterações':>10} {'carga ms':>9} {'delta ms':>9} {'aplicar ms':>10} {'p95 ms':>8}"
+    if not args.json:
+        print(header)
+    for mode in args.modes.split(','):
+        for result in run(args.elements, sizes, args.rounds, mode):
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(f"{result['mode']:<8} {result['elements']:>10} {result['changes']:>10} "
+                      f"{result['load_ms']:>9.1f} {result['build_median_ms']:>9.2f} "
+                      f"{result['apply_median_ms']:>10.2f} {result['apply_p95_ms']:>8.2f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
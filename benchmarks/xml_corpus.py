@@ -0,0 +1,191 @@
+"""
+Gerador de XMLs sintéticos para benchmarks
+
+Gera, a partir de uma semente, documentos com as formas que aparecem na
+prática: lista plana, hierarquia profunda, registros repetidos, muitos
+atributos, namespaces, UTF-16 com BOM e nós de texto grandes. O mesmo
+(forma, nós, semente) gera sempre o mesmo arquivo; com changes > 0 uma
+fração dos valores é alterada, para medir a comparação entre versões.
+
+Uso:
+    python benchmarks/xml_corpus.py DIRETÓRIO [--shapes flat,wide] [--nodes 10000,100000] [--seed S]
+"""
+import argparse
+import os
+import random
+import sys
+
+# Formas disponíveis
+SHAPES = ('flat', 'deep', 'wide', 'attributes', 'namespaces', 'utf16', 'large_text')
+
+# Profundidade de cada cadeia da forma 'deep'
+DEEP_DEPTH = 40
+
+# Atributos por elemento da forma 'attributes'
+ATTRIBUTES_PER_ELEMENT = 8
+
+# Tamanho do texto de cada elemento da forma 'large_text'; o número de
+# elementos é nodes // LARGE_TEXT_NODE_WEIGHT, para que o arquivo de 1M
+# "nós" fique em dezenas de megabytes
+LARGE_TEXT_SIZE = 4096
+LARGE_TEXT_NODE_WEIGHT = 50
+
+# Tags distintas da forma 'flat'
+FLAT_TAGS = 200
+
+WORDS = ('alpha', 'beta', 'gamma', 'delta', 'pedido', 'cliente', 'valor', 'ação',
+         'preço', 'total', 'status', 'código', 'nota', 'item', 'região', 'data')
+UNICODE_WORDS = ('ação', 'preço', 'região', 'größe', 'naïve', '日本語', 'данные', 'ελληνικά')
+
+# Elementos por escrita no arquivo
+WRITE_CHUNK = 2000
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+class _Values:
+    def __init__(self, seed: int, changes: float, words=WORDS):
+        """
+        Gera os valores de texto do documento
+
+        Os valores vêm sempre da mesma sequência; a decisão de alterar um
+        valor usa um gerador separado, então a versão alterada difere da
+        original só nos valores escolhidos.
+        """
+        self._rng = random.Random(seed)
+        self._changes_rng = random.Random(seed + 1)
+        self.changes = changes
+        self.words = words
+
+    def next(self) -> str:
+        value = f"{self._rng.choice(self.words)} {self._rng.randrange(100000)}"
+        if self.changes and self._changes_rng.random() < self.changes:
+            value += ' *'
+        return _escape(value)
+
+    def text(self, size: int) -> str:
+        words = []
+        length = 0
+        while length < size:
+            word = self._rng.choice(self.words)
+            words.append(word)
+            length += len(word) + 1
+        value = ' '.join(words)
+        if self.changes and self._changes_rng.random() < self.changes:
+            value += ' *'
+        return _escape(value)
+
+def _records(shape: str, nodes: int, values: _Values):
+    """
+    Gera os fragmentos do corpo do documento
+
+    Yields:
+        tuple: (fragmento XML, número de nós que ele adiciona ao resultado do parser)
+    """
+    if shape == 'flat':
+        for i in range(nodes):
+            tag = f"field{i % FLAT_TAGS}"
+            yield f"<{tag}>{values.next()}</{tag}>", 1
+    elif shape == 'deep':
+        while True:
+            yield ''.join('<level>' for _ in range(DEEP_DEPTH - 1)) + \
+                f"<level>{values.next()}</level>" + ''.join('</level>' for _ in range(DEEP_DEPTH - 1)), DEEP_DEPTH
+    elif shape in ('wide', 'utf16'):
+        while True:
+            yield (f"<item><name>{values.next()}</name><value>{values.next()}</value>"
+                   f"<code>{values.next()}</code></item>"), 4
+    elif shape == 'attributes':
+        while True:
+            attributes = ' '.join(f'attr{j}="{values.next()}"' for j in range(ATTRIBUTES_PER_ELEMENT))
+            yield f"<item {attributes}>{values.next()}</item>", ATTRIBUTES_PER_ELEMENT + 1
+    elif shape == 'namespaces':
+        while True:
+            yield (f'<a:item b:id="{values.next()}"><b:name>{values.next()}</b:name>'
+                   f'<a:value>{values.next()}</a:value></a:item>'), 4
+    elif shape == 'large_text':
+        while True:
+            yield f"<doc>{values.text(LARGE_TEXT_SIZE)}</doc>", LARGE_TEXT_NODE_WEIGHT
+    else:
+        raise ValueError(f"Forma de documento desconhecida: {shape}")
+
+def write_document(path: str, shape: str, nodes: int, seed: int = 0, changes: float = 0.0) -> int:
+    """
+    Grava um documento sintético
+
+    Args:
+        path (str): Arquivo de destino
+        shape (str): Forma do documento (ver SHAPES)
+        nodes (int): Número aproximado de nós (elementos + atributos) que o parser retorna
+        seed (int): Semente dos valores
+        changes (float): Fração dos valores alterados em relação à versão original
+
+    Returns:
+        int: Tamanho do arquivo em bytes
+    """
+    words = UNICODE_WORDS if shape == 'utf16' else WORDS
+    values = _Values(seed, changes, words)
+    encoding = 'utf-16' if shape == 'utf16' else 'utf-8'
+    if shape == 'namespaces':
+        root_open = '<root xmlns:a="urn:xmlwatcher:a" xmlns:b="urn:xmlwatcher:b">'
+    else:
+        root_open = '<root>'
+
+    with open(path, 'w', encoding=encoding, newline='\n') as f:
+        # O codec 'utf-16' grava o BOM no início do arquivo
+        f.write(f'<?xml version="1.0" encoding="{encoding.upper()}"?>\n{root_open}\n')
+        produced = 1  # raiz
+        chunk = []
+        for fragment, count in _records(shape, nodes, values):
+            if produced >= nodes:
+                break
+            chunk.append(fragment)
+            produced += count
+            if len(chunk) >= WRITE_CHUNK:
+                f.write('\n'.join(chunk) + '\n')
+                chunk = []
+        if chunk:
+            f.write('\n'.join(chunk) + '\n')
+        f.write('</root>\n')
+    return os.path.getsize(path)
+
+def document_name(shape: str, nodes: int, changes: float = 0.0) -> str:
+    """Nome padrão do arquivo de um documento do corpus"""
+    suffix = f"-changed{int(changes * 1000)}" if changes else ''
+    return f"{shape}-{nodes}{suffix}.xml"
+
+def write_corpus(directory: str, shapes=SHAPES, sizes=(10_000, 100_000, 1_000_000),
+                 seed: int = 0, changes: float = 0.0):
+    """
+    Grava um documento por forma e tamanho (reaproveitando os que já existem)
+
+    Returns:
+        List[Dict]: shape, nodes, path e bytes de cada documento
+    """
+    os.makedirs(directory, exist_ok=True)
+    documents = []
+    for shape in shapes:
+        for nodes in sizes:
+            path = os.path.join(directory, document_name(shape, nodes, changes))
+            if os.path.exists(path):
+                size = os.path.getsize(path)
+            else:
+                size = write_document(path, shape, nodes, seed, changes)
+            documents.append({'shape': shape, 'nodes': nodes, 'path': path, 'bytes': size})
+    return documents
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gera o corpus de XMLs sintéticos")
+    parser.add_argument('directory', help="Diretório de saída")
+    parser.add_argument('--shapes', default=','.join(SHAPES), help="Formas, separadas por vírgula")
+    parser.add_argument('--nodes', default='10000,100000,1000000', help="Tamanhos, separados por vírgula")
+    parser.add_argument('--seed', type=int, default=0, help="Semente dos valores")
+    parser.add_argument('--changes', type=float, default=0.0, help="Fração de valores alterados")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.nodes.split(',') if size]
+    for document in write_corpus(args.directory, args.shapes.split(','), sizes, args.seed, args.changes):
+        print(f"{document['path']}: {document['bytes']} bytes")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
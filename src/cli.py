@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+XMLWatcher headless - monitora arquivos XML sem interface gráfica e emite as
+alterações como JSON Lines (um objeto JSON por linha)
+
+Uso:
+    python -m src.cli watch arquivo.xml [outro.xml ...] [-o saida.jsonl]
+    python -m src.cli diff antigo.xml novo.xml [-o saida.jsonl]
+    python -m src.cli record arquivo.xml DIRETORIO [--duration S]
+    python -m src.cli replay DIRETORIO [--speed X]
+
+Este módulo não importa tkinter, winsound nem o pacote gui, e pode ser usado
+em servidores Linux e pipelines.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, List, Optional
+
+# Adiciona o diretório src ao PYTHONPATH
+src_path = os.path.dirname(os.path.abspath(__file__))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from watcher.xml_monitor import XMLFileMonitor
+from watcher.replay import WorkloadReplayer, load_workload, record
+from utils.xml_parser import XMLParser
+from utils.tracing import TracedSubmitter, get_latency_tracker
+from utils.metrics import get_registry, MetricsServer
+from utils.profiling import get_profiler
+from utils.worker_pool import WorkerPool
+
+class JSONLWriter:
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 64 * 1024):
+        """
+        Escritor de JSON Lines com buffer, seguro para várias threads
+
+        Args:
+            path (str): Arquivo de saída (anexa ao final); None ou '-' usa stdout
+            buffer_size (int): Tamanho do buffer de escrita em bytes
+        """
+        self._lock = threading.Lock()
+        if path and path != '-':
+            self._stream: IO[str] = open(path, 'a', encoding='utf-8', buffering=buffer_size)
+        else:
+            # closefd=False: fechar o escritor não fecha o stdout do processo
+            self._stream = open(
+                sys.stdout.fileno(), 'w', encoding='utf-8',
+                buffering=buffer_size, closefd=False
+            )
+        self._closed = False
+        self.records_written = 0
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Serializa e escreve vários registros de uma vez
+
+        Returns:
+            int: Número de registros escritos
+        """
+        lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+        if not lines:
+            return 0
+        with self._lock:
+            self._stream.write(''.join(lines))
+            self.records_written += len(lines)
+        return len(lines)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Escreve um único registro"""
+        self.write_many([record])
+
+    def flush(self) -> None:
+        """Descarrega o buffer para o destino"""
+        with self._lock:
+            try:
+                self._stream.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+    def close(self) -> None:
+        """Descarrega e fecha a saída"""
+        self.flush()
+        with self._lock:
+            if not self._closed:
+                try:
+                    self._stream.close()
+                except (BrokenPipeError, ValueError):
+                    pass
+                self._closed = True
+
+def change_record(change: Dict[str, Any], file_path: str,
+                  processing_info: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Converte uma alteração do XMLParser em um registro JSON
+
+    Args:
+        change (Dict): Elemento alterado retornado pelo parser
+        file_path (str): Arquivo de origem
+        processing_info (Dict): Informações do evento de detecção
+
+    Returns:
+        Dict: Registro serializável
+    """
+    change_type = change.get('change_type') or change.get('type')
+    record = {
+        'time': datetime.now().isoformat(timespec='milliseconds'),
+        'file': file_path,
+        'type': change_type,
+        'xpath': change.get('xpath', ''),
+        'tag': change.get('tag', ''),
+        'line': change.get('parent_number')
+    }
+    if change_type == 'modified':
+        record['old_value'] = change.get('old_value')
+        record['new_value'] = change.get('new_value')
+    elif change_type == 'added':
+        record['new_value'] = change.get('value')
+    elif change_type == 'removed':
+        record['old_value'] = change.get('value')
+
+    if processing_info and 'start_time' in processing_info:
+        record['latency'] = round(time.time() - processing_info['start_time'], 6)
+    trace = processing_info.get('trace') if processing_info else None
+    if trace is not None:
+        # Duração de cada etapa em ms (evento, debounce, leitura, parse, extração, diff)
+        record['stages_ms'] = {name: round(value, 3) for name, value in trace.durations_ms().items()}
+    return record
+
+def error_record(file_path: str, message: str) -> Dict[str, Any]:
+    """Registro JSON para erros de processamento"""
+    return {
+        'time': datetime.now().isoformat(timespec='milliseconds'),
+        'file': file_path,
+        'type': 'error',
+        'message': message
+    }
+
+def run_diff(old_path: str, new_path: str, output: Optional[str] = None) -> int:
+    """
+    Compara dois arquivos XML uma única vez
+
+    Returns:
+        int: 0 se não há diferenças, 1 se há diferenças, 2 em caso de erro
+    """
+    parser = XMLParser()
+    try:
+        parser.parse_file_and_get_changes(old_path)
+        result = parser.parse_file_and_get_changes(new_path)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    changes = result[1]
+    writer = JSONLWriter(output)
+    try:
+        writer.write_many(change_record(change, new_path) for change in changes)
+    finally:
+        writer.close()
+    return 1 if changes else 0
+
+def run_watch(paths: List[str], output: Optional[str] = None, backend: str = 'auto',
+              workers: int = 2, flush_interval: float = 0.5,
+              stop_event: threading.Event = None, metrics_port: Optional[int] = None) -> int:
+    """
+    Monitora os arquivos e emite as alterações até ser interrompido
+
+    Args:
+        paths (List[str]): Arquivos a monitorar
+        output (str): Arquivo de saída ou None para stdout
+        backend (str): Backend do XMLFileMonitor ('auto', 'native', 'polling')
+        workers (int): Número de threads de processamento
+        flush_interval (float): Intervalo máximo entre descargas do buffer
+        stop_event (threading.Event): Evento para encerrar o monitoramento
+        metrics_port (int): Porta do endpoint /metrics em 127.0.0.1 (None desativa)
+
+    Returns:
+        int: Código de saída
+    """
+    stop_event = stop_event or threading.Event()
+    writer = JSONLWriter(output)
+    pool = WorkerPool(max_workers=workers, name="xmlwatcher-cli")
+    get_registry().register_stats('worker_pool', pool)
+    submitter = TracedSubmitter(pool)
+    monitors: List[XMLFileMonitor] = []
+    metrics_server = None
+
+    def make_callback(monitor: XMLFileMonitor, file_path: str):
+        def process(processing_info):
+            trace = processing_info.get('trace') if processing_info else None
+            try:
+                result = monitor.parser.parse_file_and_get_changes(file_path, trace)
+                last_changes = result[2] if len(result) > 2 else []
+                if trace is not None:
+                    trace.mark('apply')
+                    get_latency_tracker().record(trace)
+                writer.write_many(
+                    change_record(change, file_path, processing_info)
+                    for change in last_changes
+                )
+            except Exception as e:
+                writer.write(error_record(file_path, str(e)))
+
+        def on_change(xml_data, processing_info=None):
+            # Perfil opcional via XMLWATCHER_PROFILE (ver utils/profiling.py)
+            trace = processing_info.get('trace') if processing_info else None
+            submitter.submit(file_path, trace, get_profiler().run, os.path.basename(file_path), process, processing_info)
+        return on_change
+
+    try:
+        if metrics_port is not None:
+            metrics_server = MetricsServer(port=metrics_port)
+            metrics_server.start()
+            print(f"Métricas em {metrics_server.url}", file=sys.stderr)
+        for path in paths:
+            file_path = os.path.abspath(path)
+            monitor = XMLFileMonitor(backend=backend)
+            try:
+                # Estado inicial usado como linha de base
+                monitor.parser.parse_file_and_get_changes(file_path)
+            except Exception as e:
+                print(f"{file_path}: {e}", file=sys.stderr)
+                return 2
+            monitor.start_monitoring(file_path, make_callback(monitor, file_path))
+            monitors.append(monitor)
+
+        while not stop_event.wait(flush_interval):
+            writer.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for monitor in monitors:
+            monitor.stop_monitoring()
+        pool.wait_idle(timeout=2.0)
+        pool.shutdown()
+        writer.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+    return 0
+
+def run_replay(directory: str, speed: Optional[float] = None, debounce: float = 0.1,
+               target: Optional[str] = None) -> int:
+    """
+    Reproduz uma carga gravada e emite o resumo (vazão e latência) em JSON
+
+    Returns:
+        int: 0 se todas as versões foram processadas, 1 se houve erros, 2 se a carga é inválida
+    """
+    temp_dir = None
+    try:
+        if target is None:
+            temp_dir = tempfile.mkdtemp(prefix='xmlwatcher-replay-')
+            target = os.path.join(temp_dir, load_workload(directory)['file'])
+        summary = WorkloadReplayer(directory, target, speed, debounce).run()
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary['errors'] else 0
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos da linha de comando"""
+    arg_parser = argparse.ArgumentParser(
+        prog='xmlwatcher',
+        description='Monitora arquivos XML e emite alterações como JSON Lines'
+    )
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+
+    watch_parser = subparsers.add_parser('watch', help='Monitora arquivos continuamente')
+    watch_parser.add_argument('files', nargs='+', help='Arquivos XML a monitorar')
+    watch_parser.add_argument('-o', '--output', help='Arquivo de saída (padrão: stdout)')
+    watch_parser.add_argument(
+        '--backend', choices=('auto', 'native', 'polling'), default='auto',
+        help='Backend de monitoramento (padrão: auto)'
+    )
+    watch_parser.add_argument('--workers', type=int, default=2, help='Threads de processamento')
+    watch_parser.add_argument(
+        '--flush-interval', type=float, default=0.5,
+        help='Intervalo máximo em segundos entre descargas da saída'
+    )
+    watch_parser.add_argument(
+        '--metrics-port', type=int,
+        help='Expõe métricas no formato Prometheus em http://127.0.0.1:PORTA/metrics'
+    )
+
+    diff_parser = subparsers.add_parser('diff', help='Compara dois arquivos XML uma vez')
+    diff_parser.add_argument('old', help='Arquivo de referência')
+    diff_parser.add_argument('new', help='Arquivo a comparar')
+    diff_parser.add_argument('-o', '--output', help='Arquivo de saída (padrão: stdout)')
+
+    record_parser = subparsers.add_parser('record', help='Grava os salvamentos de um arquivo para reprodução')
+    record_parser.add_argument('file', help='Arquivo XML gravado')
+    record_parser.add_argument('directory', help='Diretório da carga')
+    record_parser.add_argument('--duration', type=float, help='Segundos de gravação (padrão: até Ctrl+C)')
+    record_parser.add_argument(
+        '--backend', choices=('auto', 'native', 'polling'), default='auto',
+        help='Backend de monitoramento (padrão: auto)'
+    )
+
+    replay_parser = subparsers.add_parser('replay', help='Reproduz uma carga gravada e mede vazão e latência')
+    replay_parser.add_argument('directory', help='Diretório da carga')
+    replay_parser.add_argument(
+        '--speed', type=float,
+        help='Fator de velocidade em tempo real (1 = velocidade gravada; padrão: o mais rápido possível)'
+    )
+    replay_parser.add_argument('--debounce', type=float, default=0.1, help='Debounce do handler em segundos')
+    replay_parser.add_argument('--target', help='Arquivo onde as versões são gravadas (padrão: temporário)')
+
+    return arg_parser
+
+def main(argv: List[str] = None) -> int:
+    """Ponto de entrada da linha de comando"""
+    args = build_arg_parser().parse_args(argv)
+
+    if args.command == 'diff':
+        return run_diff(args.old, args.new, args.output)
+    if args.command == 'replay':
+        return run_replay(args.directory, args.speed, args.debounce, args.target)
+
+    stop_event = threading.Event()
+    # Encerra de forma limpa em SIGTERM (ex.: docker stop, systemd)
+    if hasattr(signal, 'SIGTERM') and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+    if args.command == 'record':
+        manifest = record(args.file, args.directory, args.duration, args.backend, stop_event)
+        print(f"{len(manifest['steps'])} eventos gravados em {args.directory}", file=sys.stderr)
+        return 0
+
+    return run_watch(
+        args.files,
+        output=args.output,
+        backend=args.backend,
+        workers=args.workers,
+        flush_interval=args.flush_interval,
+        stop_event=stop_event,
+        metrics_port=args.metrics_port
+    )
+
+if __name__ == "__main__":
+    sys.exit(main())
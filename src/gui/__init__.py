@@ -1,4 +1,15 @@
-from .grid_view import XMLGridView
-from .settings_dialog import SettingsDialog
+import importlib
 
-__all__ = ["XMLGridView", "SettingsDialog"]
+# Exportações carregadas sob demanda: submódulos sem dependência de tkinter
+# podem ser importados sem carregar a interface gráfica
+_EXPORTS = {
+    "XMLGridView": ".grid_view",
+    "SettingsDialog": ".settings_dialog",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,211 @@
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional
+from utils.text_diff import diff_text, DiffBudget, DiffCancelled, DiffRow
+from utils.worker_pool import WorkerPool
+
+# Número máximo de linhas do diff escritas nos widgets de texto
+MAX_DIFF_ROWS = 3000
+
+# Chave usada no pool do painel (um cálculo pendente por vez)
+DIFF_JOB_KEY = 'diff-pane'
+
+class DiffPane(ttk.Frame):
+    def __init__(self, master: tk.Widget, post: Callable[..., None], worker_pool: Any = None,
+                 max_rows: int = MAX_DIFF_ROWS):
+        """
+        Painel de detalhes com o diff lado a lado do valor original e do atual
+
+        O diff é calculado numa thread própria (fora do pool que processa as
+        alterações) e pode ser cancelado: ao selecionar outra linha, o
+        cálculo anterior é interrompido e o resultado, se chegar, é
+        descartado. O cálculo tem limite de trabalho (DiffBudget) e o painel
+        só recebe as linhas próximas às alterações, então valores de vários
+        megabytes não travam a interface.
+
+        Args:
+            master (tk.Widget): Widget pai
+            post (Callable): Agenda uma chamada na thread da interface (ex.: TkBridge.post)
+            worker_pool: Pool onde o diff é calculado (padrão: WorkerPool próprio com uma thread)
+            max_rows (int): Número máximo de linhas exibidas
+        """
+        super().__init__(master)
+        self._owns_pool = worker_pool is None
+        self.worker_pool = worker_pool if worker_pool is not None else WorkerPool(max_workers=1, name="xmlwatcher-diff")
+        self.post = post
+        self.max_rows = max_rows
+        self.xpath: Optional[str] = None
+        self._values = None
+        self._token = 0
+        self._cancel_event: Optional[threading.Event] = None
+
+        header = ttk.Frame(self)
+        header.pack(fill='x')
+        self.title_label = ttk.Label(header, text="Detalhes: clique em uma linha")
+        self.title_label.pack(side='left')
+        self.status_label = ttk.Label(header, text="")
+        self.status_label.pack(side='right')
+
+        body = ttk.Frame(self)
+        body.pack(expand=True, fill='both')
+        self.old_text = tk.Text(body, height=6, wrap='none', state='disabled')
+        self.new_text = tk.Text(body, height=6, wrap='none', state='disabled')
+        self.vsb = ttk.Scrollbar(body, orient='vertical', command=self._yview)
+        for text in (self.old_text, self.new_text):
+            text.configure(yscrollcommand=self._on_text_scroll)
+            text.tag_configure('delete', background='#FFE5E5')
+            text.tag_configure('insert', background='#E5FFE5')
+            text.tag_configure('char_delete', background='#FF9E9E')
+            text.tag_configure('char_insert', background='#8FE08F')
+            text.tag_configure('filler', background='#F0F0F0')
+            text.tag_configure('skip', foreground='gray')
+        self.old_text.grid(column=0, row=0, sticky='nsew')
+        self.new_text.grid(column=1, row=0, sticky='nsew')
+        self.vsb.grid(column=2, row=0, sticky='ns')
+        body.grid_columnconfigure(0, weight=1)
+        body.grid_columnconfigure(1, weight=1)
+        body.grid_rowconfigure(0, weight=1)
+
+    def _yview(self, *args) -> None:
+        """Rola os dois lados juntos"""
+        self.old_text.yview(*args)
+        self.new_text.yview(*args)
+
+    def _on_text_scroll(self, first, last) -> None:
+        self.vsb.set(first, last)
+        # Mantém o outro lado alinhado quando um deles rola sozinho (roda do mouse)
+        for text in (self.old_text, self.new_text):
+            if text.yview()[0] != float(first):
+                text.yview_moveto(first)
+
+    def show(self, xpath: str, old: str, new: str) -> None:
+        """
+        Exibe o diff de uma linha; o cálculo roda em segundo plano
+
+        Args:
+            xpath (str): xpath da linha
+            old (str): Valor original
+            new (str): Valor atual
+        """
+        if xpath == self.xpath and self._values is not None and self._values == (old, new):
+            return
+        self.cancel()
+        self.xpath = xpath
+        self._values = (old, new)
+        self._token += 1
+        self._cancel_event = threading.Event()
+        self.title_label.configure(text=f"Detalhes: {xpath}")
+        self.status_label.configure(text="Calculando diferenças...")
+        self.worker_pool.submit(DIFF_JOB_KEY, self._compute, self._token, self._cancel_event, old, new)
+
+    def refresh(self, row: Any) -> None:
+        """Recalcula o diff se os valores da linha exibida mudaram"""
+        if row is not None and row.xpath == self.xpath:
+            self.show(row.xpath, row.original, row.current)
+
+    def cancel(self) -> None:
+        """Interrompe o cálculo em andamento (o resultado será descartado)"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+
+    def clear(self) -> None:
+        """Limpa o painel"""
+        self.cancel()
+        self._token += 1
+        self.xpath = None
+        self._values = None
+        self.title_label.configure(text="Detalhes: clique em uma linha")
+        self.status_label.configure(text="")
+        self._write([], [], [], [])
+
+    def shutdown(self) -> None:
+        """Interrompe o cálculo em andamento e finaliza o pool próprio"""
+        self.cancel()
+        if self._owns_pool:
+            self.worker_pool.shutdown(wait=False)
+
+    def _compute(self, token: int, cancel_event: threading.Event, old: str, new: str) -> None:
+        """Calcula o diff (thread do pool)"""
+        if cancel_event.is_set():
+            return
+        started = time.perf_counter()
+        budget = DiffBudget()
+        try:
+            rows = diff_text(old, new, cancelled=cancel_event.is_set, budget=budget)
+        except DiffCancelled:
+            return
+        except Exception as e:
+            self.post(self._show_error, token, str(e))
+            return
+        self.post(self._render, token, rows, time.perf_counter() - started, budget.exhausted)
+
+    def _show_error(self, token: int, message: str) -> None:
+        if token == self._token:
+            self.status_label.configure(text=f"Erro ao calcular diferenças: {message}")
+
+    def _render(self, token: int, rows: List[DiffRow], elapsed: float, approximate: bool = False) -> None:
+        """Escreve o diff nos dois lados (thread da interface)"""
+        if token != self._token:
+            return  # Resultado de uma seleção anterior
+
+        old_lines: List[str] = []
+        new_lines: List[str] = []
+        old_tags: List[tuple] = []
+        new_tags: List[tuple] = []
+        changed = 0
+        for number, row in enumerate(rows[:self.max_rows], start=1):
+            if row.kind == 'skip':
+                marker = f"... {row.skipped} linha(s) igual(is) ..."
+                old_lines.append(marker)
+                new_lines.append(marker)
+                old_tags.append((number, 'skip', None))
+                new_tags.append((number, 'skip', None))
+                continue
+            old_lines.append(row.old if row.old is not None else '')
+            new_lines.append(row.new if row.new is not None else '')
+            if row.kind == 'equal':
+                continue
+            changed += 1
+            if row.old is None:
+                old_tags.append((number, 'filler', None))
+            else:
+                old_tags.append((number, 'delete', None))
+                old_tags.extend((number, 'char_delete', span) for span in row.old_spans)
+            if row.new is None:
+                new_tags.append((number, 'filler', None))
+            else:
+                new_tags.append((number, 'insert', None))
+                new_tags.extend((number, 'char_insert', span) for span in row.new_spans)
+        if len(rows) > self.max_rows:
+            marker = f"... {len(rows) - self.max_rows} linha(s) do diff omitida(s) ..."
+            old_lines.append(marker)
+            new_lines.append(marker)
+            old_tags.append((len(old_lines), 'skip', None))
+            new_tags.append((len(new_lines), 'skip', None))
+
+        self._write(old_lines, new_lines, old_tags, new_tags)
+        if not changed:
+            status = "Valores iguais"
+        else:
+            status = f"{changed} linha(s) diferente(s) ({elapsed * 1000:.0f} ms)"
+            if approximate:
+                # Limite de trabalho atingido: o restante saiu como linhas substituídas inteiras
+                status += " - diff aproximado"
+        self.status_label.configure(text=status)
+
+    def _write(self, old_lines: List[str], new_lines: List[str], old_tags: List[tuple], new_tags: List[tuple]) -> None:
+        """Substitui o conteúdo dos widgets de texto em uma única inserção por lado"""
+        for text, lines, tags in ((self.old_text, old_lines, old_tags), (self.new_text, new_lines, new_tags)):
+            text.configure(state='normal')
+            text.delete('1.0', 'end')
+            if lines:
+                text.insert('1.0', '\n'.join(lines))
+            for number, tag, span in tags:
+                if span is None:
+                    text.tag_add(tag, f"{number}.0", f"{number}.end")
+                else:
+                    text.tag_add(tag, f"{number}.{span[0]}", f"{number}.{span[1]}")
+            text.configure(state='disabled')
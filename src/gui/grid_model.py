@@ -0,0 +1,379 @@
+from bisect import bisect_left, insort
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Limite de caracteres exibidos por célula do grid
+MAX_DISPLAY_CHARS = 500
+
+# Espaço entre chaves de ordenação consecutivas; inserções usam o ponto médio
+ORDER_GAP = 1 << 16
+
+def truncate_value(value: str) -> str:
+    """Trunca valores longos para exibição no grid"""
+    if len(value) > MAX_DISPLAY_CHARS:
+        return value[:MAX_DISPLAY_CHARS - 3] + '...'
+    return value
+
+class GridRow:
+    """Linha do grid mantida do lado Python (sem item correspondente no Tk)"""
+    __slots__ = ('xpath', 'order', 'line', 'tag', 'original', 'current', 'changed', 'change_type')
+
+    def __init__(self, element: Dict[str, Any], order: int = 0):
+        self.xpath = element.get('xpath', '')
+        self.order = order
+        self.update(element)
+
+    def update(self, element: Dict[str, Any]) -> None:
+        """Atualiza a linha a partir de um elemento retornado pelo parser"""
+        self.line = element.get('parent_number', '')
+        self.tag = element.get('tag', '')
+        self.current = element.get('value', '')
+        self.original = element.get('initial_value', self.current)
+        self.changed = bool(element.get('modified', False))
+        self.change_type = element.get('change_type')
+
+    def values(self) -> Tuple[Any, str, str, str, str]:
+        """Valores das colunas (Linha, Tag, Valor Original, Valor Atual, xpath)"""
+        return (
+            self.line,
+            self.tag,
+            truncate_value(self.original),
+            truncate_value(self.current),
+            self.xpath
+        )
+
+class GridDeltaBuilder:
+    def __init__(self):
+        """
+        Monta deltas do grid na thread de trabalho
+        
+        Cada delta é cumulativo em relação à versão que o grid está
+        exibindo (a base): inclui todos os xpaths tocados pelas versões
+        ainda não aplicadas. Assim, basta aplicar o delta mais recente e
+        versões intermediárias podem ser descartadas. A ordem dos xpaths da
+        base é usada para detectar reordenações que não podem ser expressas
+        como delta (o parser identifica elementos pelo xpath posicional).
+        """
+        self._lock = threading.Lock()
+        self._order: Optional[List[str]] = None
+        # Versões montadas e ainda não aplicadas: (versão, ordem, xpaths tocados)
+        self._pending: List[Tuple[int, List[str], Set[str]]] = []
+        self._version = 0
+
+    def reset(self, xml_data: List[Dict[str, Any]]) -> None:
+        """Define a versão de referência após uma recarga completa do grid"""
+        order = _document_order(xml_data)
+        with self._lock:
+            self._order = order
+            self._pending = []
+
+    def build(
+        self,
+        xml_data: List[Dict[str, Any]],
+        last_changes: List[Dict[str, Any]]
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Monta o delta entre a base e xml_data
+        
+        Apenas os xpaths tocados desde a base são considerados: os que
+        ainda existem em xml_data viram upserts (com o xpath anterior na
+        ordem do documento, para posicionar linhas novas); os demais são
+        removidos.
+        
+        Args:
+            xml_data (List[Dict]): Elementos comparados com o estado inicial
+            last_changes (List[Dict]): Alterações desde a versão anterior
+            
+        Returns:
+            tuple: (delta, versão). O delta é {'upserts': [(elemento, xpath_anterior)],
+            'removals': [xpath]}, ou None se o grid precisar ser recarregado por inteiro.
+            A versão deve ser passada a commit() depois de aplicada.
+        """
+        current = _document_order(xml_data)
+        with self._lock:
+            self._version += 1
+            version = self._version
+            self._pending.append((version, current, {change.get('xpath') for change in last_changes or ()}))
+            base = self._order
+            touched = set().union(*(entry[2] for entry in self._pending))
+        if base is None:
+            return None, version
+        
+        # Elementos que existem nas duas versões precisam manter a ordem relativa
+        current_set = set(current)
+        base_set = set(base)
+        if [x for x in base if x in current_set] != [x for x in current if x in base_set]:
+            return None, version
+        
+        upserts = []
+        previous_xpath = None
+        for element in xml_data:
+            xpath = element.get('xpath')
+            if xpath in touched:
+                upserts.append((element, previous_xpath))
+                touched.discard(xpath)
+            previous_xpath = xpath
+        return {'upserts': upserts, 'removals': sorted(touched)}, version
+
+    def commit(self, version: int) -> None:
+        """
+        Registra que o grid passou a exibir a versão informada
+        
+        Args:
+            version (int): Versão retornada por build()
+        """
+        with self._lock:
+            for i, entry in enumerate(self._pending):
+                if entry[0] == version:
+                    self._order = entry[1]
+                    del self._pending[:i + 1]
+                    return
+
+def _document_order(xml_data: List[Dict[str, Any]]) -> List[str]:
+    """xpaths dos elementos presentes no documento, na ordem do documento"""
+    return [element.get('xpath') for element in xml_data if element.get('change_type') != 'removed']
+
+class GridRowModel:
+    def __init__(self):
+        """
+        Modelo de linhas do grid virtualizado
+
+        Guarda todas as linhas do documento em Python; o widget materializa
+        apenas as linhas visíveis consultando este modelo.
+        """
+        self.rows: List[GridRow] = []
+        # Chaves de ordenação crescentes, paralelas a rows (posição via bisect)
+        self._orders: List[int] = []
+        self.index: Dict[str, GridRow] = {}
+        # Chaves de ordenação das linhas alteradas, em ordem (navegação entre alterações)
+        self._changed_orders: List[int] = []
+        self.highlighted: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def clear(self) -> None:
+        """Remove todas as linhas"""
+        self.rows = []
+        self._orders = []
+        self.index = {}
+        self._changed_orders = []
+        self.highlighted = set()
+
+    def load(self, xml_data: List[Dict[str, Any]]) -> None:
+        """
+        Recarrega o modelo com os elementos do parser, na ordem do documento
+
+        Args:
+            xml_data (List[Dict]): Lista de elementos XML
+        """
+        rows = []
+        index = {}
+        for position, element in enumerate(xml_data):
+            row = GridRow(element, (position + 1) * ORDER_GAP)
+            rows.append(row)
+            index[row.xpath] = row
+        self.rows = rows
+        self._orders = [row.order for row in rows]
+        self.index = index
+        self._changed_orders = [row.order for row in rows if row.changed]
+        self.highlighted &= set(index)
+
+    def apply_delta(self, delta: Dict[str, Any]) -> int:
+        """
+        Aplica um delta gerado por GridDeltaBuilder.build
+        
+        O custo é proporcional ao número de linhas tocadas: linhas existentes
+        são atualizadas no lugar e linhas novas entram logo após o xpath
+        anterior. Linhas removidas do documento em relação ao estado inicial
+        continuam no lugar, marcadas como removidas.
+        
+        Args:
+            delta (Dict): {'upserts': [(elemento, xpath_anterior)], 'removals': [xpath]}
+            
+        Returns:
+            int: Número de linhas tocadas
+        """
+        touched = 0
+        for xpath in delta.get('removals', ()):
+            if self._remove(xpath):
+                touched += 1
+        
+        for element, previous in delta.get('upserts', ()):
+            xpath = element.get('xpath', '')
+            row = self.index.get(xpath)
+            if row is not None and row.change_type == 'removed' and element.get('change_type') != 'removed':
+                # Elemento removido que voltou ao documento: reposiciona a linha
+                self._remove(xpath)
+                row = None
+            if row is None:
+                row = self._insert_after(element, previous)
+                if row.changed:
+                    insort(self._changed_orders, row.order)
+            else:
+                was_changed = row.changed
+                row.update(element)
+                if row.changed and not was_changed:
+                    insort(self._changed_orders, row.order)
+                elif was_changed and not row.changed:
+                    self._discard_changed(row.order)
+            touched += 1
+        return touched
+
+    def _remove(self, xpath: str) -> bool:
+        """Remove a linha do xpath informado"""
+        position = self.position_of(xpath)
+        if position is None:
+            return False
+        row = self.rows.pop(position)
+        del self._orders[position]
+        del self.index[xpath]
+        if row.changed:
+            self._discard_changed(row.order)
+        self.highlighted.discard(xpath)
+        return True
+
+    def _insert_after(self, element: Dict[str, Any], previous: Optional[str]) -> GridRow:
+        """Insere uma linha nova logo após a linha do xpath anterior"""
+        position = 0
+        if previous is not None:
+            anchor = self.position_of(previous)
+            position = len(self.rows) if anchor is None else anchor + 1
+        
+        low = self._orders[position - 1] if position > 0 else 0
+        high = self._orders[position] if position < len(self._orders) else low + 2 * ORDER_GAP
+        if high - low < 2:
+            # Sem espaço entre as vizinhas: renumera todas as chaves
+            self._renumber()
+            low = self._orders[position - 1] if position > 0 else 0
+            high = self._orders[position] if position < len(self._orders) else low + 2 * ORDER_GAP
+        
+        row = GridRow(element, (low + high) // 2)
+        self.rows.insert(position, row)
+        self._orders.insert(position, row.order)
+        self.index[row.xpath] = row
+        return row
+
+    def _renumber(self) -> None:
+        """Redistribui as chaves de ordenação com espaçamento uniforme"""
+        for position, row in enumerate(self.rows):
+            row.order = (position + 1) * ORDER_GAP
+        self._orders = [row.order for row in self.rows]
+        self._changed_orders = [row.order for row in self.rows if row.changed]
+
+    def _discard_changed(self, order: int) -> None:
+        """Remove uma chave da lista de linhas alteradas"""
+        i = bisect_left(self._changed_orders, order)
+        if i < len(self._changed_orders) and self._changed_orders[i] == order:
+            del self._changed_orders[i]
+
+    def row_values(self, position: int) -> Tuple:
+        """Valores das colunas da linha na posição informada"""
+        return self.rows[position].values()
+
+    def row_tags(self, position: int) -> Tuple[str, ...]:
+        """Tags de estilo da linha na posição informada"""
+        row = self.rows[position]
+        tags = ('changed',) if row.changed else ()
+        if row.xpath in self.highlighted:
+            tags += ('search_result',)
+        return tags
+
+    def position_of(self, xpath: str) -> Optional[int]:
+        """Retorna a posição da linha com o xpath informado"""
+        row = self.index.get(xpath)
+        if row is None:
+            return None
+        return bisect_left(self._orders, row.order)
+
+    def row_at_order(self, order: int) -> Optional[GridRow]:
+        """Retorna a linha com a chave de ordenação informada"""
+        position = bisect_left(self._orders, order)
+        if position < len(self._orders) and self._orders[position] == order:
+            return self.rows[position]
+        return None
+
+    def changed_count(self) -> int:
+        """Número de linhas alteradas"""
+        return len(self._changed_orders)
+
+    def first_changed(self) -> Optional[GridRow]:
+        """Primeira linha alterada na ordem de exibição"""
+        if not self._changed_orders:
+            return None
+        return self.row_at_order(self._changed_orders[0])
+
+    def change_number(self, row: GridRow) -> int:
+        """Índice (a partir de 0) da linha entre as linhas alteradas"""
+        return bisect_left(self._changed_orders, row.order)
+
+    def step_change(self, order: Optional[int], direction: str) -> Optional[GridRow]:
+        """
+        Retorna a alteração seguinte ou anterior a uma chave de ordenação
+        
+        A chave não precisa mais pertencer a uma linha alterada (a linha pode
+        ter sido revertida ou removida): a navegação continua a partir do
+        ponto onde ela estava. A busca é circular.
+        
+        Args:
+            order (Optional[int]): Chave da alteração atual (None = nenhuma)
+            direction (str): 'up' ou 'down'
+            
+        Returns:
+            Optional[GridRow]: Linha alterada de destino, ou None se não houver alterações
+        """
+        changed = self._changed_orders
+        if not changed:
+            return None
+        if order is None:
+            i = len(changed) - 1 if direction == 'up' else 0
+        else:
+            i = bisect_left(changed, order)
+            if direction == 'up':
+                i -= 1
+            elif i < len(changed) and changed[i] == order:
+                i += 1
+        return self.row_at_order(changed[i % len(changed)])
+
+    def changed_positions(self) -> List[int]:
+        """Posições das linhas alteradas, em ordem de exibição"""
+        return [bisect_left(self._orders, order) for order in self._changed_orders]
+
+class ChangesRowSource:
+    def __init__(self, model: GridRowModel):
+        """
+        Visão somente com as linhas alteradas (modificadas, adicionadas ou removidas)
+
+        Lê diretamente a lista ordenada de alterações do modelo, sem cópia
+        nem filtragem: trocar para esta visão não custa nada além de
+        redesenhar as linhas visíveis, e ela acompanha os deltas sozinha.
+
+        Args:
+            model (GridRowModel): Modelo com todas as linhas do documento
+        """
+        self.model = model
+
+    def __len__(self) -> int:
+        return len(self.model._changed_orders)
+
+    def _row(self, position: int) -> GridRow:
+        return self.model.row_at_order(self.model._changed_orders[position])
+
+    def row_values(self, position: int) -> Tuple:
+        """Valores das colunas da alteração na posição informada"""
+        return self._row(position).values()
+
+    def row_tags(self, position: int) -> Tuple[str, ...]:
+        """Tags de estilo da alteração na posição informada"""
+        row = self._row(position)
+        tags = ('changed',)
+        if row.xpath in self.model.highlighted:
+            tags += ('search_result',)
+        return tags
+
+    def position_of(self, xpath: str) -> Optional[int]:
+        """Posição da linha na visão (None se ela não estiver alterada)"""
+        row = self.model.index.get(xpath)
+        if row is None or not row.changed:
+            return None
+        return self.model.change_number(row)
@@ -2,16 +2,32 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from tkinter.scrolledtext import ScrolledText
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import os
-import configparser
-import winsound
 import time
 import threading
-from .settings_dialog import SettingsDialog, DEFAULT_SETTINGS
+from .settings_dialog import SettingsDialog
 from .search_dialog import SearchDialog
+from .view_model import GridViewModel
+from .diff_pane import DiffPane
+from .virtual_grid import VirtualGrid
+from .render_scheduler import RenderScheduler
+from .log_model import LogModel
+from .tk_bridge import TkBridge
+from utils.worker_pool import WorkerPool
+from utils.config_service import get_config_service, ConfigSnapshot
+from utils.tracing import TracedSubmitter, get_latency_tracker, record_coalesced
+from utils.metrics import get_registry
+from utils.profiling import get_profiler, profile_options
 import sys
 
+# Rótulos do seletor de visualização e os modos correspondentes
+VIEW_MODES = {
+    'Lista': 'flat',
+    'Árvore': 'tree',
+    'Somente alterações': 'changes',
+}
+
 class XMLGridView(tk.Frame):
     def __init__(self, master: tk.Tk, xml_parser: Any, xml_monitor: Any):
         """
@@ -27,28 +43,54 @@ class XMLGridView(tk.Frame):
         self.xml_monitor = xml_monitor
         self.initial_state: Dict = {}
         
-        # Cache de configurações
-        self.sound_config = {
-            'enabled': True,
-            'frequency': 1000,
-            'duration': 100,
-            'use_custom_sound': False,
-            'custom_sound': ''
-        }
+        # Configurações tipadas, recarregadas pelo serviço quando o settings.ini muda
+        self.config_service = get_config_service(self._settings_file())
+        self.sound_config: Dict[str, Any] = {}
+        self.log_config: Dict[str, Any] = {}
+        self.apply_config(self.config_service.snapshot)
+        
+        # Linhas, modos de visualização, navegação e busca (sem dependência do Tk);
+        # o grid virtual apenas desenha a fonte de linhas ativa
+        self.view_model = GridViewModel()
+        
+        # Resultados de threads de trabalho chegam à interface por esta fila
+        self.bridge = TkBridge(self)
+        
+        # Aplica as atualizações do grid no máximo 30 vezes por segundo
+        self._render_scheduler = RenderScheduler(
+            self, self._render_update, self._merge_updates, max_fps=30, post=self.bridge.post
+        )
         
-        # Índices para navegação entre alterações
-        self._current_change_index = -1
-        self._changed_items = []
+        # Log com limite de linhas, escrito no widget em lotes (um por quadro)
+        self.log_model = LogModel(
+            self.log_config['max_lines'],
+            self.log_config['history_file'] or None
+        )
+        self._log_scheduler = RenderScheduler(
+            self, lambda _update, _versions: self._flush_log(), max_fps=30, post=self.bridge.post
+        )
         
-        # Índices para busca
-        self._search_results = []
-        self._current_search_index = -1
         self._search_dialog = None
-        self._current_search_text = ""
         
-        self.load_sound_config()
+        # Pool fixo para processar alterações (uma versão pendente por arquivo)
+        self.worker_pool = WorkerPool(max_workers=2)
+        # Versões substituídas na fila do pool também entram nas latências ('coalesced')
+        self._submitter = TracedSubmitter(self.worker_pool)
+        # Arquivos com releitura completa pendente no pool (ver _submit_reload)
+        self._reload_pending: Set[str] = set()
+        
+        # Filas expostas nas métricas: profundidade crescente indica atraso
+        get_registry().register_stats('worker_pool', self.worker_pool)
+        get_registry().register_stats('tk_bridge', self.bridge)
+        
         self.setup_gui()
         self.setup_bindings()
+        self.bridge.start()
+        
+        # Novos snapshots chegam na thread do serviço; aplica na thread da interface
+        self._unsubscribe_config = self.config_service.subscribe(
+            lambda snapshot: self.bridge.post(self.apply_config, snapshot)
+        )
         
     def setup_bindings(self) -> None:
         """Configura os atalhos de teclado"""
@@ -101,6 +143,18 @@ class XMLGridView(tk.Frame):
         )
         self.settings_btn.pack(side='left', padx=5)
         
+        # Seletor do modo de visualização
+        self.view_mode_var = tk.StringVar(value='Lista')
+        self.view_mode_combo = ttk.Combobox(
+            self.button_frame,
+            textvariable=self.view_mode_var,
+            values=list(VIEW_MODES),
+            state='readonly',
+            width=18
+        )
+        self.view_mode_combo.pack(side='left', padx=5)
+        self.view_mode_combo.bind('<<ComboboxSelected>>', self._on_view_mode_selected)
+        
         # Label para mostrar o arquivo selecionado
         self.file_label = ttk.Label(
             self.button_frame,
@@ -109,20 +163,12 @@ class XMLGridView(tk.Frame):
         )
         self.file_label.pack(side='left', padx=5)
         
-        # Frame para o grid
-        self.grid_frame = ttk.Frame(self)
+        # Grid e painel de detalhes divididos verticalmente
+        self.grid_frame = ttk.PanedWindow(self, orient='vertical')
         self.grid_frame.pack(expand=True, fill='both', padx=5, pady=5)
         
-        # Treeview para mostrar os dados XML
+        # Grid virtual para mostrar os dados XML
         columns = ('Linha', 'Tag', 'Valor Original', 'Valor Atual', 'xpath')
-        self.tree = ttk.Treeview(
-            self.grid_frame,
-            columns=columns,
-            show='headings',
-            selectmode='none'  # Desabilita a seleção
-        )
-        
-        # Configura as colunas
         column_widths = {
             'Linha': 60,
             'Tag': 150,
@@ -130,38 +176,23 @@ class XMLGridView(tk.Frame):
             'Valor Atual': 200,
             'xpath': 0  # Coluna oculta
         }
-        
-        for col, width in column_widths.items():
-            self.tree.heading(col, text=col)
-            # Configuração especial para a coluna xpath
-            if col == 'xpath':
-                self.tree.column(col, width=0, minwidth=0, stretch=False)
-            else:
-                self.tree.column(col, width=width, minwidth=100)
-        
-        # Configura scrollbars
-        vsb = ttk.Scrollbar(
-            self.grid_frame,
-            orient="vertical",
-            command=self.tree.yview
-        )
-        hsb = ttk.Scrollbar(
+        self.virtual_grid = VirtualGrid(
             self.grid_frame,
-            orient="horizontal",
-            command=self.tree.xview
+            self.view_model.source,
+            columns,
+            column_widths
         )
-        self.tree.configure(
-            yscrollcommand=vsb.set,
-            xscrollcommand=hsb.set
-        )
-        
-        # Posiciona os elementos usando grid
-        self.tree.grid(column=0, row=0, sticky='nsew')
-        vsb.grid(column=1, row=0, sticky='ns')
-        hsb.grid(column=0, row=1, sticky='ew')
+        self.grid_frame.add(self.virtual_grid, weight=3)
+        self.tree = self.virtual_grid.tree
+        self.tree.column('Linha', width=60, minwidth=50)
+        self.tree.bind('<Button-1>', self._on_grid_click, add='+')
+        # Único gesto para expandir/recolher no modo árvore (o clique simples só seleciona)
+        self.tree.bind('<Double-1>', self._toggle_tree_node, add='+')
         
-        self.grid_frame.grid_columnconfigure(0, weight=1)
-        self.grid_frame.grid_rowconfigure(0, weight=1)
+        # Diff do valor original e do atual da linha clicada (valores completos, sem truncar)
+        # Thread própria: um diff lento não ocupa o pool que processa as alterações
+        self.diff_pane = DiffPane(self.grid_frame, self.bridge.post)
+        self.grid_frame.add(self.diff_pane, weight=1)
         
         # Frame para o log e navegação
         self.log_container = ttk.Frame(self)
@@ -223,6 +254,7 @@ class XMLGridView(tk.Frame):
         # Configura o estilo para itens alterados e busca
         self.tree.tag_configure('changed', background='lightgreen')
         self.tree.tag_configure('search_result', background='lightyellow')
+        self.tree.tag_configure('changed_below', foreground='#2E7D32')
         
     def show_settings(self) -> None:
         """Mostra a janela de configurações"""
@@ -252,45 +284,23 @@ class XMLGridView(tk.Frame):
         if self.xml_monitor.current_file:
             try:
                 # Limpa o grid
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
-                
-                # Atualiza a interface
-                self.update_idletasks()
-                
-                # Reseta completamente o estado do parser
-                self.xml_parser.initial_state = None
-                self.xml_parser.intermediate_state = None
-                
-                # Limpa o cache do parser
-                with self.xml_parser._cache_lock:
-                    self.xml_parser._element_cache = {}
+                self.clear_grid()
                 
                 # Reseta variáveis de interface
-                self._current_change_index = -1
-                self._changed_items = []
-                self._search_results = []
-                self._current_search_index = -1
-                
-                # Recarrega o XML atual como estado inicial
-                xml_data = self.xml_parser.parse_file(self.xml_monitor.current_file)
-                self.initial_state = xml_data
-                
-                # Atualiza a interface de forma assíncrona
-                self.after(10, lambda: self.update_grid(xml_data))
+                self.view_model.reset_navigation()
                 
                 # Limpa o log
-                self.log_area.configure(state='normal')
-                self.log_area.delete(1.0, tk.END)
-                self.log_area.configure(state='disabled')
+                self.clear_log()
                 
-                # Loga a mensagem
-                self.log_message("Estado redefinido com sucesso")
+                # Recarrega o XML atual como estado inicial (no pool; o grid é preenchido ao terminar)
+                self._submit_reload(
+                    self.xml_monitor.current_file,
+                    "Estado redefinido com sucesso",
+                    "Erro ao redefinir estado"
+                )
                 
             except Exception as e:
                 self.log_message(f"Erro ao redefinir estado: {str(e)}")
-                # Tenta recuperar o estado
-                self.xml_parser.initial_state = None
     
     def select_file(self) -> None:
         """Abre diálogo para selecionar arquivo XML"""
@@ -309,19 +319,10 @@ class XMLGridView(tk.Frame):
         if filename:
             try:
                 # Limpa completamente a grid antes de iniciar
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
-                
-                # Reset completo do estado
-                self.xml_parser.initial_state = None
-                self.xml_parser.intermediate_state = None
-                self._current_change_index = -1
-                self._changed_items = []
-                self._search_results = []
-                self._current_search_index = -1
+                self.clear_grid()
                 
-                # Atualiza a interface
-                self.update_idletasks()
+                # O estado do parser é redefinido pela carga, na thread de trabalho
+                self.view_model.reset_navigation()
                 
                 # Carrega o novo arquivo
                 self.load_xml(filename)
@@ -331,154 +332,169 @@ class XMLGridView(tk.Frame):
                 self.reset_btn.config(state='normal')
                 
                 # Limpa o log
-                self.log_area.configure(state='normal')
-                self.log_area.delete(1.0, tk.END)
-                self.log_area.configure(state='disabled')
+                self.clear_log()
                 
                 # Loga a mensagem de carregamento
                 self.log_message(f"Arquivo carregado: {os.path.basename(filename)}")
                 
             except Exception as e:
                 self.log_message(f"Erro ao abrir arquivo: {str(e)}")
-                # Em caso de erro, tenta restaurar um estado limpo
-                self.xml_parser.initial_state = None
-                self.xml_parser.intermediate_state = None
     
     def load_xml(self, filename: str) -> None:
         """
-        Carrega o arquivo XML e atualiza o grid
+        Carrega o arquivo XML como estado inicial e atualiza o grid
         
         Args:
             filename (str): Caminho do arquivo XML
         """
-        try:
-            # Limpa o cache do parser
-            with self.xml_parser._cache_lock:
-                self.xml_parser._element_cache = {}
-            
-            # Reseta o estado do parser
-            self.xml_parser._last_parse_time = 0
-            
-            # Carrega o arquivo
-            xml_data = self.xml_parser.parse_file(filename)
-            self.initial_state = xml_data
-            
-            # Atualiza a interface em um processo separado
-            self.after(10, lambda: self.update_grid(xml_data))
-            
-        except Exception as e:
-            # Limpa o estado em caso de erro
-            self.xml_parser.initial_state = None
-            self.xml_parser.intermediate_state = None
-            
-            # Limpa a grid
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            # Atualiza a interface
-            self.update_idletasks()
-            
-            # Loga o erro
-            raise Exception(f"Erro ao carregar arquivo: {str(e)}")
+        self._submit_reload(filename, None, "Erro ao abrir arquivo")
+    
+    def _submit_reload(self, file_path: str, message: Optional[str], error_prefix: str) -> None:
+        """
+        Relê o arquivo como novo estado inicial numa thread do pool
+        
+        Usa a mesma chave do processamento de alterações, então nunca roda
+        junto com um processamento do mesmo arquivo (ambos alteram o estado
+        do parser) e a interface não bloqueia durante o parse. Enquanto a
+        releitura estiver pendente, alterações do arquivo não a substituem:
+        são descartadas, pois ela lerá a versão mais recente.
+        
+        Args:
+            file_path (str): Caminho do arquivo XML
+            message (str): Mensagem registrada quando o grid for preenchido
+            error_prefix (str): Início da mensagem de erro
+        """
+        file_path = os.path.abspath(file_path)
+        generation = self.view_model.generation
+        builder = self.view_model.delta_builder
+        self._reload_pending.add(file_path)
+        
+        def reload():
+            # A partir daqui, alterações novas entram na fila depois desta leitura
+            self._reload_pending.discard(file_path)
+            try:
+                self.xml_parser.initial_state = None
+                self.xml_parser.intermediate_state = None
+                self.xml_parser._element_cache.clear()
+                xml_data = self.xml_parser.parse_file(file_path)
+                self.initial_state = xml_data
+                builder.reset(xml_data)
+                self._render_scheduler.submit({
+                    'generation': generation,
+                    'data': xml_data,
+                    'delta': None,
+                    'version': None,
+                    'last_changes': [],
+                    'messages': [message] if message else [],
+                    'processing_info': None
+                })
+            except Exception as e:
+                self.xml_parser.initial_state = None
+                self.xml_parser.intermediate_state = None
+                self.bridge.post(self.log_message, f"{error_prefix}: {str(e)}")
+        
+        self._submitter.submit(file_path, None, reload)
+
+    def set_view_mode(self, mode: str) -> None:
+        """
+        Alterna o modo de visualização do grid
+        
+        Args:
+            mode (str): 'flat' (lista completa), 'tree' (hierarquia com nós recolhíveis)
+                ou 'changes' (somente linhas alteradas)
+        """
+        if self.view_model.set_view_mode(mode):
+            self.virtual_grid.set_source(self.view_model.source)
+            self._refresh_after_change()
+    
+    def _on_view_mode_selected(self, event=None) -> None:
+        """Aplica o modo escolhido no seletor de visualização"""
+        self.set_view_mode(VIEW_MODES.get(self.view_mode_var.get(), 'flat'))
+    
+    def _on_grid_click(self, event: tk.Event) -> None:
+        """Mostra o diff da linha clicada"""
+        position = self.virtual_grid.position_at(event.y)
+        if position is not None:
+            self.show_detail(self.view_model.xpath_at(position))
+    
+    def show_detail(self, xpath: str) -> None:
+        """
+        Exibe no painel de detalhes o diff completo de uma linha
+        
+        Args:
+            xpath (str): xpath da linha
+        """
+        row = self.view_model.rows.index.get(xpath)
+        if row is not None:
+            self.diff_pane.show(row.xpath, row.original, row.current)
+    
+    def _toggle_tree_node(self, event: tk.Event) -> None:
+        """Expande ou recolhe o nó sob o cursor (duplo clique em qualquer coluna, modo árvore)"""
+        position = self.virtual_grid.position_at(event.y)
+        if position is not None and self.view_model.toggle(position):
+            self.virtual_grid.refresh()
+
+    def clear_grid(self) -> None:
+        """Remove todas as linhas do grid"""
+        self._render_scheduler.cancel()
+        self.view_model.clear()
+        self.diff_pane.clear()
+        self.virtual_grid.scroll_to(0)
+        self.update_idletasks()
     
     def update_grid(self, xml_data: List[Dict[str, Any]], last_changes: List[Dict[str, Any]] = None) -> None:
         """
-        Atualiza o grid com os dados XML de forma incremental
+        Atualiza o grid com os dados XML
+        
+        O modelo Python é reconstruído e apenas as linhas visíveis são
+        reescritas no Treeview.
         
         Args:
             xml_data (List[Dict]): Lista de elementos XML
             last_changes (List[Dict]): Lista das últimas alterações
         """
         try:
-            # MANTÉM itens existentes - NÃO limpa tudo
-            current_items = {}
-            for item in self.tree.get_children():
-                try:
-                    values = self.tree.item(item)['values']
-                    if len(values) >= 5:
-                        xpath = values[4]  # xpath é a quinta coluna
-                        current_items[xpath] = item
-                except Exception:
-                    continue
-
-            last_modified_item = None
-            if last_changes and len(last_changes) > 0:
-                xpath = last_changes[-1].get('xpath', '')
-                # Busca o item existente pelo xpath
-                last_modified_item = current_items.get(xpath)
-            
-            # Atualiza ou insere itens
-            for element in xml_data:
-                try:
-                    tag = element.get('tag', '')
-                    original = element.get('initial_value', element.get('value', ''))
-                    current = element.get('value', '')
-                    parent_number = element.get('parent_number', '')
-                    xpath = element.get('xpath', '')
-                    
-                    # Formata o valor para visualização
-                    if len(current) > 500:
-                        current = current[:497] + '...'
-                    if len(original) > 500:
-                        original = original[:497] + '...'
-                    
-                    values = (parent_number, tag, original, current, xpath)
-                    
-                    # Se o item já existe, ATUALIZA
-                    if xpath in current_items:
-                        item_id = current_items[xpath]
-                        self.tree.item(item_id, values=values)
-                        
-                        if element.get('modified', False):
-                            self.tree.item(item_id, tags=('changed',))
-                            if last_modified_item is None:
-                                last_modified_item = item_id
-                        else:
-                            self.tree.item(item_id, tags=())
-                        
-                        # Remove do dict para saber quais sobraram
-                        del current_items[xpath]
-                    else:
-                        # Se não existe, INSERE novo
-                        item_id = self.tree.insert('', 'end', values=values)
-                        if element.get('modified', False):
-                            self.tree.item(item_id, tags=('changed',))
-                            if last_modified_item is None:
-                                last_modified_item = item_id
-                    
-                except Exception as e:
-                    self.log_message(f"Erro ao atualizar elemento {tag}: {str(e)}")
-            
-            # Remove itens que não existem mais
-            for item_id in current_items.values():
-                try:
-                    self.tree.delete(item_id)
-                except Exception:
-                    continue
-            
-            # SCROLL FUNCIONA - item_id é preservado
-            if last_modified_item:
-                self.tree.see(last_modified_item)
-                
-            # Atualiza lista de itens alterados para navegação
-            self._changed_items = [
-                item for item in self.tree.get_children()
-                if 'changed' in self.tree.item(item)['tags']
-            ]
-                
-            # Atualiza estado dos botões de navegação
-            has_changes = len(self._changed_items) > 0
-            self.up_btn.configure(state='normal' if has_changes else 'disabled')
-            self.down_btn.configure(state='normal' if has_changes else 'disabled')
-            
-            # Reseta o índice de navegação quando o grid é atualizado
-            self._current_change_index = -1
+            self.view_model.load(xml_data)
+            self._refresh_after_change(last_changes)
             
         except Exception as e:
             self.log_message(f"Erro ao atualizar grid: {str(e)}")
-                
-        # Ajusta a largura da coluna Linha para ser menor
-        self.tree.column('Linha', width=60, minwidth=50)
+    
+    def apply_grid_delta(self, delta: Dict[str, Any], last_changes: List[Dict[str, Any]], generation: int) -> None:
+        """
+        Aplica ao grid apenas as linhas adicionadas, removidas e alteradas
+        
+        Args:
+            delta (Dict): Delta gerado por GridDeltaBuilder na thread de trabalho
+            last_changes (List[Dict]): Lista das últimas alterações
+            generation (int): Geração do grid em que o delta foi calculado
+        """
+        if generation != self.view_model.generation:
+            return
+        try:
+            if not self.view_model.apply_delta(delta):
+                return
+            self._refresh_after_change(last_changes)
+        except Exception as e:
+            self.log_message(f"Erro ao atualizar grid: {str(e)}")
+    
+    def _refresh_after_change(self, last_changes: List[Dict[str, Any]] = None) -> None:
+        """Reescreve as linhas visíveis e rola até a última alteração"""
+        # Rola para a última alteração ou, na falta dela, para a primeira linha alterada
+        target = self.view_model.change_target(last_changes)
+        
+        self.virtual_grid.refresh()
+        if target is not None:
+            self.virtual_grid.see(target)
+        
+        # Recalcula o diff do painel de detalhes se a linha exibida mudou
+        if self.diff_pane.xpath is not None:
+            self.diff_pane.refresh(self.view_model.rows.index.get(self.diff_pane.xpath))
+            
+        # Atualiza estado dos botões de navegação
+        has_changes = self.view_model.has_changes()
+        self.up_btn.configure(state='normal' if has_changes else 'disabled')
+        self.down_btn.configure(state='normal' if has_changes else 'disabled')
     
     def start_monitoring(self, filename: str) -> None:
         """
@@ -497,6 +513,11 @@ class XMLGridView(tk.Frame):
     def _actually_start_monitoring(self, filename: str) -> None:
         """Método interno para iniciar o monitoramento após delay"""
         try:
+            # Opções de monitoramento do arquivo ([Watch] e [Watch:<padrão>])
+            options = self.config_service.snapshot.watch_options(os.path.abspath(filename))
+            self.xml_monitor.min_poll_interval = options['min_poll_interval']
+            self.xml_monitor.max_poll_interval = options['max_poll_interval']
+            self.xml_monitor.debounce_seconds = options['debounce']
             self.xml_monitor.start_monitoring(
                 filename,
                 callback=self.on_file_changed
@@ -520,29 +541,27 @@ class XMLGridView(tk.Frame):
                 self.start_monitoring(filename)
                 self.log_message("Monitoramento retomado")
 
-    def load_sound_config(self):
-        """Carrega configurações de som em cache"""
-        try:
-            config = configparser.ConfigParser()
-            # Usa o diretório do executável para carregar as configurações
-            if getattr(sys, 'frozen', False):
-                # Se estiver rodando como executável
-                settings_file = os.path.join(os.path.dirname(sys.executable), "settings.ini")
-            else:
-                # Se estiver rodando como script
-                settings_file = os.path.join(os.path.dirname(__file__), "settings.ini")
-            
-            if os.path.exists(settings_file):
-                config.read(settings_file)
-                self.sound_config.update({
-                    'enabled': config.getboolean('Sound', 'enabled'),
-                    'frequency': config.getint('Sound', 'frequency'),
-                    'duration': config.getint('Sound', 'duration'),
-                    'use_custom_sound': config.getboolean('Sound', 'use_custom_sound'),
-                    'custom_sound': config.get('Sound', 'custom_sound')
-                })
-        except Exception:
-            pass  # Mantém os valores padrão em caso de erro
+    def _settings_file(self) -> str:
+        """Caminho do settings.ini"""
+        # Usa o diretório do executável para carregar as configurações
+        if getattr(sys, 'frozen', False):
+            # Se estiver rodando como executável
+            return os.path.join(os.path.dirname(sys.executable), "settings.ini")
+        # Se estiver rodando como script
+        return os.path.join(os.path.dirname(__file__), "settings.ini")
+
+    def apply_config(self, snapshot: ConfigSnapshot) -> None:
+        """
+        Aplica um snapshot de configurações (thread da interface)
+        
+        Args:
+            snapshot (ConfigSnapshot): Configurações publicadas pelo serviço
+        """
+        self.sound_config = dict(snapshot.section('Sound'))
+        # O log é criado com estes valores; alterações valem na próxima execução
+        self.log_config = dict(snapshot.section('Log'))
+        # Perfil opcional dos ciclos de alteração (variáveis de ambiente têm prioridade)
+        get_profiler().configure(**profile_options(snapshot.section('Profile')))
 
     def _play_sound(self) -> None:
         """Reproduz o som de notificação de forma assíncrona"""
@@ -550,6 +569,11 @@ class XMLGridView(tk.Frame):
             return
 
         def play_async():
+            try:
+                # Importado sob demanda: winsound só existe no Windows
+                import winsound
+            except ImportError:
+                return
             try:
                 if self.sound_config['use_custom_sound'] and self.sound_config['custom_sound']:
                     if os.path.exists(self.sound_config['custom_sound']):
@@ -574,27 +598,111 @@ class XMLGridView(tk.Frame):
         # Toca o som imediatamente ao detectar mudança
         self._play_sound()
         
-        # Processa as alterações em uma thread separada
+        file_path = self.xml_monitor.current_file
+        if not file_path:
+            return
+        
+        # Processa as alterações no pool; versões superadas são descartadas
+        generation = self.view_model.generation
+        builder = self.view_model.delta_builder
+        trace = processing_info.get('trace') if processing_info else None
+        if file_path in self._reload_pending:
+            # A releitura pendente já vai ler esta versão
+            if trace is not None:
+                record_coalesced(trace)
+            return
+        
         def process_changes():
             try:
-                data, changes, last_changes = self.xml_parser.parse_file_and_get_changes(self.xml_monitor.current_file)
+                result = self.xml_parser.parse_file_and_get_changes(file_path, trace)
+                update = {
+                    'generation': generation,
+                    'data': None,
+                    'delta': None,
+                    'version': None,
+                    'last_changes': [],
+                    'messages': [],
+                    'processing_info': processing_info
+                }
+                if len(result) == 2:
+                    # Primeira leitura após redefinir: carrega o grid inteiro
+                    data, changes = result
+                    builder.reset(data)
+                    update['data'] = data
+                else:
+                    data, changes, last_changes = result
+                    # O delta é montado aqui; a thread da interface só aplica as linhas tocadas
+                    delta, version = builder.build(data, last_changes)
+                    if trace is not None:
+                        # O delta do grid faz parte da etapa de diff
+                        trace.mark('diff')
+                    update.update(data=data, delta=delta, version=version, last_changes=last_changes)
                 
-                # Atualiza a interface na thread principal
-                self.after(0, lambda: self.update_grid(data, last_changes))
+                for change in changes or ():
+                    try:
+                        update['messages'].append(self.xml_parser.format_change_message(change))
+                    except Exception as e:
+                        update['messages'].append(f"Erro ao formatar mensagem de alteração: {str(e)}")
                 
-                if changes:
-                    for change in changes:
-                        try:
-                            message = self.xml_parser.format_change_message(change)
-                            self.after(0, lambda m=message: self.log_message(m, processing_info))
-                        except Exception as e:
-                            error_msg = str(e)
-                            self.after(0, lambda: self.log_message(f"Erro ao formatar mensagem de alteração: {error_msg}"))
+                # Aplicado no próximo quadro, junto com as versões que chegarem até lá
+                self._render_scheduler.submit(update)
             except Exception as e:
-                error_msg = str(e)
-                self.after(0, lambda: self.log_message(f"Erro ao processar alterações: {error_msg}"))
+                self.bridge.post(self.log_message, f"Erro ao processar alterações: {str(e)}")
+        
+        # Perfil (quando ativo) cobre leitura, diff e montagem do delta na thread de trabalho
+        self._submitter.submit(file_path, trace, get_profiler().run, os.path.basename(file_path), process_changes)
+
+    def _merge_updates(self, pending: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combina duas atualizações pendentes do grid em uma só
+        
+        Os deltas são cumulativos e as mensagens descrevem todas as alterações
+        em relação ao estado inicial, então a atualização mais recente
+        substitui a anterior; só as últimas alterações são herdadas quando a
+        nova versão não trouxe nenhuma. Se a pendente for uma recarga
+        completa, o resultado também é. O trace da atualização descartada é
+        registrado como 'coalesced'.
+        """
+        folded = pending['processing_info']
+        if folded and folded.get('trace') is not None:
+            record_coalesced(folded['trace'])
+        if update['generation'] == pending['generation']:
+            if not update['last_changes']:
+                update['last_changes'] = pending['last_changes']
+            if pending['delta'] is None and update['delta'] is not None:
+                # O delta foi calculado sobre a base da recarga pendente, que o
+                # grid nunca exibiu: continua sendo uma recarga completa, com os
+                # dados mais novos (a versão do delta ainda é confirmada)
+                update['delta'] = None
+        return update
+
+    def _render_update(self, update: Dict[str, Any], versions: int) -> None:
+        """
+        Aplica no grid e no log a atualização combinada de um quadro
         
-        threading.Thread(target=process_changes, daemon=True).start()
+        Args:
+            update (Dict): Atualização gerada pelo processamento mais recente
+            versions (int): Número de versões do arquivo combinadas nesta atualização
+        """
+        if update['generation'] != self.view_model.generation:
+            return
+        
+        if update['delta'] is None:
+            self.update_grid(update['data'], update['last_changes'])
+        else:
+            self.apply_grid_delta(update['delta'], update['last_changes'], update['generation'])
+        if update['version'] is not None:
+            self.view_model.delta_builder.commit(update['version'])
+        
+        processing_info = update['processing_info']
+        trace = processing_info.get('trace') if processing_info else None
+        if trace is not None:
+            trace.mark('apply')
+            get_latency_tracker().record(trace)
+        for message in update['messages']:
+            self.log_message(message, processing_info)
+        if versions > 1:
+            self.log_message(f"{versions - 1} versão(ões) intermediária(s) agrupada(s) nesta atualização")
 
     def log_message(self, message: str, processing_info: Dict[str, Any] = None) -> None:
         """
@@ -606,17 +714,36 @@ class XMLGridView(tk.Frame):
         """
         current_time = time.time()
         timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Habilita temporariamente para inserir o texto
-        self.log_area.configure(state='normal')
+        detail = None
         
         if processing_info and 'start_time' in processing_info:
             processing_time = current_time - processing_info['start_time']
             detection_time = processing_info.get('detection_time', timestamp)
-            self.log_area.insert('end', f"[{timestamp}] {message} (Detectado às {detection_time}, processado em {processing_time:.3f}s)\n")
+            line = f"[{timestamp}] {message} (Detectado às {detection_time}, processado em {processing_time:.3f}s)"
+            trace = processing_info.get('trace')
+            if trace is not None:
+                # Tempo de cada etapa, do evento no disco até a linha aplicada no grid;
+                # calculado só quando a linha for formatada
+                detail = trace.summary
         else:
-            self.log_area.insert('end', f"[{timestamp}] {message}\n")
+            line = f"[{timestamp}] {message}"
+        
+        # A linha vai para o modelo; o widget é atualizado uma vez por quadro
+        self.log_model.append(line, detail)
+        self._log_scheduler.submit(None)
+
+    def _flush_log(self) -> None:
+        """Insere no widget, de uma vez, as linhas acumuladas desde o último quadro"""
+        text, trim = self.log_model.take_batch()
+        if not text:
+            return
         
+        # Habilita temporariamente para inserir o texto
+        self.log_area.configure(state='normal')
+        self.log_area.insert('end', text)
+        if trim:
+            # Descarta as linhas mais antigas em bloco
+            self.log_area.delete('1.0', f'{trim + 1}.0')
         self.log_area.see('end')
         # Desabilita novamente para manter somente leitura
         self.log_area.configure(state='disabled')
@@ -624,6 +751,13 @@ class XMLGridView(tk.Frame):
         # Força o foco de volta para a janela principal para permitir navegação por Tab
         self.focus_set()
 
+    def clear_log(self) -> None:
+        """Limpa o log visível"""
+        self.log_model.clear()
+        self.log_area.configure(state='normal')
+        self.log_area.delete(1.0, tk.END)
+        self.log_area.configure(state='disabled')
+
     def navigate_changes(self, direction: str) -> None:
         """
         Navega entre as alterações no XML
@@ -631,35 +765,27 @@ class XMLGridView(tk.Frame):
         Args:
             direction (str): Direção da navegação ('up' ou 'down')
         """
+        row = self.view_model.step_change(direction)
         # Se não houver alterações, retorna
-        if not self._changed_items:
+        if row is None:
+            return
+        position = self.view_model.reveal(row.xpath)
+        if position is None:
             return
-            
-        # Atualiza o índice de mudança atual com base na direção
-        if direction == 'up':
-            self._current_change_index = (self._current_change_index - 1) % len(self._changed_items)
-        else:  # down
-            self._current_change_index = (self._current_change_index + 1) % len(self._changed_items)
-            
-        # Obtém o ID do item para o índice atual
-        current_item = self._changed_items[self._current_change_index]
         
-        # Rola para exibir o item
-        self.tree.see(current_item)
+        # Rola para exibir a linha
+        self.virtual_grid.refresh()
+        self.virtual_grid.see(position)
         
         # Destaca o item visualmente
-        self.flash_item(current_item)
+        self.flash_item(self.virtual_grid.item_for(position))
+        self.show_detail(row.xpath)
         
         # Mostra mensagem de navegação no log
         try:
-            item_data = self.tree.item(current_item, 'values')
-            line_number = item_data[0] if len(item_data) > 0 else "?"
-            tag = item_data[1] if len(item_data) > 1 else "?"
-            value = item_data[3] if len(item_data) > 3 else "?"
-            
             self.log_message(
-                f"Navegando para mudança {self._current_change_index + 1} de {len(self._changed_items)}: "
-                f"Linha {line_number}, tag <{tag}>, valor: '{value}'"
+                f"Navegando para mudança {self.view_model.rows.change_number(row) + 1} de {self.view_model.rows.changed_count()}: "
+                f"Linha {row.line}, tag <{row.tag}>, valor: '{row.values()[3]}'"
             )
         except Exception as e:
             self.log_message(f"Erro ao navegar: {str(e)}")
@@ -684,78 +810,43 @@ class XMLGridView(tk.Frame):
         if self._search_dialog is None or not self._search_dialog.winfo_exists():
             self._search_dialog = SearchDialog(self, self.handle_search)
     
-    def handle_search(self, search_text: str, direction: str) -> None:
+    def handle_search(self, search_text: str, direction: str, options: Dict[str, Any] = None) -> Optional[int]:
         """
         Manipula a busca e navegação entre resultados
         
         Args:
-            search_text (str): Texto a ser buscado
-            direction (str): Direção da busca ('up', 'down' ou 'clear')
+            search_text (str): Texto ou expressão regular a ser buscada
+            direction (str): Direção da busca ('up', 'down', 'live' ou 'clear');
+                'live' refaz a busca e destaca o primeiro resultado
+            options (Dict): Opções da busca ('fields', 'regex', 'changed_only')
+            
+        Returns:
+            Optional[int]: Número de resultados, ou None se a expressão regular for inválida
         """
         if direction == 'clear':
             self.clear_search_results()
-            return
-            
-        # Se é uma nova busca
-        if search_text != self._current_search_text:
-            self._current_search_text = search_text
-            search_text = search_text.lower()
-            self._search_results = []
-            self._current_search_index = -1
-            
-            # Busca em todos os itens
-            for item in self.tree.get_children():
-                values = self.tree.item(item)['values']
-                if len(values) >= 2:  # Garante que tem a coluna da tag
-                    tag = str(values[1]).lower()  # Tag é a segunda coluna
-                    if search_text in tag:
-                        self._search_results.append(item)
-        
-        if not self._search_results:
-            return
-        
-        # Navega entre os resultados
-        if direction == 'up':
-            self._current_search_index -= 1
-            if self._current_search_index < 0:
-                self._current_search_index = len(self._search_results) - 1
-        else:  # down
-            self._current_search_index += 1
-            if self._current_search_index >= len(self._search_results):
-                self._current_search_index = 0
-        
-        item_id = self._search_results[self._current_search_index]
-        self.tree.see(item_id)
-        self.highlight_search_result(item_id)
+            return 0
+        
+        count = self.view_model.search(search_text, direction, options)
+        if count:
+            self.highlight_search_result(self.view_model.current_search_result)
+        elif count == 0:
+            self.virtual_grid.refresh()
+        return count
     
-    def highlight_search_result(self, item_id: str) -> None:
+    def highlight_search_result(self, xpath: str) -> None:
         """
-        Destaca o resultado da busca mantendo outras tags
+        Rola até o resultado da busca (o destaque é feito pelo modelo)
         
         Args:
-            item_id (str): ID do item no Treeview
+            xpath (str): xpath da linha encontrada
         """
-        # Remove highlight anterior
-        for item in self._search_results:
-            tags = list(self.tree.item(item)['tags'])
-            if 'search_result' in tags:
-                tags.remove('search_result')
-            self.tree.item(item, tags=tags)
-        
-        # Adiciona novo highlight mantendo outras tags
-        current_tags = list(self.tree.item(item_id)['tags'])
-        if 'search_result' not in current_tags:
-            current_tags.append('search_result')
-        self.tree.item(item_id, tags=current_tags)
+        position = self.view_model.reveal(xpath)
+        self.virtual_grid.refresh()
+        if position is not None:
+            self.virtual_grid.see(position)
     
     def clear_search_results(self) -> None:
         """Limpa todos os resultados da busca"""
-        for item in self._search_results:
-            tags = list(self.tree.item(item)['tags'])
-            if 'search_result' in tags:
-                tags.remove('search_result')
-            self.tree.item(item, tags=tags)
-        
-        self._search_results = []
-        self._current_search_index = -1
-        self._current_search_text = ""
+        self.view_model.clear_search()
+        self.virtual_grid.refresh()
@@ -0,0 +1,128 @@
+import threading
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+# Número padrão de linhas mantidas no widget de log
+DEFAULT_MAX_LINES = 2000
+
+class _LogLine:
+    """Linha do log cujo complemento (detail) só é calculado ao ser formatada"""
+    __slots__ = ('line', 'detail')
+
+    def __init__(self, line: str, detail: Optional[Callable[[], str]] = None):
+        self.line = line
+        self.detail = detail
+
+    def text(self) -> str:
+        if self.detail is not None:
+            try:
+                detail = self.detail()
+            except Exception as e:
+                detail = f"erro: {e}"
+            self.line = f"{self.line} [{detail}]" if detail else self.line
+            self.detail = None
+        return self.line
+
+class LogModel:
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, history_path: Optional[str] = None):
+        """
+        Modelo do log da interface: buffer circular com escrita em lotes
+
+        As linhas são acumuladas em memória e entregues ao widget uma vez
+        por quadro (take_batch); só então são formatadas, de modo que o
+        complemento de uma linha omitida nunca é calculado. Mensagens com
+        várias linhas contam cada linha separadamente. Apenas as últimas
+        max_lines linhas ficam visíveis; as mais antigas são removidas do
+        widget em bloco. Se history_path for informado, o histórico
+        completo é gravado em arquivo, também em lotes.
+
+        Args:
+            max_lines (int): Número máximo de linhas visíveis
+            history_path (Optional[str]): Arquivo para o histórico completo (opcional)
+        """
+        self.max_lines = max(1, max_lines)
+        self.history_path = history_path
+        self.lines = deque(maxlen=self.max_lines)
+        self._pending: deque = deque(maxlen=self.max_lines)
+        self._history: List[_LogLine] = []
+        self._widget_lines = 0
+        self._lock = threading.Lock()
+        self.total = 0
+        # Linhas que nunca chegaram ao widget porque um lote excedeu o limite
+        self.skipped = 0
+        self._skipped_batch = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def append(self, line: str, detail: Optional[Callable[[], str]] = None) -> None:
+        """
+        Adiciona uma mensagem (pode ser chamado de qualquer thread)
+
+        Args:
+            line (str): Mensagem sem quebra de linha final; pode ter várias linhas
+            detail (Optional[Callable]): Complemento da última linha, calculado
+                apenas quando ela for formatada (opcional)
+        """
+        parts = line.split('\n')
+        entries = [_LogLine(part) for part in parts[:-1]]
+        entries.append(_LogLine(parts[-1], detail))
+        with self._lock:
+            for entry in entries:
+                if len(self._pending) == self._pending.maxlen:
+                    self.skipped += 1
+                    self._skipped_batch += 1
+                self._pending.append(entry)
+                self.lines.append(entry)
+                if self.history_path:
+                    self._history.append(entry)
+            self.total += len(entries)
+
+    def has_pending(self) -> bool:
+        """Indica se há linhas aguardando o próximo quadro"""
+        with self._lock:
+            return bool(self._pending)
+
+    def take_batch(self) -> Tuple[str, int]:
+        """
+        Retira as linhas pendentes para inserção no widget
+
+        Returns:
+            tuple: (texto a inserir no fim, número de linhas a remover do início)
+        """
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            if self._skipped_batch:
+                # Indica a lacuna no widget; as linhas continuam no histórico
+                batch.insert(0, _LogLine(f"... {self._skipped_batch} linha(s) omitida(s) ..."))
+                self._skipped_batch = 0
+            history, self._history = self._history, []
+
+            self._widget_lines += len(batch)
+            trim = 0
+            # Remove em bloco, com folga, para não apagar linha a linha
+            if self._widget_lines > self.max_lines + self.max_lines // 10:
+                trim = self._widget_lines - self.max_lines
+                self._widget_lines = self.max_lines
+
+        if history:
+            self._write_history(history)
+        text = '\n'.join(entry.text() for entry in batch) + '\n' if batch else ''
+        return text, trim
+
+    def clear(self) -> None:
+        """Limpa as linhas visíveis (o histórico em arquivo é mantido)"""
+        with self._lock:
+            self.lines.clear()
+            self._pending.clear()
+            self._skipped_batch = 0
+            self._widget_lines = 0
+
+    def _write_history(self, lines: List[_LogLine]) -> None:
+        """Acrescenta as linhas ao arquivo de histórico"""
+        try:
+            with open(self.history_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(entry.text() for entry in lines) + '\n')
+        except Exception as e:
+            print(f"Erro ao gravar histórico do log: {e}")
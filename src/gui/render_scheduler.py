@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+class RenderScheduler:
+    def __init__(
+        self,
+        widget: Any,
+        render: Callable[[Any, int], None],
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+        max_fps: float = 30.0,
+        post: Optional[Callable[..., None]] = None
+    ):
+        """
+        Agenda atualizações da interface com taxa máxima de quadros
+
+        Atualizações enviadas entre dois quadros são combinadas em uma só
+        (por padrão a mais recente vence) e aplicadas de uma vez na thread
+        da interface. Assim, um arquivo gravado em alta frequência não
+        enfileira centenas de redesenhos no loop de eventos do Tk.
+
+        Args:
+            widget: Widget Tk usado para agendar os quadros (after)
+            render (Callable): Chamada na thread da interface com a atualização
+                combinada e o número de versões que ela representa
+            merge (Callable): Combina (pendente, nova) em uma única atualização
+            max_fps (float): Número máximo de quadros por segundo
+            post (Callable): Agenda uma chamada na thread da interface (ex.: TkBridge.post);
+                sem ele, submit deve ser chamado na thread da interface
+        """
+        self.widget = widget
+        self.render = render
+        self.merge = merge or (lambda pending, update: update)
+        self.frame_interval = 1.0 / max_fps
+        self.post = post
+        self._lock = threading.Lock()
+        self._pending = None
+        self._versions = 0
+        self._scheduled = None
+        self._last_frame = 0.0
+        self.frames = 0
+        self.folded = 0
+
+    def submit(self, update: Any) -> None:
+        """
+        Envia uma atualização (pode ser chamado de qualquer thread)
+
+        Args:
+            update: Atualização a ser combinada com as pendentes
+        """
+        with self._lock:
+            if self._versions:
+                self._pending = self.merge(self._pending, update)
+            else:
+                self._pending = update
+            self._versions += 1
+            if self._scheduled is not None:
+                return
+            # Quadro solicitado; o after é criado na thread da interface
+            self._scheduled = True
+        if self.post is not None:
+            self.post(self._arm)
+        else:
+            self._arm()
+
+    def _arm(self) -> None:
+        with self._lock:
+            if self._scheduled is not True:
+                return  # Cancelado antes de chegar à thread da interface
+            delay = self._last_frame + self.frame_interval - time.monotonic()
+            self._scheduled = self.widget.after(max(0, int(delay * 1000)), self._on_frame)
+
+    def _on_frame(self) -> None:
+        with self._lock:
+            self._scheduled = None
+        self.flush()
+
+    def flush(self) -> bool:
+        """
+        Aplica imediatamente a atualização pendente (thread da interface)
+
+        Returns:
+            bool: True se havia algo a aplicar
+        """
+        with self._lock:
+            if not self._versions:
+                return False
+            update, versions = self._pending, self._versions
+            self._pending = None
+            self._versions = 0
+            self._last_frame = time.monotonic()
+            self.frames += 1
+            self.folded += versions - 1
+        self.render(update, versions)
+        return True
+
+    def cancel(self) -> None:
+        """Descarta a atualização pendente e o quadro agendado"""
+        with self._lock:
+            self._pending = None
+            self._versions = 0
+            scheduled, self._scheduled = self._scheduled, None
+        if scheduled is not None and scheduled is not True:
+            try:
+                self.widget.after_cancel(scheduled)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna contadores de quadros e versões agrupadas"""
+        with self._lock:
+            return {
+                'frames': self.frames,
+                'folded': self.folded,
+                'pending': self._versions
+            }
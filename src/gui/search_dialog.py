@@ -1,23 +1,36 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable
+from typing import Any, Callable, Dict, Optional
+
+# Campos oferecidos no diálogo e os campos do índice correspondentes
+SEARCH_FIELD_OPTIONS = {
+    'Tag': ('tag',),
+    'Valor': ('value',),
+    'XPath': ('xpath',),
+    'Todos': ('tag', 'value', 'xpath'),
+}
+
+# Espera após a última tecla antes de buscar enquanto o usuário digita
+LIVE_SEARCH_DELAY_MS = 150
 
 class SearchDialog(tk.Toplevel):
-    def __init__(self, parent: tk.Widget, search_callback: Callable[[str, str], None]):
+    def __init__(self, parent: tk.Widget, search_callback: Callable[[str, str, Dict[str, Any]], Optional[int]]):
         """
         Inicializa o diálogo de busca
         
         Args:
             parent (tk.Widget): Widget pai
-            search_callback (Callable): Função a ser chamada com o texto e direção da busca
+            search_callback (Callable): Função chamada com o texto, a direção e as opções da
+                busca; retorna o número de resultados (None se a expressão for inválida)
         """
         super().__init__(parent)
         self.search_callback = search_callback
-        self.title("Buscar Tag")
+        self.title("Buscar")
         self.transient(parent)
+        self._live_job = None
         
         # Centraliza o diálogo
-        self.geometry("280x90")
+        self.geometry("340x160")
         self.resizable(False, False)
         
         # Frame principal
@@ -25,11 +38,37 @@ class SearchDialog(tk.Toplevel):
         main_frame.pack(fill='both', expand=True)
         
         # Label e entrada
-        ttk.Label(main_frame, text="Nome da Tag:").pack(anchor='w')
+        ttk.Label(main_frame, text="Buscar:").pack(anchor='w')
         self.search_entry = ttk.Entry(main_frame, width=35)
-        self.search_entry.pack(fill='x', pady=(0, 8))
+        self.search_entry.pack(fill='x', pady=(0, 4))
         self.search_entry.focus_set()
         
+        # Opções da busca
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill='x', pady=(0, 4))
+        
+        self.field_var = tk.StringVar(value='Tag')
+        field_combo = ttk.Combobox(
+            options_frame,
+            textvariable=self.field_var,
+            values=list(SEARCH_FIELD_OPTIONS),
+            state='readonly',
+            width=8
+        )
+        field_combo.pack(side='left', padx=(0, 6))
+        
+        self.regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Regex", variable=self.regex_var,
+                        command=self.schedule_live_search).pack(side='left', padx=(0, 6))
+        
+        self.changed_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Somente alterados", variable=self.changed_only_var,
+                        command=self.schedule_live_search).pack(side='left')
+        
+        # Contagem de resultados
+        self.count_label = ttk.Label(main_frame, text="")
+        self.count_label.pack(anchor='w', pady=(0, 4))
+        
         # Frame para os botões com padding mínimo
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill='x')
@@ -59,7 +98,9 @@ class SearchDialog(tk.Toplevel):
         # Bindings
         self.bind('<Return>', lambda e: self.search('down'))
         self.bind('<Shift-Return>', lambda e: self.search('up'))
-        self.bind('<Escape>', lambda e: self.destroy())
+        self.bind('<Escape>', lambda e: self.on_close())
+        self.search_entry.bind('<KeyRelease>', self._on_key_release)
+        field_combo.bind('<<ComboboxSelected>>', lambda e: self.schedule_live_search())
         
         # Centraliza na tela
         self.update_idletasks()
@@ -72,6 +113,35 @@ class SearchDialog(tk.Toplevel):
         # Evento ao fechar a janela
         self.protocol("WM_DELETE_WINDOW", self.on_close)
     
+    def get_options(self) -> Dict[str, Any]:
+        """Opções atuais da busca"""
+        return {
+            'fields': SEARCH_FIELD_OPTIONS.get(self.field_var.get(), ('tag',)),
+            'regex': self.regex_var.get(),
+            'changed_only': self.changed_only_var.get()
+        }
+    
+    def _on_key_release(self, event: tk.Event) -> None:
+        # Enter e Escape já têm seus próprios bindings
+        if event.keysym in ('Return', 'Escape', 'Shift_L', 'Shift_R'):
+            return
+        self.schedule_live_search()
+    
+    def schedule_live_search(self) -> None:
+        """Agenda a busca incremental, reiniciando a espera a cada tecla"""
+        if self._live_job is not None:
+            self.after_cancel(self._live_job)
+        self._live_job = self.after(LIVE_SEARCH_DELAY_MS, self._live_search)
+    
+    def _live_search(self) -> None:
+        self._live_job = None
+        search_text = self.search_entry.get().strip()
+        if not search_text:
+            self.search_callback("", "clear", self.get_options())
+            self.count_label.configure(text="")
+            return
+        self._show_count(self.search_callback(search_text, 'live', self.get_options()))
+    
     def search(self, direction: str) -> None:
         """
         Executa a busca com o texto inserido
@@ -81,9 +151,21 @@ class SearchDialog(tk.Toplevel):
         """
         search_text = self.search_entry.get().strip()
         if search_text:
-            self.search_callback(search_text, direction)
+            self._show_count(self.search_callback(search_text, direction, self.get_options()))
+    
+    def _show_count(self, count: Optional[int]) -> None:
+        """Mostra o número de resultados (ou o erro da expressão regular)"""
+        if count is None:
+            self.count_label.configure(text="Expressão regular inválida")
+        elif count == 0:
+            self.count_label.configure(text="Nenhum resultado")
+        else:
+            self.count_label.configure(text=f"{count} resultado(s)")
     
     def on_close(self) -> None:
         """Chamado quando a janela é fechada"""
-        self.search_callback("", "clear")  # Sinaliza para limpar as marcações
-        self.destroy() 
\ No newline at end of file
+        if self._live_job is not None:
+            self.after_cancel(self._live_job)
+            self._live_job = None
+        self.search_callback("", "clear", self.get_options())  # Sinaliza para limpar as marcações
+        self.destroy()
@@ -2,19 +2,12 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 import configparser
-import winsound
 import threading
 import sys
+from utils.config_service import get_config_service, default_settings
 
-DEFAULT_SETTINGS = {
-    'Sound': {
-        'enabled': 'true',
-        'custom_sound': '',
-        'use_custom_sound': 'false',
-        'frequency': '1000',
-        'duration': '100'
-    }
-}
+# Valores padrão (texto) derivados do esquema do serviço de configuração
+DEFAULT_SETTINGS = default_settings()
 
 class SettingsDialog(tk.Toplevel):
     def __init__(self, parent):
@@ -35,6 +28,9 @@ class SettingsDialog(tk.Toplevel):
             # Se estiver rodando como script
             self.settings_file = os.path.join(os.path.dirname(__file__), "settings.ini")
         
+        # Serviço compartilhado com a janela principal (mesmo snapshot, mesma recarga)
+        self.config_service = getattr(parent, 'config_service', None) or get_config_service(self.settings_file)
+        
         # Carrega as configurações
         self.load_settings()
         
@@ -172,6 +168,8 @@ class SettingsDialog(tk.Toplevel):
     def _play_sound_thread(self, sound_file=None, frequency=None, duration=None):
         """Função executada em uma thread separada para tocar o som"""
         try:
+            # Importado sob demanda: winsound só existe no Windows
+            import winsound
             if sound_file:
                 # Usa SND_ASYNC para tocar o som em segundo plano sem bloquear
                 winsound.PlaySound(sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC)
@@ -180,7 +178,12 @@ class SettingsDialog(tk.Toplevel):
                 winsound.Beep(frequency, min(duration, 1000))
         except Exception as e:
             # Se ocorrer algum erro, mostra uma mensagem na thread principal
-            self.after(0, lambda: messagebox.showerror("Erro", f"Erro ao reproduzir som: {str(e)}"))
+            error_msg = f"Erro ao reproduzir som: {str(e)}"
+            bridge = getattr(self.parent, 'bridge', None)
+            if bridge is not None:
+                bridge.post(messagebox.showerror, "Erro", error_msg)
+            else:
+                self.after(0, lambda: messagebox.showerror("Erro", error_msg))
     
     def test_sound(self):
         if not self.sound_enabled.get():
@@ -246,18 +249,8 @@ class SettingsDialog(tk.Toplevel):
         self.save_settings()
         
     def load_settings(self):
-        """Carrega as configurações, criando o arquivo se necessário"""
-        # Inicializa com valores padrão
-        for section, options in DEFAULT_SETTINGS.items():
-            if not self.config.has_section(section):
-                self.config.add_section(section)
-            for option, value in options.items():
-                if not self.config.has_option(section, option):
-                    self.config.set(section, option, value)
-        
-        # Tenta carregar arquivo existente
-        if os.path.exists(self.settings_file):
-            self.config.read(self.settings_file)
+        """Carrega as configurações do snapshot atual (já com os valores padrão)"""
+        self.config.read_dict(self.config_service.snapshot.as_strings())
     
     def save_settings(self):
         """Salva as configurações atuais no arquivo e atualiza o cache"""
@@ -285,10 +278,5 @@ class SettingsDialog(tk.Toplevel):
             self.config.set('Sound', 'duration', DEFAULT_SETTINGS['Sound']['duration'])
             self.duration_var.set(DEFAULT_SETTINGS['Sound']['duration'])
         
-        # Salva no arquivo
-        with open(self.settings_file, 'w') as configfile:
-            self.config.write(configfile)
-        
-        # Atualiza o cache no GridView
-        if hasattr(self.parent, 'load_sound_config'):
-            self.parent.load_sound_config()
+        # Salva pelo serviço, que publica o novo snapshot para a janela principal
+        self.config_service.save({'Sound': dict(self.config.items('Sound'))})
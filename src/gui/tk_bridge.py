@@ -0,0 +1,122 @@
+import queue
+import time
+from typing import Any, Callable, Dict
+
+class TkBridge:
+    def __init__(
+        self,
+        widget: Any,
+        poll_interval_ms: int = 16,
+        budget_ms: float = 8.0,
+        min_batch: int = 8,
+        max_batch: int = 4096
+    ):
+        """
+        Ponte entre threads de trabalho e o loop de eventos do Tk
+
+        Threads de trabalho não chamam o Tk: publicam chamadas em uma fila
+        thread-safe (post) que a thread da interface esvazia em lotes, em um
+        único after periódico. O tamanho do lote se adapta ao tempo gasto
+        para que cada poll fique dentro do orçamento, mantendo a latência da
+        interface previsível mesmo com os workers saturados.
+
+        Args:
+            widget: Widget Tk usado para agendar o poll (after)
+            poll_interval_ms (int): Intervalo entre polls com a fila vazia
+            budget_ms (float): Tempo máximo desejado por poll
+            min_batch (int): Menor número de chamadas por poll
+            max_batch (int): Maior número de chamadas por poll
+        """
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self.budget = budget_ms / 1000.0
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.batch_size = min_batch
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._after_id = None
+        self.processed = 0
+        self.polls = 0
+
+    def post(self, func: Callable, *args, **kwargs) -> None:
+        """
+        Agenda uma chamada na thread da interface (pode ser chamado de qualquer thread)
+
+        Args:
+            func (Callable): Função a ser chamada
+            *args, **kwargs: Argumentos da função
+        """
+        self._queue.put((func, args, kwargs))
+
+    @property
+    def queue_depth(self) -> int:
+        """Número de chamadas aguardando o próximo poll"""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Inicia o poll periódico (thread da interface)"""
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_interval_ms, self._poll)
+
+    def stop(self) -> None:
+        """Interrompe o poll periódico (thread da interface)"""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def drain(self, limit: int = None) -> int:
+        """
+        Executa chamadas pendentes na thread atual
+
+        Args:
+            limit (int): Número máximo de chamadas (None = lote atual)
+
+        Returns:
+            int: Número de chamadas executadas
+        """
+        limit = self.batch_size if limit is None else limit
+        deadline = time.perf_counter() + self.budget
+        count = 0
+        while count < limit:
+            try:
+                func, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"Erro ao processar evento na interface: {e}")
+            count += 1
+            if time.perf_counter() > deadline:
+                break
+        self.processed += count
+        return count
+
+    def _poll(self) -> None:
+        self._after_id = None
+        started = time.perf_counter()
+        count = self.drain()
+        elapsed = time.perf_counter() - started
+        self.polls += 1
+
+        # Ajusta o lote: dobra enquanto sobra orçamento, reduz quando estoura
+        if elapsed > self.budget:
+            self.batch_size = max(self.min_batch, self.batch_size // 2)
+        elif count >= self.batch_size and elapsed < self.budget / 2:
+            self.batch_size = min(self.max_batch, self.batch_size * 2)
+
+        # Com trabalho pendente, volta logo (dando vez aos eventos de tela)
+        delay = 1 if not self._queue.empty() else self.poll_interval_ms
+        self._after_id = self.widget.after(delay, self._poll)
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna contadores da ponte"""
+        return {
+            'queue_depth': self.queue_depth,
+            'batch_size': self.batch_size,
+            'processed': self.processed,
+            'polls': self.polls
+        }
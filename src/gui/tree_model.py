@@ -0,0 +1,278 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .grid_model import GridRowModel, truncate_value
+
+def parent_xpath(xpath: str) -> str:
+    """Retorna o xpath do pai ('' para a raiz)"""
+    return xpath[:xpath.rfind('/')]
+
+def _is_top_level(xpath: str) -> bool:
+    """Indica se o xpath tem um único passo (o elemento raiz, em qualquer das formas)"""
+    return xpath.count('/') == 1
+
+class TreeRowSource:
+    def __init__(self, model: GridRowModel):
+        """
+        Visão hierárquica (árvore) sobre o modelo de linhas do grid
+
+        A hierarquia é derivada dos xpaths (o pai de '/a/b[2]/@id' é
+        '/a/b[2]'). Só os nós expandidos têm seus filhos na lista visível,
+        que é a fonte de linhas do grid virtual. Cada nó guarda quantos
+        descendentes alterados possui, para marcar ancestrais recolhidos
+        sem percorrer a subárvore.
+
+        Args:
+            model (GridRowModel): Modelo com todas as linhas do documento
+        """
+        self.model = model
+        self.children: Dict[str, List[str]] = {}
+        self.expanded: Set[str] = set()
+        self.changed_below: Dict[str, int] = {}
+        self._changed: Set[str] = set()
+        self._nodes: Set[str] = set()
+        # Linhas mantidas como removidas em relação ao estado inicial
+        self._placeholders: Set[str] = set()
+        # Lista plana dos nós visíveis (raízes e filhos de nós expandidos)
+        self._visible: List[str] = []
+        # xpath -> posição em _visible; recalculado sob demanda após expandir/recolher
+        self._positions: Optional[Dict[str, int]] = None
+        # Linha do elemento raiz do documento
+        self._root: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._visible)
+
+    def rebuild(self) -> None:
+        """Reconstrói a hierarquia a partir do modelo, preservando os nós expandidos"""
+        self._nodes = set(self.model.index)
+        self._placeholders = set()
+        self._root = next((row.xpath for row in self.model.rows if _is_top_level(row.xpath)), None)
+        children: Dict[str, List[str]] = {}
+        for row in self.model.rows:
+            children.setdefault(self._parent(row.xpath), []).append(row.xpath)
+            if row.change_type == 'removed':
+                self._placeholders.add(row.xpath)
+        self.children = children
+        self.expanded &= self._nodes
+
+        self.changed_below = {}
+        self._changed = set()
+        for position in self.model.changed_positions():
+            self._mark_changed(self.model.rows[position].xpath, 1)
+        self._rebuild_visible()
+
+    def apply_delta(self, delta: Dict[str, Any]) -> None:
+        """
+        Atualiza a hierarquia com um delta já aplicado ao modelo
+
+        Só há custo estrutural quando nós entram, saem ou mudam de lugar;
+        alterações de valor apenas ajustam as contagens dos ancestrais.
+
+        Args:
+            delta (Dict): Delta gerado por GridDeltaBuilder.build
+        """
+        structural = False
+        for xpath in delta.get('removals', ()):
+            if xpath in self._nodes:
+                self._remove_node(xpath)
+                structural = True
+
+        for element, _ in delta.get('upserts', ()):
+            xpath = element.get('xpath', '')
+            row = self.model.index.get(xpath)
+            if row is None:
+                continue
+            if xpath in self._placeholders and row.change_type != 'removed':
+                # Elemento removido que voltou: o modelo o reposicionou
+                self._remove_node(xpath)
+            if xpath not in self._nodes:
+                self._add_node(xpath)
+                structural = True
+            if row.change_type == 'removed':
+                self._placeholders.add(xpath)
+            if row.changed and xpath not in self._changed:
+                self._mark_changed(xpath, 1)
+            elif not row.changed and xpath in self._changed:
+                self._mark_changed(xpath, -1)
+
+        if structural:
+            self._rebuild_visible()
+
+    def _parent(self, xpath: str) -> str:
+        """
+        Pai efetivo: o ancestral mais próximo que existe no documento ('' = nível superior)
+
+        A linha da raiz usa o nome sem namespace ('/nfeProc'), mas os
+        descendentes seguem o getpath, que escreve a raiz como '/*' (namespace
+        padrão) ou '/prefixo:nome'; qualquer primeiro passo ausente do
+        documento é, portanto, a própria raiz.
+        """
+        parent = parent_xpath(xpath)
+        while parent and parent not in self._nodes:
+            if self._root is not None and _is_top_level(parent):
+                return self._root
+            parent = parent_xpath(parent)
+        return parent
+
+    def _add_node(self, xpath: str) -> None:
+        """Insere um nó entre os irmãos, na ordem de exibição do modelo"""
+        self._nodes.add(xpath)
+        if _is_top_level(xpath):
+            self._root = xpath
+        siblings = self.children.setdefault(self._parent(xpath), [])
+        index = self.model.index
+        order = index[xpath].order
+        low, high = 0, len(siblings)
+        while low < high:
+            middle = (low + high) // 2
+            if index[siblings[middle]].order < order:
+                low = middle + 1
+            else:
+                high = middle
+        siblings.insert(low, xpath)
+
+    def _remove_node(self, xpath: str) -> None:
+        """Remove um nó da hierarquia"""
+        if xpath in self._changed:
+            self._mark_changed(xpath, -1)
+        siblings = self.children.get(self._parent(xpath))
+        if siblings is not None and xpath in siblings:
+            siblings.remove(xpath)
+        self._nodes.discard(xpath)
+        if xpath == self._root:
+            self._root = None
+        self._placeholders.discard(xpath)
+        self.expanded.discard(xpath)
+
+    def _mark_changed(self, xpath: str, delta: int) -> None:
+        """Marca/desmarca um nó alterado e atualiza a contagem dos ancestrais"""
+        if delta > 0:
+            self._changed.add(xpath)
+        else:
+            self._changed.discard(xpath)
+        parent = self._parent(xpath)
+        while parent:
+            count = self.changed_below.get(parent, 0) + delta
+            if count:
+                self.changed_below[parent] = count
+            else:
+                self.changed_below.pop(parent, None)
+            parent = self._parent(parent)
+
+    def _rebuild_visible(self) -> None:
+        """Recalcula a lista de nós visíveis (proporcional ao que está expandido)"""
+        visible: List[str] = []
+        stack = list(reversed(self.children.get('', [])))
+        children = self.children
+        expanded = self.expanded
+        while stack:
+            xpath = stack.pop()
+            visible.append(xpath)
+            if xpath in expanded:
+                stack.extend(reversed(children.get(xpath, ())))
+        self._visible = visible
+        self._positions = None
+
+    def _subtree_end(self, position: int) -> int:
+        """Posição seguinte ao último descendente visível do nó na posição informada"""
+        xpath = self._visible[position]
+        end = position + 1
+        if xpath == self._root:
+            # Os descendentes da raiz podem estar no formato do getpath ('/*/...')
+            while end < len(self._visible) and not _is_top_level(self._visible[end]):
+                end += 1
+            return end
+        prefix = xpath + '/'
+        while end < len(self._visible) and self._visible[end].startswith(prefix):
+            end += 1
+        return end
+
+    def is_expandable(self, xpath: str) -> bool:
+        """Indica se o nó tem filhos"""
+        return bool(self.children.get(xpath))
+
+    def toggle(self, position: int) -> None:
+        """Expande ou recolhe o nó na posição informada"""
+        if 0 <= position < len(self._visible):
+            xpath = self._visible[position]
+            if xpath in self.expanded:
+                self.collapse(xpath)
+            else:
+                self.expand(xpath)
+
+    def expand(self, xpath: str) -> None:
+        """Expande um nó, materializando apenas seus filhos diretos (e os já expandidos)"""
+        if xpath in self.expanded or not self.is_expandable(xpath):
+            return
+        self.expanded.add(xpath)
+        position = self.position_of(xpath)
+        if position is None:
+            return
+        subtree: List[str] = []
+        stack = list(reversed(self.children[xpath]))
+        while stack:
+            child = stack.pop()
+            subtree.append(child)
+            if child in self.expanded:
+                stack.extend(reversed(self.children.get(child, ())))
+        self._visible[position + 1:position + 1] = subtree
+        self._positions = None
+
+    def collapse(self, xpath: str) -> None:
+        """Recolhe um nó, removendo seus descendentes da lista visível"""
+        if xpath not in self.expanded:
+            return
+        self.expanded.discard(xpath)
+        position = self.position_of(xpath)
+        if position is not None:
+            del self._visible[position + 1:self._subtree_end(position)]
+            self._positions = None
+
+    def position_of(self, xpath: str) -> Optional[int]:
+        """Posição do nó na lista visível (None se estiver dentro de um nó recolhido)"""
+        if self._positions is None:
+            # Um único percurso por mudança da lista; as consultas de cada quadro são O(1)
+            self._positions = {visible: position for position, visible in enumerate(self._visible)}
+        return self._positions.get(xpath)
+
+    def reveal(self, xpath: str) -> Optional[int]:
+        """Expande os ancestrais do nó e retorna sua posição na lista visível"""
+        if xpath not in self._nodes:
+            return None
+        ancestors = []
+        parent = self._parent(xpath)
+        while parent:
+            if parent not in self.expanded:
+                ancestors.append(parent)
+            parent = self._parent(parent)
+        for ancestor in reversed(ancestors):
+            self.expand(ancestor)
+        return self.position_of(xpath)
+
+    def xpath_at(self, position: int) -> str:
+        """xpath do nó na posição informada"""
+        return self._visible[position]
+
+    def row_values(self, position: int) -> Tuple:
+        """Valores das colunas, com indentação e marcador de expansão na coluna Tag"""
+        xpath = self._visible[position]
+        row = self.model.index[xpath]
+        depth = xpath.count('/') - 1
+        if not self.is_expandable(xpath):
+            marker = '   '
+        elif xpath in self.expanded:
+            marker = '▾ '
+        else:
+            marker = '▸ '
+        tag = '    ' * depth + marker + row.tag
+        hidden = self.changed_below.get(xpath, 0)
+        if hidden and xpath not in self.expanded:
+            tag += f"  ({hidden} alteração(ões))"
+        return (row.line, tag, truncate_value(row.original), truncate_value(row.current), xpath)
+
+    def row_tags(self, position: int) -> Tuple[str, ...]:
+        """Tags de estilo; nós recolhidos com descendentes alterados recebem 'changed_below'"""
+        xpath = self._visible[position]
+        tags = self.model.row_tags(self.model.position_of(xpath))
+        if xpath not in self.expanded and self.changed_below.get(xpath):
+            tags += ('changed_below',)
+        return tags
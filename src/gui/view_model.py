@@ -0,0 +1,291 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from .grid_model import GridRow, GridRowModel, GridDeltaBuilder, ChangesRowSource
+from .tree_model import TreeRowSource
+from utils.search_index import SearchIndex
+
+# Modos de visualização suportados
+VIEW_MODE_FLAT = 'flat'
+VIEW_MODE_TREE = 'tree'
+VIEW_MODE_CHANGES = 'changes'
+
+class GridViewModel:
+    def __init__(self):
+        """
+        Estado do grid independente do toolkit gráfico
+
+        Concentra as linhas, o status de alteração, os modos de visualização,
+        a navegação entre alterações e o estado da busca. O widget Tk só lê
+        as linhas da fonte ativa (source) e reage às posições retornadas,
+        então todo o caminho de atualização pode ser testado e medido sem
+        display.
+        """
+        # Modelo com todas as linhas; o grid materializa só as visíveis
+        self.rows = GridRowModel()
+        # Visão em árvore sobre o mesmo modelo, reconstruída só quando usada
+        self.tree = TreeRowSource(self.rows)
+        self._tree_dirty = True
+        # Visão só com as alterações, lida direto da lista ordenada do modelo
+        self.changes = ChangesRowSource(self.rows)
+        self.view_mode = VIEW_MODE_FLAT
+        # Índice de busca, atualizado junto com o modelo
+        self.search_index = SearchIndex()
+        # Deltas são montados nas threads de trabalho a partir deste builder
+        self.delta_builder = GridDeltaBuilder()
+        # Incrementado a cada recarga completa; deltas de gerações anteriores são descartados
+        self.generation = 0
+
+        # Alteração atual da navegação (xpath e chave de ordenação no modelo);
+        # mantida entre atualizações
+        self.current_change_xpath: Optional[str] = None
+        self.current_change_order: Optional[int] = None
+
+        # Estado da busca
+        self.search_results: List[str] = []
+        self.search_position = -1
+        self._search_key = None
+        self._search_version = -1
+
+    @property
+    def source(self) -> Any:
+        """Fonte de linhas do modo de visualização ativo"""
+        if self.view_mode == VIEW_MODE_TREE:
+            return self.tree
+        if self.view_mode == VIEW_MODE_CHANGES:
+            return self.changes
+        return self.rows
+
+    def clear(self) -> None:
+        """Remove todas as linhas e invalida os deltas em andamento"""
+        self.generation += 1
+        self.rows.clear()
+        self.search_index.clear()
+        self.tree.rebuild()
+        self._tree_dirty = False
+
+    def reset_navigation(self) -> None:
+        """Esquece a alteração atual da navegação e os resultados da busca"""
+        self.current_change_xpath = None
+        self.current_change_order = None
+        self.search_results = []
+        self.search_position = -1
+        self._search_key = None
+
+    def load(self, xml_data: List[Dict[str, Any]]) -> None:
+        """
+        Recarrega todas as linhas
+
+        Args:
+            xml_data (List[Dict]): Lista de elementos XML
+        """
+        self.rows.load(xml_data)
+        self.search_index.load(xml_data)
+        self._update_tree()
+
+        # As chaves de ordenação mudam na recarga; reancora a navegação pelo xpath
+        row = self.rows.index.get(self.current_change_xpath)
+        if row is not None:
+            self.current_change_order = row.order
+
+    def apply_delta(self, delta: Dict[str, Any]) -> int:
+        """
+        Aplica um delta gerado por GridDeltaBuilder
+
+        Args:
+            delta (Dict): Delta com as linhas adicionadas, removidas e alteradas
+
+        Returns:
+            int: Número de linhas tocadas
+        """
+        touched = self.rows.apply_delta(delta)
+        if touched:
+            self.search_index.apply_delta(delta)
+            self._update_tree(delta)
+        return touched
+
+    def _update_tree(self, delta: Dict[str, Any] = None) -> None:
+        """Mantém a árvore em dia no modo árvore; fora dele, apenas a marca como desatualizada"""
+        if self.view_mode != VIEW_MODE_TREE:
+            self._tree_dirty = True
+        elif delta is None:
+            self.tree.rebuild()
+        else:
+            self.tree.apply_delta(delta)
+
+    def set_view_mode(self, mode: str) -> bool:
+        """
+        Alterna o modo de visualização
+
+        Args:
+            mode (str): 'flat' (lista completa), 'tree' (hierarquia com nós recolhíveis)
+                ou 'changes' (somente linhas alteradas)
+
+        Returns:
+            bool: True se o modo mudou
+        """
+        if mode == self.view_mode:
+            return False
+        self.view_mode = mode
+        if mode == VIEW_MODE_TREE and self._tree_dirty:
+            self.tree.rebuild()
+            self._tree_dirty = False
+        return True
+
+    def reveal(self, xpath: str) -> Optional[int]:
+        """Posição da linha no modo atual, abrindo os nós ancestrais no modo árvore"""
+        if self.view_mode == VIEW_MODE_TREE:
+            return self.tree.reveal(xpath)
+        return self.source.position_of(xpath)
+
+    def toggle(self, position: int) -> bool:
+        """Expande ou recolhe o nó na posição informada (só no modo árvore)"""
+        if self.view_mode != VIEW_MODE_TREE:
+            return False
+        self.tree.toggle(position)
+        return True
+
+    def xpath_at(self, position: int) -> str:
+        """xpath da linha na posição informada da fonte ativa"""
+        return self.source.row_values(position)[4]
+
+    def has_changes(self) -> bool:
+        """Indica se há linhas alteradas"""
+        return self.rows.changed_count() > 0
+
+    def change_target(self, last_changes: List[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Posição para onde rolar após uma atualização
+
+        Returns:
+            Optional[int]: Posição da última alteração ou, na falta dela, da
+                primeira linha alterada (na árvore, só se estiver visível)
+        """
+        source = self.source
+        target = None
+        if last_changes:
+            target = source.position_of(last_changes[-1].get('xpath', ''))
+        if target is None:
+            first = self.rows.first_changed()
+            if first is not None:
+                target = source.position_of(first.xpath)
+        return target
+
+    def step_change(self, direction: str) -> Optional[GridRow]:
+        """
+        Avança a navegação para a alteração seguinte ou anterior
+
+        Se a alteração atual foi revertida ou removida, a navegação continua
+        do ponto onde ela estava.
+
+        Args:
+            direction (str): 'up' ou 'down'
+
+        Returns:
+            Optional[GridRow]: Linha de destino, ou None se não houver alterações
+        """
+        order = self.current_change_order
+        current = self.rows.index.get(self.current_change_xpath)
+        if current is not None:
+            order = current.order
+
+        row = self.rows.step_change(order, direction)
+        if row is not None:
+            self.current_change_xpath = row.xpath
+            self.current_change_order = row.order
+        return row
+
+    @property
+    def current_search_result(self) -> Optional[str]:
+        """xpath do resultado de busca atual"""
+        if 0 <= self.search_position < len(self.search_results):
+            return self.search_results[self.search_position]
+        return None
+
+    def search(self, search_text: str, direction: str, options: Dict[str, Any] = None) -> Optional[int]:
+        """
+        Busca e navega entre resultados, destacando o resultado atual
+
+        Args:
+            search_text (str): Texto ou expressão regular a ser buscada
+            direction (str): Direção da busca ('up', 'down' ou 'live');
+                'live' refaz a busca e vai para o primeiro resultado
+            options (Dict): Opções da busca ('fields', 'regex', 'changed_only')
+
+        Returns:
+            Optional[int]: Número de resultados, ou None se a expressão regular for inválida
+        """
+        options = options or {}
+        search_key = (
+            search_text,
+            tuple(options.get('fields', ('tag',))),
+            bool(options.get('regex', False)),
+            bool(options.get('changed_only', False))
+        )
+
+        # Nova busca, ou o índice mudou desde a última
+        if search_key != self._search_key or self._search_version != self.search_index.version:
+            try:
+                found = self.search_index.search(
+                    search_text,
+                    fields=search_key[1],
+                    regex=search_key[2],
+                    changed_only=search_key[3]
+                )
+            except re.error:
+                return None
+
+            current = self.current_search_result if search_key == self._search_key else None
+
+            # Resultados na ordem de exibição do grid
+            rows = self.rows.index
+            self.search_results = sorted(
+                (xpath for xpath in found if xpath in rows),
+                key=lambda xpath: rows[xpath].order
+            )
+            # Mesma busca com o documento alterado: continua do resultado atual
+            self.search_position = self.search_results.index(current) if current in found else -1
+            self._search_key = search_key
+            self._search_version = self.search_index.version
+
+        if not self.search_results:
+            self.rows.highlighted = set()
+            return 0
+
+        # Navega entre os resultados
+        if direction == 'live':
+            self.search_position = 0
+        elif direction == 'up':
+            self.search_position -= 1
+            if self.search_position < 0:
+                self.search_position = len(self.search_results) - 1
+        else:  # down
+            self.search_position += 1
+            if self.search_position >= len(self.search_results):
+                self.search_position = 0
+
+        self.rows.highlighted = {self.search_results[self.search_position]}
+        return len(self.search_results)
+
+    def clear_search(self) -> None:
+        """Limpa os resultados e o destaque da busca"""
+        self.rows.highlighted = set()
+        self.search_results = []
+        self.search_position = -1
+        self._search_key = None
+
+    def render_window(self, first: int, count: int) -> List[Tuple[Tuple, Tuple[str, ...]]]:
+        """
+        Valores e tags das linhas de uma janela da fonte ativa
+
+        É exatamente o que o grid virtual escreve no widget a cada quadro.
+
+        Args:
+            first (int): Primeira posição
+            count (int): Número de linhas
+
+        Returns:
+            List[Tuple]: (valores, tags) de cada linha
+        """
+        source = self.source
+        end = min(len(source), first + count)
+        return [(source.row_values(position), source.row_tags(position)) for position in range(first, end)]
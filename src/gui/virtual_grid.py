@@ -0,0 +1,184 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+class VirtualGrid(ttk.Frame):
+    def __init__(self, master: tk.Widget, source: Any, columns: Sequence[str],
+                 column_widths: Dict[str, int], overscan: int = 5):
+        """
+        Grid com rolagem virtual sobre um ttk.Treeview
+
+        O Treeview contém apenas as linhas da área visível mais uma pequena
+        margem (overscan). A barra de rolagem representa o documento inteiro
+        e, ao rolar, os mesmos itens são reaproveitados com os valores das
+        novas linhas, lidos do modelo Python.
+
+        Args:
+            master (tk.Widget): Widget pai
+            source: Modelo com __len__, row_values(posição) e row_tags(posição)
+            columns (Sequence[str]): Colunas do grid
+            column_widths (Dict[str, int]): Largura de cada coluna (0 = oculta)
+            overscan (int): Linhas extras materializadas abaixo da área visível
+        """
+        super().__init__(master)
+        self.source = source
+        self.overscan = overscan
+        self._first = 0
+        self._visible = 20
+        self._row_height = 20
+        self._items: List[str] = []
+        # Último conteúdo escrito em cada item, para evitar chamadas Tcl repetidas
+        self._item_state: List[Tuple] = []
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=tuple(columns),
+            show='headings',
+            selectmode='none'  # Desabilita a seleção
+        )
+        for col in columns:
+            width = column_widths.get(col, 100)
+            self.tree.heading(col, text=col)
+            if width == 0:
+                # Coluna oculta
+                self.tree.column(col, width=0, minwidth=0, stretch=False)
+            else:
+                self.tree.column(col, width=width, minwidth=100)
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hsb.set)
+
+        self.tree.grid(column=0, row=0, sticky='nsew')
+        self.vsb.grid(column=1, row=0, sticky='ns')
+        self.hsb.grid(column=0, row=1, sticky='ew')
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        # O Treeview não rola sozinho: toda rolagem passa pelo modelo
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_units(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_units(3))
+        self.tree.bind('<Prior>', lambda e: self._scroll_units(-self._visible))
+        self.tree.bind('<Next>', lambda e: self._scroll_units(self._visible))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0))
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self.source)))
+
+    @property
+    def first_visible(self) -> int:
+        """Posição da primeira linha visível"""
+        return self._first
+
+    @property
+    def visible_rows(self) -> int:
+        """Número de linhas que cabem na área visível"""
+        return self._visible
+
+    def refresh(self) -> None:
+        """Sincroniza os itens materializados com o modelo"""
+        total = len(self.source)
+        max_first = max(0, total - self._visible)
+        self._first = min(self._first, max_first)
+
+        start = self._first
+        end = min(total, start + self._visible + self.overscan)
+        needed = end - start
+
+        # Ajusta o número de itens do Treeview ao tamanho da janela
+        while len(self._items) < needed:
+            self._items.append(self.tree.insert('', 'end'))
+            self._item_state.append(None)
+        if len(self._items) > needed:
+            self.tree.delete(*self._items[needed:])
+            del self._items[needed:]
+            del self._item_state[needed:]
+
+        for slot, position in enumerate(range(start, end)):
+            state = (self.source.row_values(position), self.source.row_tags(position))
+            if self._item_state[slot] != state:
+                self.tree.item(self._items[slot], values=state[0], tags=state[1])
+                self._item_state[slot] = state
+
+        self.tree.yview_moveto(0)
+        self._update_scrollbar(total)
+
+    def _update_scrollbar(self, total: int) -> None:
+        """Atualiza a barra de rolagem para refletir o documento inteiro"""
+        if total <= 0:
+            self.vsb.set(0.0, 1.0)
+            return
+        first = self._first / total
+        last = min(1.0, (self._first + self._visible) / total)
+        self.vsb.set(first, last)
+
+    def set_source(self, source: Any) -> None:
+        """Troca a fonte de linhas (modo de visualização) e volta ao topo"""
+        self.source = source
+        self._first = 0
+        self._item_state = [None] * len(self._items)
+        self.refresh()
+
+    def position_at(self, y: int) -> Optional[int]:
+        """Posição da linha exibida na coordenada y do Treeview (None fora das linhas)"""
+        item = self.tree.identify_row(y)
+        if item in self._items:
+            position = self._first + self._items.index(item)
+            if position < len(self.source):
+                return position
+        return None
+
+    def scroll_to(self, position: int) -> None:
+        """Define a primeira linha visível"""
+        total = len(self.source)
+        position = max(0, min(position, max(0, total - self._visible)))
+        if position != self._first:
+            self._first = position
+        self.refresh()
+
+    def see(self, position: int) -> None:
+        """Rola o grid, se necessário, para que a linha fique visível"""
+        if self._first <= position < self._first + self._visible:
+            return
+        # Posiciona a linha perto do topo, mantendo algum contexto acima
+        self.scroll_to(position - self._visible // 3)
+
+    def item_for(self, position: int) -> str:
+        """Retorna o item do Treeview que exibe a linha (ou '' se não estiver materializada)"""
+        slot = position - self._first
+        if 0 <= slot < len(self._items):
+            return self._items[slot]
+        return ''
+
+    def _scroll_units(self, units: int) -> str:
+        self.scroll_to(self._first + units)
+        return 'break'
+
+    def _on_mousewheel(self, event: tk.Event) -> str:
+        # No Windows delta é múltiplo de 120; no macOS é o número de unidades
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_units(-3 * delta)
+
+    def _on_scrollbar(self, *args) -> None:
+        total = len(self.source)
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self._visible
+            self.scroll_to(self._first + amount)
+
+    def _on_configure(self, event: tk.Event = None) -> None:
+        """Recalcula quantas linhas cabem na área visível"""
+        heading_height = 0
+        if self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                heading_height = bbox[1]
+                self._row_height = bbox[3] or self._row_height
+        height = self.tree.winfo_height() - (heading_height or self._row_height)
+        visible = max(1, height // self._row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()
@@ -6,9 +6,7 @@ XMLWatcher - Aplicação para monitorar alterações em arquivos XML em tempo re
 import os
 import sys
 import tkinter as tk
-import winsound
 import threading
-from queue import Queue
 
 # Adiciona o diretório src ao PYTHONPATH
 src_path = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +17,15 @@ from gui.grid_view import XMLGridView
 from watcher.xml_monitor import XMLFileMonitor
 from utils.xml_parser import XMLParser
 from utils.resource_manager import ConfigManager, AsyncLogger
+from utils.metrics import get_registry, MetricsServer
+
+def _warm_up_audio():
+    """Inicializa o sistema de áudio com um beep imperceptível (o primeiro beep é lento)"""
+    try:
+        import winsound
+        winsound.Beep(1000, 1)
+    except Exception:
+        pass
 
 class Application:
     def __init__(self):
@@ -50,9 +57,7 @@ class Application:
         
         self.logger = AsyncLogger()
         self.logger.add_handler(self._log_handler)
-        
-        # Inicializa o sistema de áudio com um beep imperceptível
-        winsound.Beep(1000, 1)
+        get_registry().register_stats('logger', self.logger)
         
         # Inicializa componentes principais
         self.xml_parser = XMLParser()
@@ -62,21 +67,44 @@ class Application:
         self.app = XMLGridView(self.root, self.xml_parser, self.xml_monitor)
         self.app.pack(expand=True, fill='both')
         
+        # Endpoint de métricas local, ativado por [Metrics] port no settings.ini
+        self.metrics_server = None
+        metrics = self.app.config_service.snapshot.section('Metrics')
+        if metrics['port'] > 0:
+            try:
+                self.metrics_server = MetricsServer(host=metrics['host'], port=metrics['port'])
+                self.metrics_server.start()
+            except OSError as e:
+                self.metrics_server = None
+                print(f"Erro ao iniciar o endpoint de métricas: {e}")
+        
         # Configura finalização limpa
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+        
+        # Aquece o áudio em segundo plano depois que a janela já foi exibida
+        self.root.after(500, lambda: threading.Thread(target=_warm_up_audio, daemon=True).start())
     
-    def _log_handler(self, log_entry):
-        """Handler para processar logs assíncronos"""
+    def _log_handler(self, batch):
+        """Handler para processar logs assíncronos (chamado na thread do logger)"""
         if hasattr(self.app, 'log_message'):
-            self.app.log_message(
-                log_entry['message'],
-                {'timestamp': log_entry.get('timestamp')}
-            )
+            # O lote inteiro é entregue à thread da interface numa única chamada da ponte
+            self.app.bridge.post(self._show_log_batch, batch)
+    
+    def _show_log_batch(self, batch):
+        """Escreve um lote de registros no log da interface (thread da interface)"""
+        for log_entry in batch:
+            self.app.log_message(log_entry['message'], {'timestamp': log_entry.get('timestamp')})
     
     def _on_closing(self):
         """Limpa recursos ao fechar a aplicação"""
         if self.xml_monitor:
             self.xml_monitor.stop_monitoring()
+        self.app.worker_pool.shutdown(wait=False)
+        self.app.diff_pane.shutdown()
+        self.app.bridge.stop()
+        self.app.config_service.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
         if hasattr(self.logger, 'shutdown'):
             self.logger.shutdown()
         self.root.destroy()
@@ -1,3 +1,20 @@
-from .xml_parser import XMLParser
+import importlib
 
-__all__ = ["XMLParser"]
+# Exportações carregadas sob demanda: importar um submódulo não carrega os demais
+_EXPORTS = {
+    "XMLParser": ".xml_parser",
+    "WorkerPool": ".worker_pool",
+    "SearchIndex": ".search_index",
+    "diff_text": ".text_diff",
+    "ConfigService": ".config_service",
+    "get_latency_tracker": ".tracing",
+    "get_registry": ".metrics",
+    "get_profiler": ".profiling",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
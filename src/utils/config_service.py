@@ -0,0 +1,330 @@
+import configparser
+import fnmatch
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+def _to_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ('1', 'true', 'yes', 'on', 'sim'):
+        return True
+    if lowered in ('0', 'false', 'no', 'off', 'nao', 'não', ''):
+        return False
+    raise ValueError(f"valor booleano inválido: {value!r}")
+
+# Tipo e valor padrão de cada opção conhecida; opções fora do esquema ficam como texto
+SCHEMA: Dict[str, Dict[str, Tuple[Callable[[str], Any], Any]]] = {
+    'Sound': {
+        'enabled': (_to_bool, True),
+        'custom_sound': (str, ''),
+        'use_custom_sound': (_to_bool, False),
+        'frequency': (int, 1000),
+        'duration': (int, 100),
+    },
+    'Log': {
+        'max_lines': (int, 2000),
+        'history_file': (str, ''),
+    },
+    # Padrões de monitoramento; seções [Watch:<padrão>] sobrescrevem por arquivo
+    'Watch': {
+        'debounce': (float, 0.1),
+        'min_poll_interval': (float, 0.1),
+        'max_poll_interval': (float, 2.0),
+    },
+    # Endpoint HTTP das métricas (formato Prometheus); porta 0 desativa
+    'Metrics': {
+        'port': (int, 0),
+        'host': (str, '127.0.0.1'),
+    },
+    # Perfil opcional (cProfile/tracemalloc) de 1 a cada `every` alterações;
+    # mode: cpu, memory ou cpu,memory (vazio desativa)
+    'Profile': {
+        'mode': (str, ''),
+        'every': (int, 100),
+        'cycles': (int, 10),
+        'directory': (str, ''),
+    },
+}
+
+# Prefixo das seções com opções de monitoramento por arquivo (padrão fnmatch)
+WATCH_SECTION_PREFIX = 'Watch:'
+
+# Intervalo padrão entre verificações do arquivo de configuração
+DEFAULT_POLL_INTERVAL = 1.0
+
+def _format(value: Any) -> str:
+    """Converte um valor tipado para o texto gravado no arquivo"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+def default_settings() -> Dict[str, Dict[str, str]]:
+    """Valores padrão de todas as seções do esquema, como texto"""
+    return {
+        section: {key: _format(default) for key, (_, default) in options.items()}
+        for section, options in SCHEMA.items()
+    }
+
+class ConfigSnapshot:
+    """Versão imutável e tipada das configurações (pode ser lida de qualquer thread)"""
+    __slots__ = ('version', '_sections', '_watch_sections', '_watch_cache')
+
+    def __init__(self, sections: Dict[str, Dict[str, Any]],
+                 watch_sections: List[Tuple[str, Dict[str, Any]]] = None, version: int = 0):
+        self.version = version
+        self._sections = {name: MappingProxyType(values) for name, values in sections.items()}
+        self._watch_sections = tuple(watch_sections or ())
+        # Opções de monitoramento já resolvidas por caminho
+        self._watch_cache: Dict[str, Mapping[str, Any]] = {}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConfigSnapshot):
+            return NotImplemented
+        return (
+            {name: dict(values) for name, values in self._sections.items()}
+            == {name: dict(values) for name, values in other._sections.items()}
+            and self._watch_sections == other._watch_sections
+        )
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Valor tipado de uma opção (default se a seção ou a opção não existir)"""
+        values = self._sections.get(section)
+        if values is None:
+            return default
+        return values.get(key, default)
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        """Opções de uma seção (somente leitura)"""
+        return self._sections.get(name, MappingProxyType({}))
+
+    def as_strings(self) -> Dict[str, Dict[str, str]]:
+        """Todas as seções com os valores em texto (formato do ConfigParser)"""
+        result = {
+            name: {key: _format(value) for key, value in values.items()}
+            for name, values in self._sections.items()
+        }
+        for pattern, values in self._watch_sections:
+            result[WATCH_SECTION_PREFIX + pattern] = {key: _format(value) for key, value in values.items()}
+        return result
+
+    def watch_options(self, path: str) -> Mapping[str, Any]:
+        """
+        Opções de monitoramento de um arquivo
+
+        Parte da seção [Watch] e aplica, na ordem do arquivo, as seções
+        [Watch:<padrão>] cujo padrão casa com o caminho completo ou com o
+        nome do arquivo. O resultado fica em cache neste snapshot.
+
+        Args:
+            path (str): Caminho do arquivo monitorado
+
+        Returns:
+            Mapping: Opções resolvidas (somente leitura)
+        """
+        options = self._watch_cache.get(path)
+        if options is not None:
+            return options
+        merged = dict(self.section('Watch'))
+        name = os.path.basename(path)
+        for pattern, values in self._watch_sections:
+            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern):
+                merged.update(values)
+        options = self._watch_cache[path] = MappingProxyType(merged)
+        return options
+
+def _convert(section: str, key: str, raw: str, schema: Dict[str, Tuple[Callable, Any]]) -> Any:
+    """Converte o texto de uma opção para o tipo do esquema"""
+    if key not in schema:
+        return raw
+    converter, default = schema[key]
+    try:
+        return converter(raw)
+    except ValueError as e:
+        print(f"Erro na configuração [{section}] {key}: {e}; usando {default!r}")
+        return default
+
+def parse_config(parser: configparser.ConfigParser, version: int = 0) -> ConfigSnapshot:
+    """
+    Monta um snapshot tipado a partir de um ConfigParser
+
+    Args:
+        parser (ConfigParser): Configurações lidas
+        version (int): Número da versão do snapshot
+
+    Returns:
+        ConfigSnapshot: Snapshot com os padrões do esquema aplicados
+    """
+    sections: Dict[str, Dict[str, Any]] = {
+        name: {key: default for key, (_, default) in options.items()}
+        for name, options in SCHEMA.items()
+    }
+    watch_sections = []
+    for name in parser.sections():
+        if name.startswith(WATCH_SECTION_PREFIX):
+            schema = SCHEMA['Watch']
+            values = {key: _convert(name, key, raw, schema) for key, raw in parser.items(name)}
+            watch_sections.append((name[len(WATCH_SECTION_PREFIX):].strip(), values))
+            continue
+        schema = SCHEMA.get(name, {})
+        target = sections.setdefault(name, {})
+        for key, raw in parser.items(name):
+            target[key] = _convert(name, key, raw, schema)
+    return ConfigSnapshot(sections, watch_sections, version)
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ConfigService:
+    def __init__(self, path: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Serviço único de configuração com recarga automática
+
+        O arquivo é lido uma vez por alteração e convertido em um snapshot
+        imutável e tipado. Leituras apenas pegam a referência do snapshot
+        atual (sem lock), então podem ser feitas em caminhos quentes; cada
+        recarga publica o novo snapshot para os assinantes.
+
+        Args:
+            path (str): Caminho do arquivo .ini
+            poll_interval (float): Intervalo entre verificações do arquivo (start)
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[ConfigSnapshot], None]] = []
+        self._signature = None
+        self._snapshot = parse_config(configparser.ConfigParser())
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reload(force=True)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Snapshot atual (leitura sem lock)"""
+        return self._snapshot
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Atalho para snapshot.get"""
+        return self._snapshot.get(section, key, default)
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]) -> Callable[[], None]:
+        """
+        Registra um assinante para novos snapshots
+
+        O callback é chamado na thread que detectou a alteração; código de
+        interface deve repassar a chamada para a sua thread.
+
+        Args:
+            callback (Callable): Recebe o novo ConfigSnapshot
+
+        Returns:
+            Callable: Função que cancela a assinatura
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Relê o arquivo se ele mudou desde a última leitura
+
+        Args:
+            force (bool): Relê mesmo sem alteração detectada
+
+        Returns:
+            bool: True se um novo snapshot foi publicado
+        """
+        with self._lock:
+            signature = _file_signature(self.path)
+            if not force and signature == self._signature:
+                return False
+            self._signature = signature
+
+            parser = configparser.ConfigParser()
+            if signature is not None:
+                try:
+                    parser.read(self.path, encoding='utf-8')
+                except (configparser.Error, UnicodeDecodeError) as e:
+                    # Arquivo inválido (ex.: edição em andamento): mantém o snapshot atual
+                    print(f"Erro ao ler configurações de {self.path}: {e}")
+                    return False
+            snapshot = parse_config(parser, self._snapshot.version + 1)
+            if snapshot == self._snapshot:
+                return False
+            self._snapshot = snapshot
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Erro ao notificar alteração de configuração: {e}")
+        return True
+
+    def save(self, values: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Grava opções no arquivo (preservando as demais) e publica o resultado
+
+        Args:
+            values (Dict): {seção: {opção: valor}}
+        """
+        with self._lock:
+            parser = configparser.ConfigParser()
+            if os.path.exists(self.path):
+                parser.read(self.path, encoding='utf-8')
+            for section, options in values.items():
+                if not parser.has_section(section):
+                    parser.add_section(section)
+                for key, value in options.items():
+                    parser.set(section, key, _format(value))
+            # Grava em arquivo temporário e substitui: a verificação nunca lê um arquivo pela metade
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                parser.write(f)
+            os.replace(temp_path, self.path)
+        self.reload(force=True)
+
+    def start(self) -> None:
+        """Inicia a verificação periódica do arquivo em segundo plano"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="xmlwatcher-config", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a verificação periódica"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Erro ao recarregar configurações: {e}")
+
+_services: Dict[str, ConfigService] = {}
+_services_lock = threading.Lock()
+
+def get_config_service(path: str) -> ConfigService:
+    """Retorna o serviço compartilhado do arquivo informado, já verificando alterações"""
+    path = os.path.abspath(path)
+    with _services_lock:
+        service = _services.get(path)
+        if service is None:
+            service = _services[path] = ConfigService(path)
+            service.start()
+        return service
@@ -0,0 +1,433 @@
+import os
+import sys
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Limites (segundos) dos histogramas de duração
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Limites dos histogramas de contagem (ex.: alterações por diff)
+SIZE_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+# Endereço padrão do endpoint: apenas a máquina local
+DEFAULT_HOST = '127.0.0.1'
+
+# Tipo e descrição das chaves de stats() exportadas por register_stats;
+# contadores ganham o sufixo _total. Chaves fora da tabela viram gauges
+STATS_METRICS = {
+    'submitted': ('counter', "Jobs enviados"),
+    'completed': ('counter', "Jobs concluídos"),
+    'dropped': ('counter', "Itens descartados (jobs substituídos ou registros perdidos)"),
+    'failed': ('counter', "Jobs que terminaram em erro"),
+    'hits': ('counter', "Consultas atendidas pelo cache"),
+    'misses': ('counter', "Consultas que não estavam no cache"),
+    'evictions': ('counter', "Entradas removidas por limite de tamanho"),
+    'expirations': ('counter', "Entradas removidas por expiração"),
+    'processed': ('counter', "Chamadas executadas na thread da interface"),
+    'polls': ('counter', "Verificações da fila pela thread da interface"),
+    'frames': ('counter', "Quadros desenhados"),
+    'folded': ('counter', "Versões agrupadas em um quadro posterior"),
+    'workers': ('gauge', "Threads de trabalho criadas"),
+    'running': ('gauge', "Jobs em execução"),
+    'queue_depth': ('gauge', "Itens aguardando na fila"),
+    'pending': ('gauge', "Versões aguardando o próximo quadro"),
+    'batch_size': ('gauge', "Chamadas executadas por verificação da fila"),
+    'entries': ('gauge', "Entradas no cache"),
+    'bytes': ('gauge', "Tamanho estimado do cache em bytes"),
+    'hit_ratio': ('gauge', "Fração das consultas atendidas pelo cache"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        """Contador monotônico, opcionalmente com rótulos"""
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self) -> Any:
+        with self._lock:
+            if list(self._values) == [()]:
+                return self._values[()]
+            return {_format_labels(key): value for key, value in sorted(self._values.items())}
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        """Histograma com limites fixos (contagens cumulativas na exportação)"""
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> [contagem por limite (não cumulativa) + excedente, soma, total]
+        self._values: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        result = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    result.append((f'{self.name}_bucket', key + (('le', _format_value(float(bound))),), cumulative))
+                result.append((f'{self.name}_sum', key, total))
+                result.append((f'{self.name}_count', key, count))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                _format_labels(key): {'count': count, 'sum': round(total, 6)}
+                for key, (_, total, count) in sorted(self._values.items())
+            }
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, function: Callable[[], Any]):
+        """
+        Medida calculada no momento da leitura
+
+        function retorna um número ou {rótulos (dict ou LabelKey): valor}.
+        """
+        self.name = name
+        self.help = help_text
+        self.function = function
+
+    def _read(self) -> Dict[LabelKey, float]:
+        try:
+            value = self.function()
+        except Exception as e:
+            print(f"Erro ao ler a métrica {self.name}: {e}")
+            return {}
+        if value is None:
+            return {}
+        if isinstance(value, dict):
+            return {
+                (_label_key(labels) if isinstance(labels, dict) else labels): number
+                for labels, number in value.items()
+            }
+        return {(): value}
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        return [(self.name, key, value) for key, value in sorted(self._read().items())]
+
+    def snapshot(self) -> Any:
+        values = self._read()
+        if list(values) == [()]:
+            return values[()]
+        return {_format_labels(key): value for key, value in sorted(values.items())}
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = 'xmlwatcher'):
+        """
+        Registro das métricas do processo
+
+        Contadores e histogramas são atualizados por quem produz o evento;
+        medidas (gauges) e objetos com stats() são lidos apenas quando as
+        métricas são consultadas, sem custo no caminho quente.
+
+        Args:
+            prefix (str): Prefixo dos nomes das métricas de stats()
+        """
+        self.prefix = prefix
+        self._metrics: Dict[str, Any] = {}
+        # (prefixo, rótulos) -> referências fracas aos objetos com stats()
+        self._sources: Dict[Tuple[str, LabelKey], List[weakref.ref]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        """Retorna (criando se necessário) um contador"""
+        return self._get_or_create(name, lambda: Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        """Retorna (criando se necessário) um histograma"""
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets))
+
+    def gauge(self, name: str, help_text: str, function: Callable[[], Any]) -> Gauge:
+        """Registra (ou substitui) uma medida calculada na leitura"""
+        gauge = Gauge(name, help_text, function)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def register_stats(self, prefix: str, source: Any, **labels: Any) -> None:
+        """
+        Exporta os contadores numéricos de source.stats() como métricas
+
+        O tipo e a descrição de cada chave vêm de STATS_METRICS: totais
+        monotônicos viram contadores (xmlwatcher_cache_hits_total) e
+        tamanhos e filas, gauges (xmlwatcher_worker_pool_queue_depth).
+        Objetos com o mesmo prefixo e rótulos (ex.: um cache por parser)
+        são somados. A referência é fraca: objetos coletados somem das
+        métricas sem precisar de cancelamento.
+
+        Args:
+            prefix (str): Nome do grupo (ex.: 'cache' gera xmlwatcher_cache_hits_total)
+            source: Objeto com método stats() -> Dict[str, número]
+            **labels: Rótulos da série
+        """
+        key = (prefix, _label_key(labels))
+        with self._lock:
+            references = self._sources.setdefault(key, [])
+            references[:] = [reference for reference in references if reference() is not None]
+            references.append(weakref.ref(source))
+
+    def _collect_sources(self) -> Dict[str, Tuple[str, str, Dict[LabelKey, float]]]:
+        """
+        Soma os stats() dos objetos registrados
+
+        Returns:
+            Dict: {nome da métrica: (tipo, descrição, {rótulos: valor})}
+        """
+        with self._lock:
+            sources = {key: list(references) for key, references in self._sources.items()}
+        collected: Dict[str, Tuple[str, str, Dict[LabelKey, float]]] = {}
+        for (prefix, labels), references in sources.items():
+            totals: Dict[str, float] = {}
+            for reference in references:
+                source = reference()
+                if source is None:
+                    continue
+                try:
+                    stats = source.stats()
+                except Exception as e:
+                    print(f"Erro ao ler estatísticas de {prefix}: {e}")
+                    continue
+                for name, value in stats.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        totals[name] = totals.get(name, 0) + value
+            if 'hits' in totals and 'misses' in totals:
+                lookups = totals['hits'] + totals['misses']
+                totals['hit_ratio'] = totals['hits'] / lookups if lookups else 0.0
+            for name, value in totals.items():
+                kind, help_text = STATS_METRICS.get(name, ('gauge', f"Valor de {name}"))
+                metric_name = f'{self.prefix}_{prefix}_{name}'
+                if kind == 'counter':
+                    metric_name += '_total'
+                entry = collected.setdefault(metric_name, (kind, f"{help_text} ({prefix})", {}))
+                entry[2][labels] = value
+        return collected
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Valores atuais de todas as métricas
+
+        Returns:
+            Dict: {nome: valor} ou {nome: {'{rótulos}': valor}}; histogramas
+                trazem contagem e soma por série
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        result: Dict[str, Any] = {metric.name: metric.snapshot() for metric in metrics}
+        for name, (_, _, values) in self._collect_sources().items():
+            if list(values) == [()]:
+                result[name] = values[()]
+            else:
+                result[name] = {_format_labels(key): value for key, value in sorted(values.items())}
+        return result
+
+    def render_prometheus(self) -> str:
+        """Métricas no formato de texto do Prometheus (versão 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            kind = 'counter' if isinstance(metric, Counter) else 'histogram' if isinstance(metric, Histogram) else 'gauge'
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name, (kind, help_text, values) in sorted(self._collect_sources().items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(values.items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+def process_rss_bytes() -> Optional[int]:
+    """Memória residente (RSS) atual do processo, ou None se não for possível medir"""
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except Exception:
+            return None
+        return None
+    try:
+        import resource
+        # Sem RSS atual disponível: usa o pico (bytes no macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return None
+
+def _stage_latencies() -> Dict[LabelKey, float]:
+    """Percentis de latência por etapa do LatencyTracker, em ms"""
+    from .tracing import get_latency_tracker, PERCENTILES
+    values: Dict[LabelKey, float] = {}
+    for stage, stats in get_latency_tracker().percentiles().items():
+        for percentile in PERCENTILES:
+            key = f'p{percentile}'
+            if key in stats:
+                values[(('quantile', str(percentile / 100)), ('stage', stage))] = stats[key]
+    return values
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> MetricsRegistry:
+    """Retorna o registro de métricas compartilhado do processo"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+            _registry.gauge('xmlwatcher_process_resident_memory_bytes',
+                            "Memória residente do processo", process_rss_bytes)
+            _registry.gauge('xmlwatcher_stage_latency_ms',
+                            "Latência por etapa das alterações (janela deslizante)", _stage_latencies)
+        return _registry
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry = None, host: str = DEFAULT_HOST, port: int = 0):
+        """
+        Endpoint HTTP local com as métricas
+
+        GET /metrics retorna o formato de texto do Prometheus e GET
+        /metrics.json o snapshot em JSON. Com port=0 o sistema escolhe
+        uma porta livre (ver self.port após start).
+
+        Args:
+            registry (MetricsRegistry): Registro exportado (padrão: get_registry())
+            host (str): Endereço de escuta
+            port (int): Porta
+        """
+        self.registry = registry or get_registry()
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> None:
+        """Inicia o servidor em uma thread daemon"""
+        if self._server is not None:
+            return
+        # Importado aqui: só quem exporta as métricas carrega o servidor HTTP
+        import json
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body = registry.render_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(registry.snapshot(), default=str).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sem log por requisição
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="xmlwatcher-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Para o servidor"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+# Variáveis de ambiente (têm prioridade sobre a seção [Profile] do settings.ini)
+PROFILE_ENV = 'XMLWATCHER_PROFILE'                # cpu, memory, cpu,memory (ou all)
+PROFILE_EVERY_ENV = 'XMLWATCHER_PROFILE_EVERY'    # mede 1 a cada K ciclos
+PROFILE_CYCLES_ENV = 'XMLWATCHER_PROFILE_CYCLES'  # total de ciclos medidos (0 = sem limite)
+PROFILE_DIR_ENV = 'XMLWATCHER_PROFILE_DIR'        # diretório dos resultados
+
+MODES = ('cpu', 'memory')
+
+DEFAULT_EVERY = 100
+DEFAULT_CYCLES = 10
+
+# Linhas de cada relatório (funções do cProfile e linhas do tracemalloc)
+REPORT_TOP = 30
+
+# Quadros de pilha guardados por alocação pelo tracemalloc
+TRACEMALLOC_FRAMES = 10
+
+def parse_modes(text: str) -> Tuple[str, ...]:
+    """
+    Converte o texto de configuração nos modos de perfil
+
+    Args:
+        text (str): '', 'off' ou '0' desativam; '1', 'on' ou 'true' equivalem
+            a 'cpu'; 'all' ativa todos; senão, modos separados por vírgula
+
+    Returns:
+        Tuple[str, ...]: Modos ativos, na ordem de MODES
+    """
+    lowered = (text or '').strip().lower()
+    if lowered in ('', '0', 'off', 'false', 'no', 'nao', 'não'):
+        return ()
+    if lowered in ('1', 'on', 'true', 'yes', 'sim'):
+        return ('cpu',)
+    if lowered == 'all':
+        return MODES
+    requested = {part.strip() for part in lowered.split(',') if part.strip()}
+    unknown = requested - set(MODES)
+    if unknown:
+        raise ValueError(f"modo de perfil inválido: {', '.join(sorted(unknown))}")
+    return tuple(mode for mode in MODES if mode in requested)
+
+def default_directory() -> str:
+    """Diretório padrão dos resultados (no diretório temporário do sistema)"""
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), 'xmlwatcher-profiles')
+
+def profile_options(settings: Mapping[str, Any] = None, environ: Mapping[str, str] = None) -> Dict[str, Any]:
+    """
+    Opções do profiler a partir da seção [Profile] e das variáveis de ambiente
+
+    Args:
+        settings (Mapping): Seção [Profile] já tipada (mode, every, cycles, directory)
+        environ (Mapping): Variáveis de ambiente (padrão: os.environ)
+
+    Returns:
+        Dict: Argumentos de CycleProfiler.configure
+    """
+    settings = settings or {}
+    environ = os.environ if environ is None else environ
+    mode = environ.get(PROFILE_ENV, settings.get('mode', ''))
+    every = environ.get(PROFILE_EVERY_ENV, settings.get('every', DEFAULT_EVERY))
+    cycles = environ.get(PROFILE_CYCLES_ENV, settings.get('cycles', DEFAULT_CYCLES))
+    directory = environ.get(PROFILE_DIR_ENV, settings.get('directory', ''))
+    try:
+        modes = parse_modes(mode)
+        every = int(every)
+        cycles = int(cycles)
+    except ValueError as e:
+        print(f"Erro na configuração de perfil, perfil desativado: {e}")
+        return {'modes': ()}
+    return {
+        'modes': modes,
+        'every': every,
+        'cycles': cycles,
+        'directory': directory or default_directory(),
+    }
+
+class CycleProfiler:
+    def __init__(self, modes: Tuple[str, ...] = (), every: int = DEFAULT_EVERY,
+                 cycles: int = DEFAULT_CYCLES, directory: Optional[str] = None):
+        """
+        Perfil opcional de ciclos de alteração (cProfile e/ou tracemalloc)
+
+        Mede 1 a cada `every` ciclos, até `cycles` ciclos no total, e grava
+        em `directory` um .prof (pstats) e um .txt legível por ciclo medido.
+        Os demais ciclos pagam só um incremento de contador. Só um ciclo é
+        medido por vez: o cProfile mede a thread do ciclo, e o tracemalloc,
+        que é global, também inclui o que outras threads alocarem durante ele.
+
+        Args:
+            modes (Tuple[str, ...]): 'cpu' e/ou 'memory'; vazio desativa
+            every (int): Intervalo de amostragem (1 mede todos os ciclos)
+            cycles (int): Total de ciclos medidos (0 = sem limite)
+            directory (str): Diretório dos resultados (padrão: default_directory())
+        """
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.captured = 0
+        self._active = False
+        self.configure(modes, every, cycles, directory)
+
+    def configure(self, modes: Tuple[str, ...] = (), every: int = DEFAULT_EVERY,
+                  cycles: int = DEFAULT_CYCLES, directory: Optional[str] = None) -> None:
+        """Altera as opções (ex.: novo snapshot de configuração) sem zerar as contagens"""
+        with self._lock:
+            self.modes = tuple(modes)
+            self.every = max(1, int(every))
+            self.cycles = max(0, int(cycles))
+            self.directory = directory or default_directory()
+
+    @property
+    def enabled(self) -> bool:
+        """Há modos ativos e o limite de ciclos medidos ainda não foi atingido"""
+        return bool(self.modes) and (not self.cycles or self.captured < self.cycles)
+
+    def _should_sample(self) -> bool:
+        with self._lock:
+            if not self.modes or (self.cycles and self.captured >= self.cycles):
+                return False
+            self.seen += 1
+            if self.seen % self.every or self._active:
+                return False
+            self._active = True
+            self.captured += 1
+            return True
+
+    @contextmanager
+    def cycle(self, label: str = 'change') -> Iterator[None]:
+        """
+        Envolve um ciclo de alteração, medindo-o se for sorteado
+
+        Args:
+            label (str): Identifica o ciclo nos nomes dos arquivos (ex.: nome do XML)
+        """
+        if not self.modes or not self._should_sample():
+            yield
+            return
+
+        import cProfile
+        import tracemalloc
+
+        modes = self.modes
+        sequence = self.captured
+        profile = None
+        memory_before = None
+        started_tracing = False
+        try:
+            if 'memory' in modes:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(TRACEMALLOC_FRAMES)
+                    started_tracing = True
+                tracemalloc.reset_peak()
+                memory_before = tracemalloc.take_snapshot()
+            if 'cpu' in modes:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError as e:
+                    # Outro profiler ativo no processo (ex.: depurador)
+                    print(f"Erro ao iniciar cProfile: {e}")
+                    profile = None
+        except Exception:
+            with self._lock:
+                self._active = False
+            raise
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+            memory = None
+            if memory_before is not None:
+                memory = (memory_before, tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+                if started_tracing:
+                    tracemalloc.stop()
+            try:
+                self._dump(sequence, label, elapsed, profile, memory)
+            except Exception as e:
+                print(f"Erro ao gravar perfil: {e}")
+            finally:
+                with self._lock:
+                    self._active = False
+
+    def run(self, label: str, fn: Callable, *args, **kwargs) -> Any:
+        """Executa fn dentro de cycle(label) (útil para WorkerPool.submit)"""
+        with self.cycle(label):
+            return fn(*args, **kwargs)
+
+    def _dump(self, sequence: int, label: str, elapsed: float,
+              profile: Any, memory: Optional[Tuple[Any, Any, int]]) -> str:
+        """
+        Grava os resultados de um ciclo medido
+
+        Returns:
+            str: Caminho do relatório .txt
+        """
+        import io
+        import pstats
+
+        os.makedirs(self.directory, exist_ok=True)
+        safe_label = ''.join(char if char.isalnum() or char in '-_.' else '_' for char in label) or 'change'
+        base = os.path.join(
+            self.directory,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{sequence:04d}-{safe_label}"
+        )
+
+        report = io.StringIO()
+        report.write(f"Ciclo {sequence} ({label}): {elapsed * 1000:.1f} ms, "
+                     f"1 a cada {self.every} ciclos ({self.seen} vistos)\n\n")
+        if profile is not None:
+            profile.dump_stats(base + '.prof')
+            report.write(f"CPU (cProfile, por tempo acumulado; completo em {base}.prof)\n")
+            stats = pstats.Stats(profile, stream=report)
+            stats.sort_stats('cumulative').print_stats(REPORT_TOP)
+        if memory is not None:
+            before, after, peak = memory
+            report.write(f"Memória (tracemalloc): pico de {peak / 1024:.1f} KiB durante o ciclo\n")
+            report.write("Maiores diferenças de memória retida por linha:\n")
+            for difference in after.compare_to(before, 'lineno')[:REPORT_TOP]:
+                report.write(f"  {difference}\n")
+
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        return base + '.txt'
+
+_profiler: Optional[CycleProfiler] = None
+_profiler_lock = threading.Lock()
+
+def get_profiler() -> CycleProfiler:
+    """Retorna o CycleProfiler compartilhado do processo (configurado pelo ambiente)"""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = CycleProfiler(**profile_options())
+        return _profiler
@@ -1,36 +1,190 @@
 import weakref
 import os
+import json
 import time
-from queue import Queue, Empty
+from datetime import datetime
+from collections import OrderedDict
+from queue import Queue, Empty, Full
 import threading
-import configparser
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-class ResourceManager:
-    def __init__(self):
-        self._resources = {}  # Mudando para um dicionário normal
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 300  # 5 minutos
+# Marcador de ausência (None pode ser um valor válido no cache)
+_MISSING = object()
+
+class Cache:
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizeof: Optional[Callable[[Any], int]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Cache thread-safe com política LRU, expiração por tempo e limite em bytes
+
+        Ao passar de max_entries ou max_bytes, as entradas usadas há mais
+        tempo são descartadas; com ttl, entradas mais antigas que ttl
+        segundos são tratadas como ausentes. O tamanho de cada entrada vem
+        de sizeof (ou do argumento size de put). Os contadores de acertos,
+        faltas, descartes e expirações ficam em stats().
+
+        Args:
+            max_entries (int): Número máximo de entradas (None = sem limite)
+            max_bytes (int): Soma máxima dos tamanhos das entradas (None = sem limite)
+            ttl (float): Tempo de vida de cada entrada em segundos (None = sem expiração)
+            sizeof (Callable): Calcula o tamanho de um valor (padrão: 1 por entrada)
+            clock (Callable): Relógio monotônico usado na expiração
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self._entries: 'OrderedDict[Any, Tuple[Any, int, Optional[float]]]' = OrderedDict()
+        self._bytes = 0
         self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        """Indica se a chave existe e não expirou (sem alterar a ordem LRU nem os contadores)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or self.clock() < entry[2])
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Retorna o valor de uma chave, marcando-a como usada recentemente
+
+        Args:
+            key: Chave
+            default: Valor retornado se a chave não existir ou tiver expirado
+
+        Returns:
+            Valor armazenado ou default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and self.clock() >= entry[2]:
+                self._remove_locked(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Any, value: Any, size: Optional[int] = None) -> None:
+        """
+        Armazena um valor, descartando as entradas menos usadas se passar dos limites
+
+        Args:
+            key: Chave
+            value: Valor
+            size (int): Tamanho do valor (padrão: sizeof(value), ou 1)
+        """
+        if size is None:
+            size = self.sizeof(value) if self.sizeof is not None else 1
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Maior que o cache inteiro: não vale a pena descartar tudo por ele
+                self.evictions += 1
+                return
+            self._entries[key] = (value, size, expires)
+            self._bytes += size
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self.evictions += 1
+
+    def get_or_create(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor da chave, criando-o com factory() em caso de falta
+
+        factory roda fora do lock: duas threads podem criar o mesmo valor
+        ao mesmo tempo, e a última gravação prevalece.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove uma chave e retorna seu valor"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove_locked(key)
+            return entry[0]
+
+    def clear(self) -> None:
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        Remove todas as entradas expiradas
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        if self.ttl is None:
+            return 0
+        now = self.clock()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if now >= entry[2]]
+            for key in expired:
+                self._remove_locked(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def _remove_locked(self, key: Any) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores e ocupação atual do cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+class ResourceManager:
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = 300):
+        """
+        Recursos criados sob demanda e mantidos num Cache
+
+        Args:
+            max_entries (int): Número máximo de recursos mantidos
+            ttl (float): Tempo de vida de cada recurso em segundos
+        """
+        self._resources = Cache(max_entries=max_entries, ttl=ttl)
         
     def get_resource(self, key: str) -> Any:
-        current_time = time.time()
-        with self._lock:
-            if current_time - self._last_cleanup > self._cleanup_interval:
-                self._cleanup()
-            
-            if key in self._resources:
-                return self._resources[key]
-            resource = self._create_resource(key)
-            self._resources[key] = resource
-            return resource
+        """Retorna o recurso da chave, criando-o se necessário"""
+        return self._resources.get_or_create(key, lambda: self._create_resource(key))
     
     def _cleanup(self) -> None:
-        """Limpa recursos não utilizados"""
-        with self._lock:
-            self._last_cleanup = time.time()
-            # Implementação básica - pode ser estendida conforme necessidade
-            self._resources.clear()
+        """Limpa recursos expirados"""
+        self._resources.purge_expired()
 
     def _create_resource(self, key: str) -> Any:
         """Cria um novo recurso - deve ser implementado por subclasses"""
@@ -38,93 +192,273 @@ class ResourceManager:
 
 class ConfigManager:
     def __init__(self, config_file: str):
-        self._config_cache: Dict[str, Any] = {}
-        self._last_load_time = 0
-        self._config_file_mtime = 0
+        """
+        Acesso simples a opções avulsas, apoiado no serviço de configuração
+
+        Leituras usam o snapshot já carregado (sem stat do arquivo a cada
+        consulta); o serviço recarrega o arquivo uma vez por alteração.
+
+        Args:
+            config_file (str): Caminho do arquivo .ini
+        """
+        # Importado aqui: quem só usa Cache ou AsyncLogger não carrega configparser
+        from .config_service import get_config_service
         self._config_file = config_file
-        self._lock = threading.Lock()
-        self._config = configparser.ConfigParser()
-        self._load_config()
-    
-    def _load_config(self) -> None:
-        """Carrega as configurações do arquivo"""
-        with self._lock:
-            if os.path.exists(self._config_file):
-                self._config.read(self._config_file)
-                self._config_file_mtime = os.path.getmtime(self._config_file)
-                self._last_load_time = time.time()
+        self._service = get_config_service(config_file)
     
     def get_config(self, section: str, key: str, default: Any = None) -> Any:
-        """Obtém um valor de configuração com cache"""
-        current_mtime = os.path.getmtime(self._config_file)
-        if current_mtime > self._config_file_mtime:
-            self._load_config()
-        
-        cache_key = f"{section}.{key}"
-        if cache_key in self._config_cache:
-            return self._config_cache[cache_key]
-        
-        try:
-            value = self._config.get(section, key)
-            self._config_cache[cache_key] = value
-            return value
-        except:
-            return default
+        """Obtém um valor de configuração (tipado para as opções conhecidas)"""
+        return self._service.get(section, key, default)
     
     def set_config(self, section: str, key: str, value: Any) -> None:
-        """Define um valor de configuração"""
-        with self._lock:
-            if not self._config.has_section(section):
-                self._config.add_section(section)
-            self._config.set(section, key, str(value))
-            cache_key = f"{section}.{key}"
-            self._config_cache[cache_key] = value
-            
-            with open(self._config_file, 'w') as f:
-                self._config.write(f)
-            self._config_file_mtime = os.path.getmtime(self._config_file)
+        """Define um valor de configuração e grava o arquivo"""
+        self._service.save({section: {key: value}})
+
+# Níveis de log, em ordem crescente de severidade
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
 
 class AsyncLogger:
-    def __init__(self, max_queue_size: int = 1000):
+    def __init__(self, max_queue_size: int = 1000, batch_size: int = 256, level: str = 'DEBUG'):
+        """
+        Logger assíncrono com entrega em lotes
+
+        O produtor só monta o registro e o coloca na fila (sem bloquear);
+        com a fila cheia, o registro é descartado e contado. A thread do
+        logger retira vários registros por vez e entrega cada lote aos
+        handlers numa única chamada; os descartes são informados no lote
+        seguinte. Handlers rodam na thread do logger: código de interface
+        deve repassar o lote para a sua thread (ex.: TkBridge.post).
+
+        Args:
+            max_queue_size (int): Capacidade da fila
+            batch_size (int): Número máximo de registros por lote
+            level (str): Nível mínimo registrado
+        """
         self._log_queue = Queue(maxsize=max_queue_size)
         self._handlers = []
-        self._worker = threading.Thread(target=self._process_logs, daemon=True)
+        self.batch_size = batch_size
+        self._min_level = LOG_LEVELS[level]
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._process_logs, name="xmlwatcher-logger", daemon=True)
         self._running = True
         self._worker.start()
     
     def add_handler(self, handler) -> None:
-        """Adiciona um handler de log"""
+        """
+        Adiciona um handler de log
+        
+        Args:
+            handler (Callable): Recebe a lista de registros do lote; se tiver
+                o método flush, ele é chamado quando a fila fica ociosa depois
+                de uma entrega, e close, no shutdown
+        """
         self._handlers.append(handler)
     
-    def log(self, message: str, level: str = 'INFO') -> None:
-        """Adiciona uma mensagem ao log de forma assíncrona"""
+    @property
+    def dropped(self) -> int:
+        """Total de registros descartados por fila cheia"""
+        return self._dropped
+    
+    def stats(self) -> Dict[str, int]:
+        """Registros na fila e descartados"""
+        return {'queue_depth': self._log_queue.qsize(), 'dropped': self._dropped}
+    
+    def log(self, message: str, level: str = 'INFO', **fields: Any) -> None:
+        """
+        Adiciona uma mensagem ao log de forma assíncrona
+        
+        Args:
+            message (str): Mensagem
+            level (str): 'DEBUG', 'INFO', 'WARNING' ou 'ERROR'
+            **fields: Campos estruturados anexados ao registro
+        """
+        if LOG_LEVELS.get(level, 0) < self._min_level:
+            return
+        log_entry = {
+            'message': message,
+            'level': level,
+            'timestamp': time.time(),
+            'fields': fields
+        }
         try:
-            log_entry = {
-                'message': message,
-                'level': level,
-                'timestamp': time.time()
-            }
             self._log_queue.put_nowait(log_entry)
-        except Queue.Full:
-            pass  # Ignora se a fila estiver cheia
+        except Full:
+            # Descarta em vez de bloquear quem está registrando
+            with self._dropped_lock:
+                self._dropped += 1
     
-    def _process_logs(self) -> None:
-        """Processa as mensagens de log em background"""
-        while self._running:
+    def debug(self, message: str, **fields: Any) -> None:
+        self.log(message, 'DEBUG', **fields)
+    
+    def info(self, message: str, **fields: Any) -> None:
+        self.log(message, 'INFO', **fields)
+    
+    def warning(self, message: str, **fields: Any) -> None:
+        self.log(message, 'WARNING', **fields)
+    
+    def error(self, message: str, **fields: Any) -> None:
+        self.log(message, 'ERROR', **fields)
+    
+    def _take_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """Espera o primeiro registro e retira, sem esperar, os que já estão na fila"""
+        try:
+            batch = [self._log_queue.get(timeout=timeout)]
+        except Empty:
+            batch = []
+        while batch and len(batch) < self.batch_size:
             try:
-                log_entry = self._log_queue.get(timeout=1.0)
-                for handler in self._handlers:
-                    try:
-                        handler(log_entry)
-                    except Exception:
-                        continue
+                batch.append(self._log_queue.get_nowait())
             except Empty:
-                continue
-            except Exception:
-                continue
+                break
+        
+        dropped = self._dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            batch.append({
+                'message': f"{dropped} mensagem(ns) de log descartada(s) (fila cheia)",
+                'level': 'WARNING',
+                'timestamp': time.time(),
+                'fields': {'dropped': dropped}
+            })
+        return batch
+    
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        for handler in self._handlers:
+            try:
+                handler(batch)
+            except Exception as e:
+                print(f"Erro no handler de log: {e}")
+    
+    def _flush_handlers(self) -> None:
+        for handler in self._handlers:
+            flush = getattr(handler, 'flush', None)
+            if flush is not None:
+                try:
+                    flush()
+                except Exception as e:
+                    print(f"Erro ao descarregar handler de log: {e}")
+    
+    def _process_logs(self) -> None:
+        """Processa as mensagens de log em background, um lote por vez"""
+        unflushed = False
+        while self._running:
+            batch = self._take_batch(timeout=0.5)
+            if batch:
+                self._deliver(batch)
+                unflushed = True
+            elif unflushed:
+                # Fila ociosa: sem um próximo lote, os handlers com buffer
+                # reteriam as últimas linhas (justamente as de um incidente)
+                self._flush_handlers()
+                unflushed = False
+        
+        # Entrega o que ainda estava na fila no momento do shutdown
+        while True:
+            batch = self._take_batch(timeout=0)
+            if not batch:
+                break
+            self._deliver(batch)
     
     def shutdown(self) -> None:
-        """Finaliza o logger de forma segura"""
+        """Finaliza o logger de forma segura, entregando os registros pendentes"""
         self._running = False
         if self._worker.is_alive():
-            self._worker.join(timeout=2.0) 
\ No newline at end of file
+            self._worker.join(timeout=2.0)
+        for handler in self._handlers:
+            close = getattr(handler, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Erro ao fechar handler de log: {e}")
+
+def format_log_entry(log_entry: Dict[str, Any]) -> str:
+    """Formata um registro como uma linha de texto (campos estruturados como chave=JSON)"""
+    timestamp = datetime.fromtimestamp(log_entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    line = f"{timestamp} {log_entry['level']:<7} {log_entry['message']}"
+    fields = log_entry.get('fields')
+    if fields:
+        line += ' ' + ' '.join(
+            f"{key}={json.dumps(value, ensure_ascii=False, default=str)}" for key, value in fields.items()
+        )
+    return line
+
+class RotatingFileSink:
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3,
+                 flush_interval: float = 1.0, buffer_size: int = 64 * 1024):
+        """
+        Handler do AsyncLogger que grava os registros em arquivo com rotação por tamanho
+
+        A escrita é bufferizada e descarregada no máximo uma vez por
+        flush_interval (e sempre na rotação e no fechamento); quando os
+        registros param de chegar, o AsyncLogger chama flush. Ao passar de
+        max_bytes, o arquivo vira path.1, o path.1 anterior vira path.2 e
+        assim por diante, até backup_count arquivos.
+
+        Args:
+            path (str): Caminho do arquivo de log
+            max_bytes (int): Tamanho máximo de cada arquivo (0 desativa a rotação)
+            backup_count (int): Número de arquivos antigos mantidos
+            flush_interval (float): Intervalo máximo entre descargas do buffer
+            buffer_size (int): Tamanho do buffer de escrita
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self._open()
+    
+    def _open(self) -> None:
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=self.buffer_size)
+        self._size = self._file.tell()
+    
+    def __call__(self, batch: List[Dict[str, Any]]) -> None:
+        """Grava um lote de registros"""
+        with self._lock:
+            if self._file is None:
+                return
+            for log_entry in batch:
+                line = format_log_entry(log_entry) + '\n'
+                self._file.write(line)
+                self._size += len(line.encode('utf-8'))
+                if self.max_bytes and self._size >= self.max_bytes:
+                    self._rotate()
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+    
+    def _rotate(self) -> None:
+        """Fecha o arquivo atual e desloca os arquivos antigos"""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+        self._last_flush = time.monotonic()
+    
+    def flush(self) -> None:
+        """Descarrega o buffer no arquivo"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+    
+    def close(self) -> None:
+        """Descarrega e fecha o arquivo"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
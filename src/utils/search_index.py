@@ -0,0 +1,223 @@
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from .resource_manager import Cache
+from .metrics import get_registry
+
+# Termos maiores que isso não entram no índice de trigramas (são sempre candidatos)
+MAX_GRAM_TERM = 64
+
+# Campos pesquisáveis
+SEARCH_FIELDS = ('tag', 'value', 'xpath')
+
+# Número de buscas recentes mantidas em cache (a busca ao vivo repete a mesma consulta)
+RESULT_CACHE_ENTRIES = 32
+
+# Memória máxima dos resultados em cache; buscas que casam quase o documento
+# inteiro (ex.: uma letra) passam do limite e são recalculadas em vez de retidas
+RESULT_CACHE_BYTES = 16 * 1024 * 1024
+
+def result_size(result: frozenset) -> int:
+    """Bytes retidos por um resultado: a tabela do conjunto (os xpaths são os mesmos objetos do índice)"""
+    return sys.getsizeof(result)
+
+def trigrams(text: str) -> Set[str]:
+    """Retorna os trigramas de um texto"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _TermIndex:
+    def __init__(self):
+        """
+        Índice invertido de um campo (tag ou valor)
+
+        Cada termo distinto (em minúsculas) aponta para os xpaths que o
+        contêm, e cada trigrama aponta para os termos em que aparece. Como
+        valores e tags se repetem muito em XML, a busca percorre o
+        vocabulário, não os elementos.
+        """
+        self.terms: Dict[str, Set[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.long_terms: Set[str] = set()
+
+    def add(self, term: str, xpath: str) -> None:
+        """Associa um xpath a um termo"""
+        xpaths = self.terms.get(term)
+        if xpaths is None:
+            xpaths = self.terms[term] = set()
+            if len(term) > MAX_GRAM_TERM:
+                self.long_terms.add(term)
+            else:
+                for gram in trigrams(term):
+                    self.grams.setdefault(gram, set()).add(term)
+        xpaths.add(xpath)
+
+    def remove(self, term: str, xpath: str) -> None:
+        """Desassocia um xpath de um termo, descartando termos sem xpaths"""
+        xpaths = self.terms.get(term)
+        if xpaths is None:
+            return
+        xpaths.discard(xpath)
+        if xpaths:
+            return
+        del self.terms[term]
+        if len(term) > MAX_GRAM_TERM:
+            self.long_terms.discard(term)
+            return
+        for gram in trigrams(term):
+            terms = self.grams.get(gram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self.grams[gram]
+
+    def candidates(self, query: str) -> Iterable[str]:
+        """Termos que podem conter a consulta (filtrados pelos trigramas)"""
+        if len(query) < 3:
+            return self.terms.keys()
+        sets = []
+        for gram in trigrams(query):
+            terms = self.grams.get(gram)
+            if not terms:
+                return self.long_terms
+            sets.append(terms)
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:]) | self.long_terms
+
+    def match(self, query: str, pattern: Optional['re.Pattern']) -> Set[str]:
+        """xpaths cujo termo contém a consulta ou casa com a expressão regular"""
+        result: Set[str] = set()
+        if pattern is not None:
+            for term, xpaths in self.terms.items():
+                if pattern.search(term):
+                    result |= xpaths
+        else:
+            for term in self.candidates(query):
+                if query in term:
+                    result |= self.terms[term]
+        return result
+
+class SearchIndex:
+    def __init__(self, result_cache_bytes: int = RESULT_CACHE_BYTES):
+        """
+        Índice de busca sobre tags, valores e xpaths dos elementos
+
+        É carregado com o estado completo e depois atualizado apenas com
+        os deltas de cada diff, de modo que uma busca não percorre o
+        documento inteiro nem consulta o widget.
+
+        Args:
+            result_cache_bytes (int): Memória máxima dos resultados em cache
+        """
+        # xpath -> (tag, valor) em minúsculas, como indexados
+        self._records: Dict[str, Tuple[str, str]] = {}
+        self._fields = {'tag': _TermIndex(), 'value': _TermIndex()}
+        self.changed: Set[str] = set()
+        # Incrementado a cada alteração, para que resultados antigos sejam recalculados
+        self.version = 0
+        # Resultados por (consulta, opções, versão); versões antigas saem pelo LRU
+        self._results = Cache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=result_cache_bytes, sizeof=result_size)
+        get_registry().register_stats('cache', self._results, cache='search')
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def clear(self) -> None:
+        """Remove todos os elementos do índice"""
+        self._records = {}
+        self._fields = {'tag': _TermIndex(), 'value': _TermIndex()}
+        self.changed = set()
+        self.version += 1
+
+    def load(self, xml_data: List[Dict[str, Any]]) -> None:
+        """
+        Recarrega o índice com todos os elementos
+
+        Args:
+            xml_data (List[Dict]): Lista de elementos XML
+        """
+        self.clear()
+        for element in xml_data:
+            self._add(element)
+
+    def apply_delta(self, delta: Dict[str, Any]) -> None:
+        """
+        Aplica um delta do grid ({'upserts': [(elemento, xpath_anterior)], 'removals': [xpath]})
+
+        Args:
+            delta (Dict): Delta gerado por GridDeltaBuilder.build
+        """
+        for xpath in delta.get('removals', ()):
+            self._remove(xpath)
+        for element, _ in delta.get('upserts', ()):
+            self._remove(element.get('xpath', ''))
+            self._add(element)
+        self.version += 1
+
+    def _add(self, element: Dict[str, Any]) -> None:
+        xpath = element.get('xpath', '')
+        tag = str(element.get('tag', '')).lower()
+        value = str(element.get('value', '')).lower()
+        self._records[xpath] = (tag, value)
+        self._fields['tag'].add(tag, xpath)
+        self._fields['value'].add(value, xpath)
+        if element.get('modified', False):
+            self.changed.add(xpath)
+
+    def _remove(self, xpath: str) -> None:
+        record = self._records.pop(xpath, None)
+        if record is None:
+            return
+        self._fields['tag'].remove(record[0], xpath)
+        self._fields['value'].remove(record[1], xpath)
+        self.changed.discard(xpath)
+
+    def search(
+        self,
+        query: str,
+        fields: Iterable[str] = ('tag',),
+        regex: bool = False,
+        changed_only: bool = False
+    ) -> Set[str]:
+        """
+        Busca elementos por substring (sem diferenciar maiúsculas) ou expressão regular
+
+        Args:
+            query (str): Texto ou expressão regular
+            fields (Iterable[str]): Campos pesquisados ('tag', 'value', 'xpath')
+            regex (bool): Interpreta a consulta como expressão regular
+            changed_only (bool): Retorna apenas elementos alterados
+
+        Returns:
+            Set[str]: xpaths encontrados
+
+        Raises:
+            re.error: Se a expressão regular for inválida
+        """
+        if not query:
+            return set()
+        fields = tuple(fields)
+        cache_key = (query, fields, regex, changed_only, self.version)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return set(cached)
+
+        pattern = re.compile(query, re.IGNORECASE) if regex else None
+        query = query.lower()
+
+        result: Set[str] = set()
+        for field in fields:
+            if field == 'xpath':
+                # xpaths são únicos: não há vocabulário a aproveitar
+                if pattern is not None:
+                    result.update(x for x in self._records if pattern.search(x))
+                else:
+                    result.update(x for x in self._records if query in x.lower())
+            elif field in self._fields:
+                result |= self._fields[field].match(query, pattern)
+            else:
+                raise Exception(f"Campo de busca desconhecido: {field}")
+
+        if changed_only:
+            result &= self.changed
+        self._results.put(cache_key, frozenset(result))
+        return result
@@ -0,0 +1,387 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Linhas mais longas que isso são quebradas em pedaços (base64, payloads em uma linha)
+DEFAULT_LINE_WIDTH = 120
+
+# Linhas iguais mantidas ao redor de cada trecho alterado
+DEFAULT_CONTEXT = 3
+
+# Diagonais exploradas pelo diff de Myers antes de desistir (cerca de 1 s);
+# o que sobrar vira um único trecho substituído
+DEFAULT_MAX_WORK = 1_000_000
+
+Opcode = Tuple[str, int, int, int, int]
+
+class DiffCancelled(Exception):
+    """O cálculo do diff foi cancelado"""
+
+class DiffBudget:
+    """Limite de trabalho do diff, compartilhado entre as chamadas de um mesmo cálculo"""
+    __slots__ = ('remaining', 'exhausted')
+
+    def __init__(self, max_work: int = DEFAULT_MAX_WORK):
+        self.remaining = max_work
+        self.exhausted = False
+
+    def spend(self, work: int) -> bool:
+        """Consome work unidades; retorna False quando o limite acaba"""
+        self.remaining -= work
+        if self.remaining < 0:
+            self.exhausted = True
+        return not self.exhausted
+
+class DiffRow:
+    """Linha do diff lado a lado"""
+    __slots__ = ('kind', 'old', 'new', 'old_spans', 'new_spans', 'skipped')
+
+    def __init__(self, kind: str, old: Optional[str] = None, new: Optional[str] = None,
+                 old_spans: List[Tuple[int, int]] = None, new_spans: List[Tuple[int, int]] = None,
+                 skipped: int = 0):
+        # kind: 'equal', 'delete', 'insert', 'replace' ou 'skip' (linhas iguais omitidas)
+        self.kind = kind
+        self.old = old
+        self.new = new
+        self.old_spans = old_spans or []
+        self.new_spans = new_spans or []
+        self.skipped = skipped
+
+    def __repr__(self) -> str:
+        return f"DiffRow({self.kind!r}, {self.old!r}, {self.new!r})"
+
+def diff_sequences(a: Sequence, b: Sequence, cancelled: Callable[[], bool] = None,
+                   budget: DiffBudget = None) -> List[Opcode]:
+    """
+    Diff de Myers em espaço linear entre duas sequências
+
+    Usa a bisseção pelo "middle snake": memória O(N + M) e tempo
+    O((N + M) * D), onde D é o número de diferenças. Prefixos e sufixos
+    comuns são descartados a cada nível da recursão. Cada diagonal
+    explorada consome o budget; esgotado, os trechos ainda não resolvidos
+    viram um único 'replace' (resultado correto, porém menos preciso), de
+    modo que sequências muito diferentes não custam O(D²).
+
+    Args:
+        a (Sequence): Sequência original (itens comparáveis por ==)
+        b (Sequence): Sequência nova
+        cancelled (Callable): Consultada periodicamente; se retornar True, o
+            cálculo é interrompido com DiffCancelled
+        budget (DiffBudget): Limite de trabalho (padrão: DEFAULT_MAX_WORK
+            só para esta chamada)
+
+    Returns:
+        List[Tuple]: Opcodes no formato do difflib (tag, i1, i2, j1, j2), com
+            tag em 'equal', 'delete', 'insert' ou 'replace'
+    """
+    if budget is None:
+        budget = DiffBudget()
+    ops: List[Opcode] = []
+    _diff(a, 0, len(a), b, 0, len(b), ops, cancelled, budget)
+    return _merge(ops)
+
+def _diff(a, alo, ahi, b, blo, bhi, ops, cancelled, budget) -> None:
+    # Prefixo comum
+    start_a, start_b = alo, blo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > start_a:
+        ops.append(('equal', start_a, alo, start_b, blo))
+
+    # Sufixo comum (emitido depois do meio)
+    end_a, end_b = ahi, bhi
+    while ahi > alo and bhi > blo and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+
+    if alo == ahi:
+        if blo < bhi:
+            ops.append(('insert', alo, alo, blo, bhi))
+    elif blo == bhi:
+        ops.append(('delete', alo, ahi, blo, blo))
+    elif ahi - alo == 1 or bhi - blo == 1:
+        _diff_single(a, alo, ahi, b, blo, bhi, ops)
+    else:
+        split = _bisect(a, alo, ahi, b, blo, bhi, cancelled, budget)
+        if split is None:
+            ops.append(('delete', alo, ahi, blo, blo))
+            ops.append(('insert', ahi, ahi, blo, bhi))
+        else:
+            x, y = split
+            _diff(a, alo, x, b, blo, y, ops, cancelled, budget)
+            _diff(a, x, ahi, b, y, bhi, ops, cancelled, budget)
+
+    if ahi < end_a:
+        ops.append(('equal', ahi, end_a, bhi, end_b))
+
+def _diff_single(a, alo, ahi, b, blo, bhi, ops) -> None:
+    """Caso em que um dos lados tem um único item"""
+    if ahi - alo == 1:
+        item = a[alo]
+        for j in range(blo, bhi):
+            if b[j] == item:
+                if j > blo:
+                    ops.append(('insert', alo, alo, blo, j))
+                ops.append(('equal', alo, ahi, j, j + 1))
+                if j + 1 < bhi:
+                    ops.append(('insert', ahi, ahi, j + 1, bhi))
+                return
+    else:
+        item = b[blo]
+        for i in range(alo, ahi):
+            if a[i] == item:
+                if i > alo:
+                    ops.append(('delete', alo, i, blo, blo))
+                ops.append(('equal', i, i + 1, blo, bhi))
+                if i + 1 < ahi:
+                    ops.append(('delete', i + 1, ahi, bhi, bhi))
+                return
+    ops.append(('delete', alo, ahi, blo, blo))
+    ops.append(('insert', ahi, ahi, blo, bhi))
+
+def _bisect(a, alo, ahi, b, blo, bhi, cancelled, budget) -> Optional[Tuple[int, int]]:
+    """
+    Encontra o ponto central do caminho de edição (busca nos dois sentidos)
+
+    Returns:
+        Optional[Tuple[int, int]]: Ponto (x, y) onde dividir o problema, ou
+            None se as sequências não tiverem nada em comum ou o budget acabar
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = (n + m + 1) // 2
+    offset = max_d
+    length = 2 * max_d
+    forward = [-1] * length
+    forward[offset + 1] = 0
+    backward = forward[:]
+    delta = n - m
+    # Com delta ímpar, a sobreposição é detectada no sentido direto
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+
+    for d in range(max_d):
+        if cancelled is not None and cancelled():
+            raise DiffCancelled()
+        if not budget.spend(2 * d + 2):
+            return None
+
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (k1 != d and forward[k1_offset - 1] < forward[k1_offset + 1]):
+                x1 = forward[k1_offset + 1]
+            else:
+                x1 = forward[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                x1 += 1
+                y1 += 1
+            forward[k1_offset] = x1
+            if x1 > n:
+                k1end += 2  # Saiu pela direita
+            elif y1 > m:
+                k1start += 2  # Saiu por baixo
+            elif front:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < length and backward[k2_offset] != -1:
+                    if x1 >= n - backward[k2_offset]:
+                        return alo + x1, blo + y1
+
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (k2 != d and backward[k2_offset - 1] < backward[k2_offset + 1]):
+                x2 = backward[k2_offset + 1]
+            else:
+                x2 = backward[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[ahi - 1 - x2] == b[bhi - 1 - y2]:
+                x2 += 1
+                y2 += 1
+            backward[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < length and forward[k1_offset] != -1:
+                    x1 = forward[k1_offset]
+                    y1 = offset + x1 - k1_offset
+                    if x1 >= n - x2:
+                        return alo + x1, blo + y1
+    return None
+
+def _merge(ops: List[Opcode]) -> List[Opcode]:
+    """Junta operações adjacentes; trechos sem igualdade viram um único opcode"""
+    merged: List[List] = []
+    for tag, i1, i2, j1, j2 in ops:
+        if merged and (merged[-1][0] == 'equal') == (tag == 'equal'):
+            merged[-1][2] = i2
+            merged[-1][4] = j2
+        else:
+            merged.append([tag, i1, i2, j1, j2])
+    result = []
+    for tag, i1, i2, j1, j2 in merged:
+        if tag != 'equal':
+            if i1 == i2:
+                tag = 'insert'
+            elif j1 == j2:
+                tag = 'delete'
+            else:
+                tag = 'replace'
+        result.append((tag, i1, i2, j1, j2))
+    return result
+
+def split_lines(text: str, width: int = DEFAULT_LINE_WIDTH) -> List[str]:
+    """
+    Divide o texto em linhas, quebrando linhas longas em pedaços de width caracteres
+
+    Args:
+        text (str): Texto a dividir
+        width (int): Comprimento máximo de cada linha
+
+    Returns:
+        List[str]: Linhas, sem os caracteres de quebra
+    """
+    lines = []
+    for line in text.split('\n'):
+        if len(line) <= width:
+            lines.append(line)
+        else:
+            lines.extend(line[i:i + width] for i in range(0, len(line), width))
+    return lines
+
+def _common_prefix(a: str, b: str) -> int:
+    """Comprimento do prefixo comum (busca binária sobre comparações de fatias)"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Comprimento do sufixo comum, limitado a limit caracteres"""
+    low, high = 0, limit
+    len_a, len_b = len(a), len(b)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len_a - middle:len_a - low] == b[len_b - middle:len_b - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _char_spans(old: str, new: str, cancelled, budget) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Trechos de caracteres diferentes entre duas linhas"""
+    old_spans = []
+    new_spans = []
+    for tag, i1, i2, j1, j2 in diff_sequences(old, new, cancelled, budget):
+        if tag == 'equal':
+            continue
+        if i2 > i1:
+            old_spans.append((i1, i2))
+        if j2 > j1:
+            new_spans.append((j1, j2))
+    return old_spans, new_spans
+
+def _equal_rows(lines: List[str], rows: List[DiffRow], context: int, leading: bool, trailing: bool) -> None:
+    """Acrescenta linhas iguais, omitindo o que estiver longe das alterações"""
+    keep_head = 0 if leading else context
+    keep_tail = 0 if trailing else context
+    if len(lines) <= keep_head + keep_tail + 1:
+        rows.extend(DiffRow('equal', line, line) for line in lines)
+        return
+    rows.extend(DiffRow('equal', line, line) for line in lines[:keep_head])
+    rows.append(DiffRow('skip', skipped=len(lines) - keep_head - keep_tail))
+    if keep_tail:
+        rows.extend(DiffRow('equal', line, line) for line in lines[-keep_tail:])
+
+def diff_text(
+    old: str,
+    new: str,
+    context: int = DEFAULT_CONTEXT,
+    width: int = DEFAULT_LINE_WIDTH,
+    cancelled: Callable[[], bool] = None,
+    budget: DiffBudget = None
+) -> List[DiffRow]:
+    """
+    Calcula o diff lado a lado de dois textos, por linha e por caractere
+
+    O prefixo e o sufixo comuns são separados antes (comparação de fatias
+    em C), de modo que uma alteração pontual em um valor de vários
+    megabytes só passa pelo diff de Myers no trecho que realmente mudou.
+    Linhas substituídas recebem também os trechos de caracteres alterados.
+    O diff por linha e o por caractere compartilham o mesmo budget: com
+    ele esgotado, o restante sai como linhas substituídas inteiras.
+
+    Args:
+        old (str): Valor original
+        new (str): Valor atual
+        context (int): Linhas iguais mantidas ao redor das alterações
+        width (int): Comprimento máximo de cada linha exibida
+        cancelled (Callable): Se retornar True, interrompe com DiffCancelled
+        budget (DiffBudget): Limite de trabalho; budget.exhausted indica um
+            diff aproximado (padrão: DEFAULT_MAX_WORK)
+
+    Returns:
+        List[DiffRow]: Linhas do diff, com trechos iguais longos omitidos ('skip')
+    """
+    if budget is None:
+        budget = DiffBudget()
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+
+    # Alinha o prefixo ao início da linha (ou a um pedaço inteiro, em linhas longas)
+    line_start = old.rfind('\n', 0, prefix) + 1
+    prefix = line_start + (prefix - line_start) // width * width
+
+    # Alinha o sufixo ao fim da linha, quando ela não for longa demais
+    end_old = len(old) - suffix
+    line_end = old.find('\n', end_old)
+    if line_end == -1:
+        line_end = len(old)
+    if line_end - (old.rfind('\n', 0, end_old) + 1) <= width:
+        suffix = len(old) - line_end
+
+    if cancelled is not None and cancelled():
+        raise DiffCancelled()
+
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+    suffix_text = old[len(old) - suffix:]
+    if suffix_text.startswith('\n'):
+        # A quebra encerra a última linha do meio
+        suffix_text = suffix_text[1:]
+
+    rows: List[DiffRow] = []
+    if prefix:
+        prefix_text = old[:prefix]
+        if prefix_text.endswith('\n'):
+            prefix_text = prefix_text[:-1]
+        _equal_rows(split_lines(prefix_text, width), rows, context, True, False)
+
+    if old_middle != new_middle:
+        old_lines = split_lines(old_middle, width)
+        new_lines = split_lines(new_middle, width)
+        opcodes = diff_sequences(old_lines, new_lines, cancelled, budget)
+        for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+            if tag == 'equal':
+                _equal_rows(old_lines[i1:i2], rows, context, False, False)
+                continue
+            pairs = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+            for offset in range(pairs):
+                old_line, new_line = old_lines[i1 + offset], new_lines[j1 + offset]
+                old_spans, new_spans = _char_spans(old_line, new_line, cancelled, budget)
+                rows.append(DiffRow('replace', old_line, new_line, old_spans, new_spans))
+            for old_line in old_lines[i1 + pairs:i2]:
+                rows.append(DiffRow('delete', old_line, None, [(0, len(old_line))]))
+            for new_line in new_lines[j1 + pairs:j2]:
+                rows.append(DiffRow('insert', None, new_line, None, [(0, len(new_line))]))
+    elif old_middle:
+        rows.extend(DiffRow('equal', line, line) for line in split_lines(old_middle, width))
+
+    if suffix_text:
+        _equal_rows(split_lines(suffix_text, width), rows, context, False, True)
+    return rows
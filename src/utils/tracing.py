@@ -0,0 +1,226 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Marcos de uma alteração, na ordem do pipeline:
+#   fs_event  primeiro evento do sistema de arquivos do salvamento
+#   debounce  disparo do agrupamento de eventos
+#   read      leitura do arquivo concluída
+#   parse     árvore XML carregada (lxml)
+#   extract   elementos extraídos
+#   diff      comparação com as versões anteriores (e delta do grid) concluída
+#   apply     resultado aplicado (grid na interface ou registro emitido pela CLI)
+#   coalesced versão descartada sem ser aplicada, superada por uma mais nova
+#             (agrupada no quadro do grid ou substituída na fila do pool);
+#             o conteúdo dela aparece com a versão que a substituiu
+TRACE_MARKS = ('fs_event', 'debounce', 'read', 'parse', 'extract', 'diff', 'apply', 'coalesced')
+
+# Amostras mantidas por etapa na janela deslizante dos percentis
+DEFAULT_WINDOW = 1024
+
+# Percentis reportados por etapa
+PERCENTILES = (50, 90, 99)
+
+class ChangeTrace:
+    """Instantes (time.monotonic_ns) de cada marco de uma alteração"""
+    __slots__ = ('marks', '_clock')
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None):
+        """
+        Args:
+            clock (Callable): Fonte dos instantes em ns (padrão: time.monotonic_ns);
+                a reprodução de cargas passa o relógio virtual do handler
+        """
+        self.marks: Dict[str, int] = {}
+        self._clock = clock or time.monotonic_ns
+
+    def mark(self, name: str, timestamp_ns: Optional[int] = None) -> None:
+        """
+        Registra um marco (sobrescreve o anterior com o mesmo nome)
+
+        Args:
+            name (str): Nome do marco (ver TRACE_MARKS)
+            timestamp_ns (int): Instante em ns do relógio do trace (padrão: agora)
+        """
+        self.marks[name] = self._clock() if timestamp_ns is None else timestamp_ns
+
+    def durations_ms(self) -> Dict[str, float]:
+        """
+        Duração de cada etapa, do marco anterior presente até o marco da etapa
+
+        Returns:
+            Dict[str, float]: {marco: ms}, na ordem do pipeline, mais 'total'
+                (do primeiro ao último marco; ausente em traces 'coalesced',
+                que não chegaram a ser aplicados)
+        """
+        durations: Dict[str, float] = {}
+        previous = None
+        first = None
+        for name in TRACE_MARKS:
+            timestamp = self.marks.get(name)
+            if timestamp is None:
+                continue
+            if previous is None:
+                first = timestamp
+            else:
+                durations[name] = (timestamp - previous) / 1e6
+            previous = timestamp
+        if first is not None and previous is not None and previous != first and 'coalesced' not in self.marks:
+            durations['total'] = (previous - first) / 1e6
+        return durations
+
+    def summary(self) -> str:
+        """Resumo curto para o log, ex.: 'debounce 100.2 ms, read 1.3 ms, ...'"""
+        return ', '.join(
+            f"{name} {duration:.1f} ms" for name, duration in self.durations_ms().items() if name != 'total'
+        )
+
+class RollingPercentiles:
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Percentis sobre as últimas amostras de uma etapa
+
+        Args:
+            window (int): Número de amostras mantidas
+        """
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Contagem total, percentis e máximo da janela atual (ms)"""
+        ordered = sorted(self._samples)
+        result: Dict[str, float] = {'count': self.count, 'window': len(ordered)}
+        if not ordered:
+            return result
+        for percentile in PERCENTILES:
+            index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+            result[f'p{percentile}'] = round(ordered[index], 3)
+        result['max'] = round(ordered[-1], 3)
+        return result
+
+class LatencyTracker:
+    def __init__(self, window: int = DEFAULT_WINDOW, keep_traces: int = 100):
+        """
+        Agrega os traces das alterações em percentis por etapa
+
+        Args:
+            window (int): Amostras mantidas por etapa
+            keep_traces (int): Número de traces recentes mantidos (durações em ms)
+        """
+        self.window = window
+        self._stages: Dict[str, RollingPercentiles] = {}
+        self._recent = deque(maxlen=keep_traces)
+        self._lock = threading.Lock()
+
+    def record(self, trace: ChangeTrace) -> Dict[str, float]:
+        """
+        Registra as durações de um trace
+
+        Returns:
+            Dict[str, float]: Durações registradas
+        """
+        durations = trace.durations_ms()
+        with self._lock:
+            for name, duration in durations.items():
+                stage = self._stages.get(name)
+                if stage is None:
+                    stage = self._stages[name] = RollingPercentiles(self.window)
+                stage.add(duration)
+            self._recent.append(durations)
+        return durations
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """
+        Percentis de cada etapa
+
+        Returns:
+            Dict: {etapa: {'count', 'window', 'p50', 'p90', 'p99', 'max'}}
+        """
+        with self._lock:
+            return {
+                name: self._stages[name].snapshot()
+                for name in (*TRACE_MARKS, 'total') if name in self._stages
+            }
+
+    def recent(self) -> List[Dict[str, float]]:
+        """Durações dos traces mais recentes (do mais antigo ao mais novo)"""
+        with self._lock:
+            return list(self._recent)
+
+    def over_budget(self, budgets_ms: Dict[str, float], percentile: int = 99) -> Dict[str, float]:
+        """
+        Etapas cujo percentil passa do orçamento
+
+        Args:
+            budgets_ms (Dict[str, float]): Orçamento por etapa (ms)
+            percentile (int): Percentil comparado (um de PERCENTILES)
+
+        Returns:
+            Dict[str, float]: {etapa: valor do percentil} das etapas acima do orçamento
+        """
+        key = f'p{percentile}'
+        return {
+            name: stats[key]
+            for name, stats in self.percentiles().items()
+            if name in budgets_ms and key in stats and stats[key] > budgets_ms[name]
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+class TracedSubmitter:
+    def __init__(self, pool: Any, tracker: Optional[LatencyTracker] = None):
+        """
+        Envia jobs ao WorkerPool registrando os traces dos jobs substituídos
+
+        O pool mantém um único job pendente por chave e descarta o anterior
+        sem executá-lo; o trace desse job é registrado aqui com o marco
+        'coalesced', em vez de sumir das estatísticas.
+
+        Args:
+            pool: WorkerPool (submit retorna False quando substitui um pendente)
+            tracker (LatencyTracker): Onde registrar (padrão: get_latency_tracker())
+        """
+        self.pool = pool
+        self._tracker = tracker
+        self._last: Dict[str, Optional[ChangeTrace]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, trace: Optional[ChangeTrace], fn: Callable, *args, **kwargs) -> bool:
+        """
+        Agenda fn no pool para a chave, associando o trace ao job
+
+        Returns:
+            bool: False se o envio substituiu um job pendente
+        """
+        with self._lock:
+            # O job pendente de uma chave é sempre o último enviado para ela
+            previous = self._last.get(key)
+            self._last[key] = trace
+            accepted = self.pool.submit(key, fn, *args, **kwargs)
+        if not accepted and previous is not None:
+            record_coalesced(previous, self._tracker)
+        return accepted
+
+def record_coalesced(trace: ChangeTrace, tracker: Optional[LatencyTracker] = None) -> None:
+    """Registra um trace cuja versão foi descartada por uma mais nova antes de ser aplicada"""
+    trace.mark('coalesced')
+    (tracker or get_latency_tracker()).record(trace)
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+def get_latency_tracker() -> LatencyTracker:
+    """Retorna o LatencyTracker compartilhado do processo"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker()
+        return _tracker
@@ -0,0 +1,174 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Set
+
+
+class WorkerPool:
+    def __init__(self, max_workers: int = 2, name: str = "xmlwatcher-worker"):
+        """
+        Inicializa um pool de threads de tamanho fixo com fila por chave
+
+        Cada chave (normalmente o caminho do arquivo) tem no máximo um job
+        executando e um job pendente. Um novo envio para uma chave que já tem
+        job pendente substitui o anterior ("o mais recente vence"), de modo
+        que uma rajada de alterações resulta em no máximo duas execuções.
+
+        Args:
+            max_workers (int): Número máximo de threads de trabalho
+            name (str): Prefixo do nome das threads
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers deve ser maior que zero")
+        self._max_workers = max_workers
+        self._name = name
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending: Dict[str, Callable[[], Any]] = {}
+        self._ready: Deque[str] = deque()
+        self._running: Set[str] = set()
+        self._threads = []
+        self._shutdown = False
+
+        # Contadores expostos via stats()
+        self._submitted = 0
+        self._completed = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def submit(self, key: str, fn: Callable, *args, **kwargs) -> bool:
+        """
+        Agenda um job para a chave, descartando o pendente anterior se houver
+
+        Args:
+            key (str): Chave de serialização (ex.: caminho do arquivo)
+            fn (Callable): Função a ser executada
+            *args, **kwargs: Argumentos repassados para a função
+
+        Returns:
+            bool: False se o envio substituiu um job pendente, True caso contrário
+        """
+        job = (lambda: fn(*args, **kwargs)) if args or kwargs else fn
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("WorkerPool já foi finalizado")
+
+            self._submitted += 1
+            superseded = key in self._pending
+            self._pending[key] = job
+
+            if superseded:
+                # A chave já está na fila de prontos ou em execução
+                self._dropped += 1
+                return False
+
+            if key not in self._running:
+                self._ready.append(key)
+                self._cond.notify()
+            self._ensure_workers()
+            return True
+
+    def _ensure_workers(self) -> None:
+        """Cria threads sob demanda até o limite configurado (chamado com o lock)"""
+        if len(self._threads) >= self._max_workers:
+            return
+        if len(self._ready) <= len(self._threads) - len(self._running):
+            return
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self._name}-{len(self._threads) + 1}",
+            daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker(self) -> None:
+        """Laço principal das threads de trabalho"""
+        while True:
+            with self._cond:
+                while not self._ready and not self._shutdown:
+                    self._cond.wait()
+                if not self._ready:
+                    return
+                key = self._ready.popleft()
+                job = self._pending.pop(key)
+                self._running.add(key)
+
+            failed = False
+            try:
+                job()
+            except Exception as e:
+                failed = True
+                print(f"Erro ao executar tarefa para {key}: {e}")
+
+            with self._cond:
+                self._running.discard(key)
+                self._completed += 1
+                if failed:
+                    self._failed += 1
+                # Uma versão mais nova chegou durante a execução
+                if key in self._pending:
+                    self._ready.append(key)
+                    self._cond.notify()
+                self._cond.notify_all()
+
+    @property
+    def queue_depth(self) -> int:
+        """Número de jobs aguardando execução"""
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def dropped(self) -> int:
+        """Número de jobs descartados por terem sido substituídos"""
+        with self._lock:
+            return self._dropped
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna um instantâneo dos contadores do pool"""
+        with self._lock:
+            return {
+                'workers': len(self._threads),
+                'queue_depth': len(self._pending),
+                'running': len(self._running),
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'dropped': self._dropped,
+                'failed': self._failed
+            }
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """
+        Aguarda até que não haja jobs pendentes nem em execução
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se o pool ficou ocioso dentro do prazo
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._running,
+                timeout=timeout
+            )
+
+    def shutdown(self, wait: bool = True, timeout: float = 2.0) -> None:
+        """
+        Finaliza o pool, descartando jobs que ainda não começaram
+
+        Args:
+            wait (bool): Se True, aguarda as threads terminarem
+            timeout (float): Tempo máximo de espera por thread
+        """
+        with self._cond:
+            self._shutdown = True
+            self._dropped += len(self._pending)
+            self._pending.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join(timeout=timeout)
@@ -1,20 +1,76 @@
-from lxml import etree
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
-import time
+import os
 import threading
-from queue import Queue
+import time
+from .resource_manager import Cache
+from .metrics import get_registry, SIZE_BUCKETS
+
+# lxml.etree é importado apenas no primeiro parse (ver _lxml_etree)
+etree = None
+
+def _lxml_etree():
+    """Importa lxml.etree sob demanda, mantendo a importação deste módulo leve"""
+    global etree
+    if etree is None:
+        from lxml import etree as lxml_etree
+        etree = lxml_etree
+    return etree
+
+# Limites do cache de resultados (poucos arquivos, mas cada estado pode ter milhões de elementos)
+ELEMENT_CACHE_ENTRIES = 4
+ELEMENT_CACHE_BYTES = 512 * 1024 * 1024
+
+# Número de arquivos com a codificação detectada em cache
+ENCODING_CACHE_ENTRIES = 256
+
+# Custo aproximado em memória de um elemento (dicionário e strings fixas), sem o texto variável
+ELEMENT_OVERHEAD_BYTES = 400
+
+def estimate_state_size(state: List[Dict[str, Any]], sample_size: int = 256) -> int:
+    """
+    Estima o tamanho em bytes de uma lista de elementos a partir de uma amostra
+    
+    Args:
+        state (List[Dict]): Lista de elementos
+        sample_size (int): Número máximo de elementos examinados
+        
+    Returns:
+        int: Tamanho estimado
+    """
+    if not state:
+        return 0
+    step = max(1, len(state) // sample_size)
+    sample = state[::step]
+    text = sum(len(str(element.get('value', ''))) + len(element.get('xpath', '')) for element in sample)
+    return len(state) * ELEMENT_OVERHEAD_BYTES + text * len(state) // len(sample)
+
+_metrics = get_registry()
+PARSES = _metrics.counter('xmlwatcher_parses_total', "Leituras completas do XML (lxml)")
+PARSE_BYTES = _metrics.counter('xmlwatcher_parse_bytes_total', "Bytes de XML lidos pelo parser")
+PARSE_ERRORS = _metrics.counter('xmlwatcher_parse_errors_total', "Leituras que terminaram em erro")
+PARSE_SECONDS = _metrics.histogram(
+    'xmlwatcher_parse_seconds', "Duração de parse_file_and_get_changes (leitura, extração e diff)")
+DIFF_SIZE = _metrics.histogram(
+    'xmlwatcher_diff_changes', "Elementos alterados em relação à versão anterior", SIZE_BUCKETS)
 
 class XMLParser:
     def __init__(self):
         self.initial_state = None
         self.intermediate_state = None
         self._namespace_map = {}
-        self._element_cache = {}  # Mudando para um dicionário normal
-        self._cache_lock = threading.Lock()
-        self._parse_queue = Queue(maxsize=100)
-        self._last_parse_time = 0
         self._parse_interval = 0.1  # 100ms
+        # Último resultado por arquivo, reaproveitado por parse_file dentro de _parse_interval
+        self._element_cache = Cache(
+            max_entries=ELEMENT_CACHE_ENTRIES,
+            max_bytes=ELEMENT_CACHE_BYTES,
+            ttl=self._parse_interval,
+            sizeof=estimate_state_size
+        )
+        # Codificação que funcionou na última leitura de cada arquivo
+        self._encoding_cache = Cache(max_entries=ENCODING_CACHE_ENTRIES)
+        _metrics.register_stats('cache', self._element_cache, cache='elements')
+        _metrics.register_stats('cache', self._encoding_cache, cache='encoding')
         self._lock = threading.Lock()
         
     def parse_file(self, file_path: str) -> List[Dict[str, Any]]:
@@ -28,88 +84,19 @@ class XMLParser:
             List[Dict]: Lista de elementos XML com suas propriedades
         """
         try:
-            current_time = time.time()
-            if current_time - self._last_parse_time < self._parse_interval:
-                # Usa cache se disponível
-                with self._cache_lock:
-                    if file_path in self._element_cache:
-                        return self._element_cache[file_path].copy()
-            
-            # Abordagem 1: Tenta usar lxml diretamente com várias codificações
-            encodings_to_try = ['utf-8', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
-            root = None
-            last_error = None
-            
-            # Verifica o BOM primeiro para determinar a codificação
-            try:
-                with open(file_path, 'rb') as f:
-                    header = f.read(4)
-                    if header.startswith(b'\xff\xfe'):
-                        encodings_to_try.insert(0, 'utf-16le')
-                    elif header.startswith(b'\xfe\xff'):
-                        encodings_to_try.insert(0, 'utf-16be')
-                    elif header.startswith(b'\xef\xbb\xbf'):
-                        encodings_to_try.insert(0, 'utf-8-sig')
-            except Exception as e:
-                print(f"Aviso: Erro ao ler cabeçalho do arquivo: {e}")
-            
-            # Tenta cada codificação
-            for encoding in encodings_to_try:
-                try:
-                    parser = etree.XMLParser(encoding=encoding, recover=True)
-                    tree = etree.parse(file_path, parser=parser)
-                    root = tree.getroot()
-                    if root is not None:
-                        break
-                except Exception as e:
-                    last_error = e
-                    continue
-            
-            # Abordagem 2: Se ainda não conseguiu, tenta ler o arquivo e analisá-lo manualmente
-            if root is None:
-                try:
-                    # Para UTF-16LE especificamente
-                    content = None
-                    
-                    # Tenta UTF-16LE explicitamente
-                    try:
-                        with open(file_path, 'r', encoding='utf-16le') as f:
-                            content = f.read()
-                    except Exception:
-                        # Outras tentativas
-                        for enc in ['utf-16', 'utf-8', 'latin1']:
-                            try:
-                                with open(file_path, 'r', encoding=enc) as f:
-                                    content = f.read()
-                                break
-                            except Exception:
-                                continue
-                    
-                    if content:
-                        # Remove a declaração XML para evitar problemas de codificação
-                        if '<?xml' in content and '?>' in content:
-                            content = content[content.find('?>') + 2:]
-                        
-                        # Força a análise do conteúdo como uma string
-                        try:
-                            root = etree.fromstring(content.encode('utf-8'), parser=etree.XMLParser(recover=True))
-                        except Exception as e:
-                            print(f"Erro ao analisar conteúdo como string: {e}")
-                except Exception as e:
-                    last_error = e
+            # Usa cache se disponível (entradas expiram após _parse_interval)
+            cached = self._element_cache.get(file_path)
+            if cached is not None:
+                return cached.copy()
             
-            # Se ainda não temos uma raiz, algo está realmente errado
-            if root is None:
-                error_msg = str(last_error) if last_error else "Motivo desconhecido"
-                raise Exception(f"Não foi possível parsear o XML: {error_msg}")
+            root = self._parse_root(file_path)
             
             # Se não tiver estado inicial, salva o estado atual
             if self.initial_state is None:
                 with self._lock:
                     self.initial_state = self._extract_elements(root)
-                    with self._cache_lock:
-                        self._element_cache[file_path] = self.initial_state.copy()
-                    self._last_parse_time = time.time()
+                    self.intermediate_state = self.initial_state
+                    self._element_cache.put(file_path, self.initial_state.copy())
                     return self.initial_state
             
             # Extrai o estado atual e compara com o inicial
@@ -117,110 +104,45 @@ class XMLParser:
             result = self._compare_states(self.initial_state, current_state)
             
             # Atualiza cache
-            with self._cache_lock:
-                self._element_cache[file_path] = result.copy()
-            self._last_parse_time = time.time()
+            self._element_cache.put(file_path, result.copy())
             return result
             
         except Exception as e:
+            PARSE_ERRORS.inc()
             raise Exception(f"Erro ao parsear XML: {str(e)}")
 
-    def parse_file_and_get_changes(self, file_path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    def parse_file_and_get_changes(self, file_path: str, trace: Any = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Parseia o arquivo XML e retorna os dados atualizados e as mudanças de forma otimizada
         
         Args:
             file_path (str): Caminho do arquivo XML
+            trace (ChangeTrace): Recebe os marcos 'parse', 'extract' e 'diff' (opcional)
             
         Returns:
             tuple: (dados_xml, lista_de_mudancas)
         """
+        started = time.perf_counter()
         try:
-            current_time = time.time()
-            if current_time - self._last_parse_time < self._parse_interval:
-                with self._cache_lock:
-                    if file_path in self._element_cache:
-                        cached_data = self._element_cache[file_path].copy()
-                        changes = [elem for elem in cached_data if elem.get('modified', False)]
-                        return cached_data, changes
+            # Sem atalho de cache: quem chama já foi notificado de uma nova
+            # versão (debounce no handler), e devolver o resultado anterior
+            # perderia a última versão de uma rajada de escritas
             
-            # Abordagem 1: Tenta usar lxml diretamente com várias codificações
-            encodings_to_try = ['utf-8', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
-            root = None
-            last_error = None
-            
-            # Verifica o BOM primeiro para determinar a codificação
-            try:
-                with open(file_path, 'rb') as f:
-                    header = f.read(4)
-                    if header.startswith(b'\xff\xfe'):
-                        encodings_to_try.insert(0, 'utf-16le')
-                    elif header.startswith(b'\xfe\xff'):
-                        encodings_to_try.insert(0, 'utf-16be')
-                    elif header.startswith(b'\xef\xbb\xbf'):
-                        encodings_to_try.insert(0, 'utf-8-sig')
-            except Exception as e:
-                print(f"Aviso: Erro ao ler cabeçalho do arquivo: {e}")
-            
-            # Tenta cada codificação
-            for encoding in encodings_to_try:
-                try:
-                    parser = etree.XMLParser(encoding=encoding, recover=True)
-                    tree = etree.parse(file_path, parser=parser)
-                    root = tree.getroot()
-                    if root is not None:
-                        break
-                except Exception as e:
-                    last_error = e
-                    continue
-            
-            # Abordagem 2: Se ainda não conseguiu, tenta ler o arquivo e analisá-lo manualmente
-            if root is None:
-                try:
-                    # Para UTF-16LE especificamente
-                    content = None
-                    
-                    # Tenta UTF-16LE explicitamente
-                    try:
-                        with open(file_path, 'r', encoding='utf-16le') as f:
-                            content = f.read()
-                    except Exception:
-                        # Outras tentativas
-                        for enc in ['utf-16', 'utf-8', 'latin1']:
-                            try:
-                                with open(file_path, 'r', encoding=enc) as f:
-                                    content = f.read()
-                                break
-                            except Exception:
-                                continue
-                    
-                    if content:
-                        # Remove a declaração XML para evitar problemas de codificação
-                        if '<?xml' in content and '?>' in content:
-                            content = content[content.find('?>') + 2:]
-                        
-                        # Força a análise do conteúdo como uma string
-                        try:
-                            root = etree.fromstring(content.encode('utf-8'), parser=etree.XMLParser(recover=True))
-                        except Exception as e:
-                            print(f"Erro ao analisar conteúdo como string: {e}")
-                except Exception as e:
-                    last_error = e
-            
-            # Se ainda não temos uma raiz, algo está realmente errado
-            if root is None:
-                error_msg = str(last_error) if last_error else "Motivo desconhecido"
-                raise Exception(f"Não foi possível parsear o XML: {error_msg}")
+            root = self._parse_root(file_path)
+            if trace is not None:
+                trace.mark('parse')
             
             current_state = self._extract_elements(root)
+            if trace is not None:
+                trace.mark('extract')
             
             if self.initial_state is None:
                 with self._lock:
                     self.initial_state = current_state
-                    self.intermediate_state = None
-                    with self._cache_lock:
-                        self._element_cache[file_path] = current_state.copy()
-                    self._last_parse_time = time.time()
+                    # A linha de base também é a versão anterior da próxima leitura
+                    self.intermediate_state = current_state
+                    self._element_cache.put(file_path, current_state.copy())
+                    PARSE_SECONDS.observe(time.perf_counter() - started)
                     return current_state, []
             
             last_changes = []
@@ -232,18 +154,115 @@ class XMLParser:
             result_data = self._compare_states(self.initial_state, current_state)
             
             changes = [elem for elem in result_data if elem.get('modified', False)]
+            if trace is not None:
+                trace.mark('diff')
             
             # Atualiza cache
-            with self._cache_lock:
-                self._element_cache[file_path] = result_data.copy()
-            self._last_parse_time = time.time()
+            self._element_cache.put(file_path, result_data.copy())
             
+            PARSE_SECONDS.observe(time.perf_counter() - started)
+            DIFF_SIZE.observe(len(last_changes))
             return result_data, changes, last_changes
             
         except Exception as e:
+            PARSE_ERRORS.inc()
             raise Exception(f"Erro ao parsear XML: {str(e)}")
 
-    def _extract_elements(self, root: etree.Element) -> List[Dict[str, Any]]:
+    def _parse_root(self, file_path: str) -> 'etree._Element':
+        """
+        Lê o arquivo e retorna o elemento raiz, detectando a codificação
+        
+        Args:
+            file_path (str): Caminho do arquivo XML
+            
+        Returns:
+            etree._Element: Elemento raiz
+        """
+        etree = _lxml_etree()
+        
+        # Abordagem 1: Tenta usar lxml diretamente com várias codificações
+        encodings_to_try = ['utf-8', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
+        root = None
+        last_error = None
+        
+        # Verifica o BOM primeiro para determinar a codificação
+        bom_encoding = None
+        try:
+            with open(file_path, 'rb') as f:
+                header = f.read(4)
+                if header.startswith(b'\xff\xfe'):
+                    bom_encoding = 'utf-16le'
+                elif header.startswith(b'\xfe\xff'):
+                    bom_encoding = 'utf-16be'
+                elif header.startswith(b'\xef\xbb\xbf'):
+                    bom_encoding = 'utf-8-sig'
+        except Exception as e:
+            print(f"Aviso: Erro ao ler cabeçalho do arquivo: {e}")
+        
+        # Sem BOM, tenta primeiro a codificação que funcionou na última leitura do arquivo
+        first_encoding = bom_encoding or self._encoding_cache.get(file_path)
+        if first_encoding is not None:
+            encodings_to_try.insert(0, first_encoding)
+        
+        # Tenta cada codificação
+        for encoding in encodings_to_try:
+            try:
+                parser = etree.XMLParser(encoding=encoding, recover=True)
+                tree = etree.parse(file_path, parser=parser)
+                root = tree.getroot()
+                if root is not None:
+                    self._encoding_cache.put(file_path, encoding)
+                    break
+            except Exception as e:
+                last_error = e
+                continue
+        
+        # Abordagem 2: Se ainda não conseguiu, tenta ler o arquivo e analisá-lo manualmente
+        if root is None:
+            try:
+                # Para UTF-16LE especificamente
+                content = None
+                
+                # Tenta UTF-16LE explicitamente
+                try:
+                    with open(file_path, 'r', encoding='utf-16le') as f:
+                        content = f.read()
+                except Exception:
+                    # Outras tentativas
+                    for enc in ['utf-16', 'utf-8', 'latin1']:
+                        try:
+                            with open(file_path, 'r', encoding=enc) as f:
+                                content = f.read()
+                            break
+                        except Exception:
+                            continue
+                
+                if content:
+                    # Remove a declaração XML para evitar problemas de codificação
+                    if '<?xml' in content and '?>' in content:
+                        content = content[content.find('?>') + 2:]
+                    
+                    # Força a análise do conteúdo como uma string
+                    try:
+                        root = etree.fromstring(content.encode('utf-8'), parser=etree.XMLParser(recover=True))
+                    except Exception as e:
+                        print(f"Erro ao analisar conteúdo como string: {e}")
+            except Exception as e:
+                last_error = e
+        
+        # Se ainda não temos uma raiz, algo está realmente errado
+        if root is None:
+            error_msg = str(last_error) if last_error else "Motivo desconhecido"
+            raise Exception(f"Não foi possível parsear o XML: {error_msg}")
+        
+        PARSES.inc()
+        try:
+            PARSE_BYTES.inc(os.path.getsize(file_path))
+        except OSError:
+            pass
+        return root
+
+    def _extract_elements(self, root: 'etree._Element') -> List[Dict[str, Any]]:
         """
         Extrai elementos do XML seguindo a lógica correta de numeração
         
@@ -260,22 +279,51 @@ class XMLParser:
                 return tag_with_ns.split('}')[-1]
             return tag_with_ns
         
+        def path_step(element) -> str:
+            """
+            Nome do elemento no xpath, como no getpath do lxml (libxml2)
+
+            Elementos no namespace padrão não têm como ser nomeados em XPath
+            e viram '*' (numerados entre todos os irmãos); com prefixo, usam
+            'prefixo:nome'.
+            """
+            if element.tag[0] != '{':
+                return element.tag
+            prefix = element.prefix
+            if prefix is None:
+                return '*'
+            return f"{prefix}:{clean_tag(element.tag)}"
+        
         def process_level(parent_element, parent_path="", parent_line=1):
             """
             Processa um nível de elementos, contando repetições apenas neste nível
+            
+            O xpath de cada filho é montado a partir do xpath do pai e dos
+            contadores de passos deste nível (o mesmo resultado do getpath,
+            que percorreria os irmãos a cada elemento e tornaria a extração
+            quadrática em níveis largos).
             """
-            # Conta quantas vezes cada tag aparece neste nível
+            # Conta quantas vezes cada tag (e cada passo do xpath) aparece neste nível
             tag_counts = {}
+            step_counts = {}
             children = list(parent_element)
             
             for child in children:
                 clean_child_tag = clean_tag(child.tag)
                 tag_counts[clean_child_tag] = tag_counts.get(clean_child_tag, 0) + 1
+                step = path_step(child)
+                step_counts[step] = step_counts.get(step, 0) + 1
+            # '*' é numerado entre todos os elementos irmãos
+            if '*' in step_counts:
+                step_counts['*'] = len(children)
             
             # Processa cada filho
             tag_counters = {}
+            step_counters = {}
+            element_position = 0
             for child in children:
                 clean_child_tag = clean_tag(child.tag)
+                element_position += 1
                 
                 # Determina o número da linha
                 if tag_counts[clean_child_tag] > 1:
@@ -286,12 +334,16 @@ class XMLParser:
                     # Tag única neste nível - usa 1 ou herda do pai
                     line_number = 1 if parent_path == "" else parent_line
                 
-                # Cria o xpath usando getpath para consistência
-                try:
-                    current_xpath = root.getroottree().getpath(child)
-                except Exception:
-                    # Fallback se getpath falhar
-                    current_xpath = f"{parent_path}/{clean_child_tag}" if parent_path else f"/{clean_child_tag}"
+                # Cria o xpath (mesmo formato do getpath)
+                step = path_step(child)
+                if step == '*':
+                    index = element_position
+                else:
+                    index = step_counters[step] = step_counters.get(step, 0) + 1
+                if step_counts[step] > 1:
+                    current_xpath = f"{parent_path}/{step}[{index}]"
+                else:
+                    current_xpath = f"{parent_path}/{step}"
                 
                 # Adiciona o elemento
                 element_data = {
@@ -346,8 +398,8 @@ class XMLParser:
                 }
                 elements.append(attr_data)
             
-            # Processa filhos da raiz
-            process_level(root, root_xpath, 1)
+            # Processa filhos da raiz (a partir do caminho da raiz no formato do getpath)
+            process_level(root, root.getroottree().getpath(root), 1)
         
         return elements
         
@@ -373,22 +425,23 @@ class XMLParser:
         initial_map = {elem['xpath']: elem for elem in initial_state}
         current_map = {elem['xpath']: elem for elem in current_state}
         
-        # Identifica elementos modificados, adicionados e removidos
-        current_xpaths = set(current_map.keys())
-        initial_xpaths = set(initial_map.keys())
-        
-        potentially_modified = current_xpaths.intersection(initial_xpaths)
-        added_xpaths = current_xpaths - initial_xpaths
-        removed_xpaths = initial_xpaths - current_xpaths
-        
-        # Processa elementos modificados
-        for xpath in potentially_modified:
-            current_elem = current_map[xpath]
-            initial_elem = initial_map[xpath]
+        # Percorre o estado atual na ordem do documento, para que o resultado
+        # seja estável entre execuções
+        for current_elem in current_state:
+            xpath = current_elem['xpath']
+            initial_elem = initial_map.get(xpath)
             elem_data = current_elem.copy()
             
-            # Verifica mudanças em valores
-            if initial_elem['value'] != current_elem['value']:
+            if initial_elem is None:
+                # Elemento adicionado
+                elem_data.update({
+                    'modified': True,
+                    'change_type': 'added',
+                    'timestamp': datetime.now().strftime("%H:%M:%S")
+                })
+                changes.append(elem_data)
+            elif initial_elem['value'] != current_elem['value']:
+                # Elemento com valor alterado
                 elem_data.update({
                     'initial_value': initial_elem['value'],
                     'modified': True,
@@ -401,20 +454,12 @@ class XMLParser:
             
             result.append(elem_data)
         
-        # Processa elementos adicionados
-        for xpath in added_xpaths:
-            elem_data = current_map[xpath].copy()
-            elem_data.update({
-                'modified': True,
-                'change_type': 'added',
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
-            changes.append(elem_data)
-            result.append(elem_data)
-        
         # Processa elementos removidos
-        for xpath in removed_xpaths:
-            elem_data = initial_map[xpath].copy()
+        for initial_elem in initial_state:
+            xpath = initial_elem['xpath']
+            if xpath in current_map:
+                continue
+            elem_data = initial_elem.copy()
             elem_data.update({
                 'modified': True,
                 'change_type': 'removed',
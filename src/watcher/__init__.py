@@ -1,3 +1,15 @@
-from .xml_monitor import XMLFileMonitor
+import importlib
 
-__all__ = ["XMLFileMonitor"]
+# Exportações carregadas sob demanda: importar um submódulo não carrega os demais
+_EXPORTS = {
+    "XMLFileMonitor": ".xml_monitor",
+    "WorkloadRecorder": ".replay",
+    "WorkloadReplayer": ".replay",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
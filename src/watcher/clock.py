@@ -0,0 +1,143 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+class SystemClock:
+    """Relógio real: time, monotonic_ns, sleep e threading.Timer"""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic_ns(self) -> int:
+        return time.monotonic_ns()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def call_later(self, delay: float, function: Callable[[], Any]) -> threading.Timer:
+        """Agenda function numa thread após delay segundos (retorna o timer, com cancel())"""
+        timer = threading.Timer(delay, function)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+# Relógio padrão do handler
+SYSTEM_CLOCK = SystemClock()
+
+class VirtualTimer:
+    """Timer do VirtualClock; só dispara quando o relógio é avançado"""
+    __slots__ = ('due_ns', 'function', 'cancelled')
+
+    def __init__(self, due_ns: int, function: Callable[[], Any]):
+        self.due_ns = due_ns
+        self.function = function
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+class VirtualClock:
+    def __init__(self, follow_real_time: bool = True):
+        """
+        Relógio em que as esperas são puladas
+
+        sleep e timers não esperam: sleep adianta o relógio e os timers
+        disparam na thread de quem chama advance_to/run_pending, na ordem
+        dos vencimentos, com o relógio adiantado até cada vencimento. Fora
+        das esperas o relógio acompanha o tempo real (follow_real_time), de
+        modo que o custo de leitura, parse e diff continua sendo medido; com
+        follow_real_time=False ele só anda por sleep e pelos avanços, e toda
+        a reprodução é determinística.
+
+        Args:
+            follow_real_time (bool): Soma o tempo real decorrido ao relógio
+        """
+        self._follow_real_time = follow_real_time
+        self._mono_base_ns = time.monotonic_ns()
+        self._wall_base_ns = time.time_ns()
+        self._offset_ns = 0
+        self._timers: List[Tuple[int, int, VirtualTimer]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def monotonic_ns(self) -> int:
+        if self._follow_real_time:
+            return time.monotonic_ns() + self._offset_ns
+        return self._mono_base_ns + self._offset_ns
+
+    def time(self) -> float:
+        """Hora de parede correspondente ao relógio virtual"""
+        return (self._wall_base_ns + self.monotonic_ns() - self._mono_base_ns) / 1e9
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self._offset_ns += max(0, int(seconds * 1e9))
+
+    def call_later(self, delay: float, function: Callable[[], Any]) -> VirtualTimer:
+        timer = VirtualTimer(self.monotonic_ns() + max(0, int(delay * 1e9)), function)
+        with self._lock:
+            heapq.heappush(self._timers, (timer.due_ns, next(self._sequence), timer))
+        return timer
+
+    @property
+    def pending(self) -> int:
+        """Número de timers ainda não disparados nem cancelados"""
+        with self._lock:
+            return sum(1 for _, _, timer in self._timers if not timer.cancelled)
+
+    def _pop_due(self, limit_ns: Optional[int]) -> Optional[VirtualTimer]:
+        """Retira o próximo timer que vence até limit_ns, adiantando o relógio até ele"""
+        with self._lock:
+            while self._timers:
+                due_ns, _, timer = self._timers[0]
+                if timer.cancelled:
+                    heapq.heappop(self._timers)
+                    continue
+                if limit_ns is not None and due_ns > limit_ns:
+                    return None
+                heapq.heappop(self._timers)
+                now = self.monotonic_ns()
+                if due_ns > now:
+                    self._offset_ns += due_ns - now
+                return timer
+        return None
+
+    def advance_to(self, target_ns: int) -> int:
+        """
+        Dispara, em ordem, os timers que vencem até target_ns e adianta o relógio até lá
+
+        Timers agendados pelos próprios timers também disparam se vencerem
+        antes do alvo.
+
+        Returns:
+            int: Número de timers disparados
+        """
+        fired = 0
+        while True:
+            timer = self._pop_due(target_ns)
+            if timer is None:
+                break
+            timer.function()
+            fired += 1
+        with self._lock:
+            now = self.monotonic_ns()
+            if target_ns > now:
+                self._offset_ns += target_ns - now
+        return fired
+
+    def run_pending(self) -> int:
+        """
+        Dispara todos os timers pendentes (inclusive os agendados durante os disparos)
+
+        Returns:
+            int: Número de timers disparados
+        """
+        fired = 0
+        while True:
+            timer = self._pop_due(None)
+            if timer is None:
+                return fired
+            timer.function()
+            fired += 1
@@ -0,0 +1,349 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils.tracing import LatencyTracker
+from utils.xml_parser import XMLParser
+from watcher.clock import SYSTEM_CLOCK, VirtualClock
+from watcher.xml_monitor import FileEvent, XMLFileHandler, XMLFileMonitor
+
+# Uma carga gravada é um diretório com o manifesto e uma cópia de cada versão:
+#   workload.json  {'format', 'file', 'created', 'initial', 'steps': [
+#                       {'at': segundos desde o início, 'event': tipo,
+#                        'version': arquivo da versão ou None}, ...]}
+#   v00000.xml     versão inicial, v00001.xml, ...
+MANIFEST_NAME = 'workload.json'
+WORKLOAD_FORMAT = 1
+
+# Eventos reproduzidos (mesmos nomes dos eventos do watchdog)
+STEP_EVENTS = ('modified', 'created', 'moved', 'deleted')
+
+def _version_name(number: int) -> str:
+    return f"v{number:05d}.xml"
+
+def load_workload(directory: str) -> Dict[str, Any]:
+    """
+    Lê e valida o manifesto de uma carga gravada
+
+    Returns:
+        Dict: Manifesto (ver MANIFEST_NAME)
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != WORKLOAD_FORMAT:
+        raise Exception(f"Formato de carga não suportado: {manifest.get('format')}")
+    for step in manifest['steps']:
+        if step['event'] not in STEP_EVENTS:
+            raise Exception(f"Evento inválido na carga: {step['event']}")
+    return manifest
+
+def write_workload(directory: str, versions: List[bytes], interval: float,
+                   events_per_save: int = 1, event: str = 'modified',
+                   file_name: str = 'data.xml') -> Dict[str, Any]:
+    """
+    Grava uma carga sintética: uma versão a cada interval segundos
+
+    Args:
+        directory (str): Diretório da carga
+        versions (List[bytes]): Conteúdos; o primeiro é a versão inicial
+        interval (float): Segundos entre salvamentos
+        events_per_save (int): Eventos por salvamento (rajadas como as de editores)
+        event (str): Tipo do evento de cada salvamento
+        file_name (str): Nome do arquivo gravado no manifesto
+
+    Returns:
+        Dict: Manifesto gravado
+    """
+    os.makedirs(directory, exist_ok=True)
+    for number, content in enumerate(versions):
+        with open(os.path.join(directory, _version_name(number)), 'wb') as f:
+            f.write(content)
+    steps = []
+    for number in range(1, len(versions)):
+        at = round(number * interval, 6)
+        steps.append({'at': at, 'event': event, 'version': _version_name(number)})
+        # Eventos repetidos do mesmo salvamento, 1 ms depois, sem nova versão
+        steps.extend(
+            {'at': round(at + burst / 1000, 6), 'event': 'modified', 'version': None}
+            for burst in range(1, events_per_save)
+        )
+    manifest = {
+        'format': WORKLOAD_FORMAT,
+        'file': file_name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'initial': _version_name(0) if versions else None,
+        'steps': steps,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+class WorkloadRecorder:
+    def __init__(self, file_path: str, directory: str):
+        """
+        Grava os eventos de um arquivo e cada versão nova do seu conteúdo
+
+        Implementa dispatch como o XMLFileHandler, e recebe os eventos do
+        mesmo backend (XMLFileMonitor.attach_handler). Cada evento vira um
+        passo com o instante relativo ao início da gravação; o conteúdo é
+        lido no momento do evento e só é guardado quando difere da versão
+        anterior, de modo que escritas parciais também são reproduzidas.
+
+        Args:
+            file_path (str): Arquivo gravado
+            directory (str): Diretório da carga (criado se necessário)
+        """
+        self.file_path = os.path.abspath(file_path)
+        self._normalized_path = os.path.normcase(self.file_path)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.steps: List[Dict[str, Any]] = []
+        self._versions = 0
+        self._last_content: Optional[bytes] = None
+        self._lock = threading.Lock()
+        self._start_ns = time.monotonic_ns()
+        self.initial = self._save_version()
+        self.save()
+
+    def _is_target(self, path) -> bool:
+        if not path:
+            return False
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        return os.path.normcase(os.path.abspath(path)) == self._normalized_path
+
+    def _save_version(self) -> Optional[str]:
+        """Guarda o conteúdo atual se ele mudou (chamado com o lock adquirido ou no início)"""
+        try:
+            with open(self.file_path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        if content == self._last_content:
+            return None
+        name = _version_name(self._versions)
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            f.write(content)
+        self._versions += 1
+        self._last_content = content
+        return name
+
+    def dispatch(self, event: Any) -> None:
+        """Registra um evento do backend (watchdog ou polling)"""
+        if event.is_directory:
+            return
+        if event.event_type == 'moved' and self._is_target(getattr(event, 'dest_path', None)):
+            event_type = 'moved'
+        elif self._is_target(event.src_path):
+            # O alvo renomeado para outro nome equivale, para o handler, a uma exclusão
+            event_type = 'deleted' if event.event_type == 'moved' else event.event_type
+        else:
+            return
+        if event_type not in STEP_EVENTS:
+            return
+        at = (time.monotonic_ns() - self._start_ns) / 1e9
+        with self._lock:
+            version = None if event_type == 'deleted' else self._save_version()
+            self.steps.append({'at': round(at, 6), 'event': event_type, 'version': version})
+
+    def save(self) -> Dict[str, Any]:
+        """
+        Grava o manifesto com os passos registrados até agora
+
+        Returns:
+            Dict: Manifesto gravado
+        """
+        with self._lock:
+            manifest = {
+                'format': WORKLOAD_FORMAT,
+                'file': os.path.basename(self.file_path),
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'initial': self.initial,
+                'steps': list(self.steps),
+            }
+        temp_path = os.path.join(self.directory, MANIFEST_NAME + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, os.path.join(self.directory, MANIFEST_NAME))
+        return manifest
+
+def record(file_path: str, directory: str, duration: Optional[float] = None,
+           backend: str = 'auto', stop_event: threading.Event = None) -> Dict[str, Any]:
+    """
+    Grava uma carga até duration segundos ou até stop_event (ou Ctrl+C)
+
+    Returns:
+        Dict: Manifesto gravado
+    """
+    stop_event = stop_event or threading.Event()
+    recorder = WorkloadRecorder(file_path, directory)
+    monitor = XMLFileMonitor(backend=backend)
+    monitor.attach_handler(file_path, recorder)
+    try:
+        stop_event.wait(duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop_monitoring()
+    return recorder.save()
+
+class WorkloadReplayer:
+    def __init__(self, directory: str, target_path: str, speed: Optional[float] = None,
+                 debounce_seconds: float = 0.1, parser: XMLParser = None):
+        """
+        Reproduz uma carga gravada pelo pipeline handler -> parser -> diff
+
+        Cada passo grava a versão no arquivo alvo (com mtime crescente, como
+        no salvamento original) e entrega o evento ao XMLFileHandler, que
+        notifica um consumidor igual ao da CLI: parse, diff e registro das
+        etapas num LatencyTracker próprio.
+
+        Com speed=None a carga roda o mais rápido possível sobre um
+        VirtualClock: debounce, esperas de leitura e intervalos entre passos
+        são pulados, tudo roda na thread de run() na ordem da gravação, e o
+        custo real de leitura, parse e diff continua medido. Com speed=1.0 a
+        carga roda em tempo real (2.0 = duas vezes mais rápido), com o
+        relógio e os timers do sistema.
+
+        Args:
+            directory (str): Diretório da carga
+            target_path (str): Arquivo onde as versões são gravadas (sobrescrito)
+            speed (float): None (o mais rápido possível) ou fator de velocidade
+            debounce_seconds (float): Debounce do handler
+            parser (XMLParser): Parser usado (padrão: um novo)
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed deve ser maior que zero")
+        self.directory = directory
+        self.workload = load_workload(directory)
+        self.target_path = os.path.abspath(target_path)
+        self.speed = speed
+        self.debounce_seconds = debounce_seconds
+        self.parser = parser or XMLParser()
+        self._contents: Dict[str, bytes] = {}
+        self._last_mtime_ns = 0
+        self._stats_lock = threading.Lock()
+
+    def _content(self, version: str) -> bytes:
+        content = self._contents.get(version)
+        if content is None:
+            with open(os.path.join(self.directory, version), 'rb') as f:
+                content = self._contents[version] = f.read()
+        return content
+
+    def _write(self, path: str, content: bytes, clock: Any) -> None:
+        """Grava a versão com mtime do relógio da reprodução, sempre crescente"""
+        with open(path, 'wb') as f:
+            f.write(content)
+        mtime_ns = max(int(clock.time() * 1e9), self._last_mtime_ns + 1)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        self._last_mtime_ns = mtime_ns
+
+    def _apply(self, step: Dict[str, Any], handler: XMLFileHandler, clock: Any) -> None:
+        """Reproduz um passo no arquivo alvo e entrega o evento ao handler"""
+        event_type = step['event']
+        version = step.get('version')
+        if event_type == 'deleted':
+            try:
+                os.remove(self.target_path)
+            except FileNotFoundError:
+                pass
+            handler.dispatch(FileEvent('deleted', self.target_path))
+        elif event_type == 'moved':
+            # Salvamento atômico: arquivo temporário renomeado sobre o alvo
+            temp_path = self.target_path + '.replay-tmp'
+            if version is not None:
+                self._current = self._content(version)
+            self._write(temp_path, self._current, clock)
+            os.replace(temp_path, self.target_path)
+            handler.dispatch(FileEvent('moved', temp_path, self.target_path))
+        else:
+            if version is not None:
+                self._current = self._content(version)
+                self._write(self.target_path, self._current, clock)
+            handler.dispatch(FileEvent(event_type, self.target_path))
+
+    def _wait_idle(self, handler: XMLFileHandler, timeout: float = 30.0) -> None:
+        """Espera o handler esvaziar o buffer e terminar o processamento (tempo real)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with handler._lock:
+                if not handler._event_buffer and not handler._processing:
+                    return
+            time.sleep(0.01)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executa a reprodução
+
+        Returns:
+            Dict: Passos, notificações, alterações, erros, tempo de parede,
+                vazão (notificações por segundo) e percentis de latência por etapa
+        """
+        steps = self.workload['steps']
+        virtual = self.speed is None
+        clock = VirtualClock() if virtual else SYSTEM_CLOCK
+        tracker = LatencyTracker()
+        counts = {'notifications': 0, 'changes': 0, 'errors': 0}
+
+        # Conteúdos carregados antes: a leitura da carga não entra nas medições
+        for step in steps:
+            if step.get('version'):
+                self._content(step['version'])
+        initial = self.workload.get('initial')
+        self._current = self._content(initial) if initial else b''
+        os.makedirs(os.path.dirname(self.target_path), exist_ok=True)
+        self._write(self.target_path, self._current, clock)
+        # Linha de base, como a interface e a CLI fazem ao abrir o arquivo
+        self.parser.parse_file_and_get_changes(self.target_path)
+
+        def on_change(_xml_data, processing_info=None):
+            trace = processing_info.get('trace') if processing_info else None
+            try:
+                result = self.parser.parse_file_and_get_changes(self.target_path, trace)
+                last_changes = result[2] if len(result) > 2 else []
+                if trace is not None:
+                    trace.mark('apply')
+                    tracker.record(trace)
+                with self._stats_lock:
+                    counts['notifications'] += 1
+                    counts['changes'] += len(last_changes)
+            except Exception as e:
+                print(f"Erro ao reproduzir alteração: {e}")
+                with self._stats_lock:
+                    counts['errors'] += 1
+
+        handler = XMLFileHandler(self.target_path, on_change, self.debounce_seconds, clock=clock)
+        factor = 1.0 if virtual else self.speed
+        started = time.perf_counter()
+        start_ns = clock.monotonic_ns()
+        for step in steps:
+            due_ns = start_ns + int(step['at'] / factor * 1e9)
+            if virtual:
+                clock.advance_to(due_ns)
+            else:
+                delay = (due_ns - clock.monotonic_ns()) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+            self._apply(step, handler, clock)
+        if virtual:
+            clock.run_pending()
+        else:
+            self._wait_idle(handler)
+        elapsed = time.perf_counter() - started
+
+        return {
+            'mode': 'virtual' if virtual else f'{self.speed:g}x',
+            'steps': len(steps),
+            'versions': len({step['version'] for step in steps if step.get('version')}),
+            'notifications': counts['notifications'],
+            'changes': counts['changes'],
+            'errors': counts['errors'],
+            'workload_seconds': steps[-1]['at'] if steps else 0.0,
+            'wall_seconds': round(elapsed, 6),
+            'notifications_per_second': round(counts['notifications'] / elapsed, 3) if elapsed else 0.0,
+            'latency_ms': tracker.percentiles(),
+        }
@@ -1,119 +1,193 @@
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 import threading
 import time
 from datetime import datetime
 import os
-from typing import Callable, Dict, Any, List, Optional
-from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from utils.xml_parser import XMLParser
+from utils.tracing import ChangeTrace
+from watcher.clock import SYSTEM_CLOCK
+from utils.metrics import get_registry
 
-class XMLFileHandler(FileSystemEventHandler):
-    def __init__(self, file_path: str, callback: Callable, parser: XMLParser, debounce_seconds: float = 0.1):
+# Métricas do handler: eventos recebidos x alterações notificadas mostram se o
+# monitor está acompanhando quem escreve o arquivo
+_metrics = get_registry()
+EVENTS_RECEIVED = _metrics.counter(
+    'xmlwatcher_events_received_total', "Eventos do sistema de arquivos recebidos")
+EVENTS_COALESCED = _metrics.counter(
+    'xmlwatcher_events_coalesced_total', "Eventos agrupados pelo debounce com outro do mesmo salvamento")
+CHANGES_DROPPED = _metrics.counter(
+    'xmlwatcher_changes_dropped_total', "Salvamentos processados sem notificação, por motivo")
+CHANGES_NOTIFIED = _metrics.counter(
+    'xmlwatcher_changes_notified_total', "Alterações entregues ao callback")
+
+# watchdog só é importado quando o backend nativo é iniciado: o handler
+# implementa a mesma interface (dispatch/on_*) sem herdar de
+# FileSystemEventHandler, e o backend de polling usa FileEvent
+
+class FileEvent:
+    """Evento de arquivo compatível com os eventos do watchdog"""
+    __slots__ = ('event_type', 'src_path', 'dest_path', 'is_directory')
+
+    def __init__(self, event_type: str, src_path: str, dest_path: str = '', is_directory: bool = False):
+        self.event_type = event_type
+        self.src_path = src_path
+        self.dest_path = dest_path
+        self.is_directory = is_directory
+
+    def __repr__(self) -> str:
+        return f"FileEvent({self.event_type!r}, {self.src_path!r}, {self.dest_path!r})"
+
+class XMLFileHandler:
+    def __init__(self, file_path: str, callback: Callable, debounce_seconds: float = 0.1,
+                 clock: Any = None):
         """
         Inicializa o handler de eventos do arquivo
         
+        O handler apenas detecta salvamentos: todos os eventos de um mesmo
+        salvamento lógico (escrita direta ou arquivo temporário renomeado
+        sobre o alvo) são agrupados em uma única chamada do callback. O parse
+        fica a cargo do consumidor, que assim executa um parse por salvamento.
+        
         Args:
             file_path (str): Caminho do arquivo a ser monitorado
             callback (Callable): Função a ser chamada quando houver alterações
-            parser (XMLParser): Parser XML para processar o arquivo
             debounce_seconds (float): Tempo mínimo entre notificações
+            clock: Fonte de tempo e de timers (padrão: SYSTEM_CLOCK); a
+                reprodução de cargas usa um VirtualClock (ver watcher/replay.py)
         """
         self.file_path = os.path.abspath(file_path)
+        self.clock = clock or SYSTEM_CLOCK
+        self._normalized_path = os.path.normcase(self.file_path)
         self.callback = callback
-        self.parser = parser
         self.debounce_seconds = debounce_seconds
-        self._last_size = 0
-        self._change_count = 0
-        self._last_change_time = 0
-        self._last_modified = 0
         self._lock = threading.Lock()
-        self._timer = None
         self._last_content = None
+        self._last_signature = self._file_signature()
+        self._inode = self._last_signature[:2] if self._last_signature else None
+        self._missing = self._last_signature is None
         self._processing = False
+        self._rerun = False
         self._event_buffer: List[Dict] = []
         self._buffer_size = 5
-        self._buffer_timeout = 0.1
+        self._buffer_timeout = debounce_seconds
         self._buffer_timer = None
         
+    def _is_target(self, path) -> bool:
+        """Verifica se o caminho do evento corresponde ao arquivo monitorado"""
+        if not path:
+            return False
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        return os.path.normcase(os.path.abspath(path)) == self._normalized_path
+
+    def dispatch(self, event: Any) -> None:
+        """
+        Encaminha um evento (do watchdog ou do polling) para o método on_* correspondente
+        
+        Args:
+            event: Objeto com event_type, src_path, dest_path e is_directory
+        """
+        method = getattr(self, f"on_{event.event_type}", None)
+        if method is not None:
+            method(event)
+
     def on_modified(self, event):
         """Chamado quando o arquivo é modificado"""
-        if not event.is_directory and os.path.abspath(event.src_path) == self.file_path:
-            current_time = time.time()
-            
-            # Verifica se deve processar a mudança
-            if not self._should_process_change():
-                return
-                
-            # Adiciona evento ao buffer
-            with self._lock:
-                self._event_buffer.append({
-                    'time': current_time,
-                    'type': 'modified',
-                    'path': event.src_path
-                })
-                
-                # Se o buffer está cheio ou passou tempo suficiente, processa
-                if (len(self._event_buffer) >= self._buffer_size or 
-                    (self._event_buffer and 
-                     current_time - self._event_buffer[0]['time'] >= self._buffer_timeout)):
-                    self._process_buffer()
-                else:
-                    # Agenda processamento futuro
-                    self._schedule_buffer_processing()
-
-    def _should_process_change(self) -> bool:
-        """Verifica se a mudança deve ser processada"""
-        current_time = time.time()
+        if not event.is_directory and self._is_target(event.src_path):
+            self._add_event('modified')
+
+    def on_created(self, event):
+        """Chamado quando o arquivo é (re)criado, ex.: após exclusão pelo editor"""
+        if not event.is_directory and self._is_target(event.src_path):
+            self._add_event('created')
+
+    def on_moved(self, event):
+        """
+        Chamado em renomeações no diretório
+        
+        Um arquivo temporário renomeado sobre o alvo é tratado como um
+        salvamento atômico. Se o próprio alvo for renomeado (ex.: editor
+        criando backup antes de gravar), o arquivo é marcado como ausente
+        até que a nova versão apareça.
+        """
+        if event.is_directory:
+            return
+        if self._is_target(getattr(event, 'dest_path', None)):
+            self._add_event('replaced')
+        elif self._is_target(event.src_path):
+            self._mark_missing()
+
+    def on_deleted(self, event):
+        """Chamado quando o arquivo é removido (possível troca em andamento)"""
+        if not event.is_directory and self._is_target(event.src_path):
+            self._mark_missing()
+
+    def _mark_missing(self) -> None:
+        """Marca o arquivo como ausente sem descartar a linha de base"""
+        with self._lock:
+            self._missing = True
+
+    def _add_event(self, event_type: str) -> None:
+        """Adiciona um evento ao buffer e agenda o processamento agrupado"""
+        EVENTS_RECEIVED.inc(type=event_type)
+        with self._lock:
+            self._event_buffer.append({
+                'time': self.clock.time(),
+                'ns': self.clock.monotonic_ns(),
+                'type': event_type
+            })
+            # Buffer cheio: processa imediatamente, senão aguarda novos eventos
+            if len(self._event_buffer) >= self._buffer_size:
+                self._schedule_buffer_processing(0)
+            else:
+                self._schedule_buffer_processing(self._buffer_timeout)
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Retorna (dispositivo, inode, tamanho, mtime_ns) do arquivo
+        
+        Returns:
+            Optional[Tuple]: Assinatura do arquivo ou None se ele não existir
+        """
         try:
-            current_size = os.path.getsize(self.file_path)
-            current_mtime = os.path.getmtime(self.file_path)
-            
-            with self._lock:
-                # Se o arquivo não mudou realmente
-                if (current_size == self._last_size and 
-                    current_mtime == self._last_modified):
-                    return False
-                
-                # Se houve muitas mudanças em pouco tempo
-                if (current_time - self._last_change_time < self.debounce_seconds and 
-                    self._change_count > 5):
-                    return False
-                
-                # Atualiza contadores
-                if current_time - self._last_change_time >= 1.0:
-                    self._change_count = 1
-                else:
-                    self._change_count += 1
-                
-                self._last_size = current_size
-                self._last_modified = current_mtime
-                self._last_change_time = current_time
-                
-                return True
-        except Exception:
-            return False
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
 
-    def _schedule_buffer_processing(self):
-        """Agenda o processamento do buffer"""
+    def _schedule_buffer_processing(self, delay: float = None) -> None:
+        """Agenda o processamento do buffer (chamado com o lock adquirido)"""
         if self._buffer_timer is not None:
             self._buffer_timer.cancel()
         
-        self._buffer_timer = threading.Timer(
-            self._buffer_timeout,
+        self._buffer_timer = self.clock.call_later(
+            self._buffer_timeout if delay is None else delay,
             self._process_buffer
         )
-        self._buffer_timer.start()
 
     def _process_buffer(self):
         """Processa o buffer de eventos"""
+        fired_ns = self.clock.monotonic_ns()
         with self._lock:
             if not self._event_buffer:
                 return
+            if self._processing:
+                # Reprocessa assim que o processamento atual terminar
+                self._rerun = True
+                return
             
-            # Processa apenas o evento mais recente
-            self._process_change()
+            events = list(self._event_buffer)
             self._event_buffer.clear()
+            self._processing = True
+        
+        try:
+            self._process_change(events, fired_ns)
+        finally:
+            with self._lock:
+                self._processing = False
+                if self._rerun:
+                    self._rerun = False
+                    self._schedule_buffer_processing(0)
 
     def _read_file_with_retry(self, max_retries=5, initial_delay=0.05):
         """
@@ -132,7 +206,7 @@ class XMLFileHandler(FileSystemEventHandler):
         
         for attempt in range(max_retries):
             # Delay exponencial entre tentativas
-            time.sleep(initial_delay * (2 ** attempt))
+            self.clock.sleep(initial_delay * (2 ** attempt))
             
             try:
                 # Primeiro tenta ler os primeiros bytes para detectar BOM
@@ -169,46 +243,335 @@ class XMLFileHandler(FileSystemEventHandler):
             
         raise Exception(f"Não foi possível ler o arquivo: {last_error}")
 
-    def _process_change(self):
-        """Processa a modificação do arquivo após o debounce"""
-        if self._processing:
-            self._schedule_buffer_processing()
+    def _process_change(self, events: List[Dict], fired_ns: Optional[int] = None) -> None:
+        """
+        Processa um salvamento lógico após o debounce
+        
+        Args:
+            events (List[Dict]): Eventos agrupados deste salvamento
+            fired_ns (int): Instante (monotonic_ns) em que o debounce disparou
+        """
+        start_time = events[0]['time']
+        EVENTS_COALESCED.inc(len(events) - 1)
+        trace = ChangeTrace(self.clock.monotonic_ns)
+        trace.mark('fs_event', events[0].get('ns'))
+        trace.mark('debounce', fired_ns)
+        
+        signature = self._file_signature()
+        if signature is None:
+            # Troca em andamento: aguarda o evento de criação/renomeação
+            with self._lock:
+                self._missing = True
+            CHANGES_DROPPED.inc(reason='missing')
             return
-
-        self._processing = True
-        start_time = time.time()
+        
+        with self._lock:
+            # Eventos atrasados da mesma versão (ex.: modified após o moved)
+            if signature == self._last_signature and not self._missing:
+                CHANGES_DROPPED.inc(reason='same_signature')
+                return
+            previous_inode = self._inode
+            self._inode = signature[:2]
+            self._last_signature = signature
+            self._missing = False
         
         try:
             # Tenta ler o arquivo com retry
             current_content = self._read_file_with_retry()
-            
-            # Se o conteúdo mudou
-            if current_content != self._last_content:
-                self._last_content = current_content
-                xml_data = self.parser.parse_file(self.file_path)
-                
-                # Informações de processamento
-                processing_info = {
-                    'start_time': start_time,
-                    'detection_time': datetime.now().strftime("%H:%M:%S")
-                }
-                
-                # Chama o callback na thread principal
-                if self.callback:
-                    self.callback(xml_data, processing_info)
-                    
         except Exception as e:
             print(f"Erro ao processar arquivo modificado: {e}")
-            self._schedule_buffer_processing()
-        finally:
-            self._processing = False
+            # Permite nova tentativa no próximo evento
+            with self._lock:
+                self._last_signature = None
+            CHANGES_DROPPED.inc(reason='read_error')
+            return
+        
+        # Conteúdo idêntico (ex.: troca por arquivo igual) não gera notificação
+        if current_content == self._last_content:
+            CHANGES_DROPPED.inc(reason='same_content')
+            return
+        self._last_content = current_content
+        trace.mark('read')
+        
+        # Informações de processamento
+        processing_info = {
+            'start_time': start_time,
+            'detection_time': datetime.fromtimestamp(self.clock.time()).strftime("%H:%M:%S"),
+            'event_type': events[-1]['type'],
+            'events_coalesced': len(events),
+            'inode': self._inode,
+            'replaced': previous_inode is not None and previous_inode != self._inode,
+            # Marcos de latência; o consumidor completa parse, extract, diff e apply
+            'trace': trace
+        }
+        
+        CHANGES_NOTIFIED.inc()
+        if self.callback:
+            try:
+                self.callback(None, processing_info)
+            except Exception as e:
+                print(f"Erro ao notificar alteração: {e}")
+
+# Sistemas de arquivos onde os observers nativos perdem eventos
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'virtiofs', 'vboxsf',
+    'fuse.sshfs', 'fuse.grpcfuse', 'fakeowner', 'afs', 'ncpfs'
+}
+
+def is_network_path(path: str) -> bool:
+    """
+    Verifica se o caminho está em um compartilhamento de rede ou montagem
+    de container, onde os observers nativos não são confiáveis
+    
+    Args:
+        path (str): Caminho do arquivo
+        
+    Returns:
+        bool: True se o caminho deve ser monitorado por polling
+    """
+    path = os.path.abspath(path)
+    if os.name == 'nt':
+        if path.startswith('\\\\'):
+            return True
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + '\\'
+            # DRIVE_REMOTE = 4
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4
+        except Exception:
+            return False
+    
+    try:
+        with open('/proc/mounts', 'r') as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return False
+    
+    # Usa o ponto de montagem mais específico que contém o caminho
+    best_mount, best_type = '', ''
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        mount_point = fields[1].replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (path == mount_point or path.startswith(prefix)) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fields[2]
+    return best_type in NETWORK_FILESYSTEMS
+
+class _PollEntry:
+    """Estado de um arquivo monitorado por polling"""
+    __slots__ = ('path', 'name', 'handler', 'signature', 'interval',
+                 'min_interval', 'max_interval', 'next_due')
+
+    def __init__(self, path: str, handler: Any,
+                 min_interval: float, max_interval: float):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.handler = handler
+        self.signature = None
+        self.interval = min_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.next_due = 0.0
+
+class StatPoller:
+    def __init__(self, backoff: float = 1.5):
+        """
+        Inicializa o backend de polling por stat
+        
+        Uma única thread varre todos os arquivos registrados, agrupando-os
+        por diretório. No Windows usa os.scandir, que já traz os metadados
+        de todos os arquivos do diretório em uma chamada; nos demais sistemas
+        usa os.stat apenas nos arquivos cujo intervalo venceu.
+        
+        O intervalo de cada arquivo cai para o mínimo quando ele muda e cresce
+        geometricamente (até o máximo) enquanto permanece ocioso.
+        
+        Args:
+            backoff (float): Fator de crescimento do intervalo ocioso
+        """
+        self._backoff = backoff
+        self._coalesce = 0.25
+        self._entries: Dict[Tuple[str, int], _PollEntry] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._use_scandir = os.name == 'nt'
+        self.sweeps = 0
+
+    def add(self, path: str, handler: Any,
+            min_interval: float = 0.1, max_interval: float = 2.0) -> None:
+        """
+        Registra um arquivo para polling
+        
+        Args:
+            path (str): Caminho do arquivo
+            handler: Handler com método dispatch (ex.: XMLFileHandler)
+            min_interval (float): Intervalo enquanto o arquivo está ativo
+            max_interval (float): Intervalo máximo enquanto está ocioso
+        """
+        path = os.path.abspath(path)
+        entry = _PollEntry(path, handler, min_interval, max_interval)
+        entry.signature = self._stat_signature(path)
+        entry.next_due = time.monotonic() + min_interval
+        with self._lock:
+            self._entries[(os.path.normcase(path), id(handler))] = entry
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="xmlwatcher-stat-poller",
+                    daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def remove(self, path: str, handler: Any) -> None:
+        """Remove um arquivo do polling"""
+        key = (os.path.normcase(os.path.abspath(path)), id(handler))
+        with self._lock:
+            self._entries.pop(key, None)
+        self._wakeup.set()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _stat_signature(path: str) -> Optional[Tuple[int, int, int]]:
+        """Retorna (inode, tamanho, mtime_ns) ou None se o arquivo não existir"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _scan_directory(self, directory: str, entries: List[_PollEntry]) -> Dict[str, Optional[Tuple]]:
+        """
+        Obtém as assinaturas de vários arquivos de um diretório
+        
+        Returns:
+            Dict[str, Optional[Tuple]]: Nome do arquivo -> assinatura
+        """
+        if not self._use_scandir or len(entries) == 1:
+            return {e.name: self._stat_signature(e.path) for e in entries}
+        
+        wanted = {e.name for e in entries}
+        result = {name: None for name in wanted}
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if dir_entry.name in wanted:
+                        # No Windows o stat vem da própria listagem do diretório
+                        st = dir_entry.stat()
+                        result[dir_entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return result
+
+    def _run(self) -> None:
+        """Laço de varredura"""
+        while True:
+            with self._lock:
+                if not self._entries:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                due: Dict[str, List[_PollEntry]] = {}
+                next_wake = None
+                for entry in self._entries.values():
+                    # Antecipa arquivos que venceriam em breve para agrupar as varreduras
+                    if entry.next_due - now <= entry.interval * self._coalesce:
+                        due.setdefault(os.path.dirname(entry.path), []).append(entry)
+                    elif next_wake is None or entry.next_due < next_wake:
+                        next_wake = entry.next_due
+            
+            if due:
+                self.sweeps += 1
+                for directory, entries in due.items():
+                    signatures = self._scan_directory(directory, entries)
+                    for entry in entries:
+                        self._check_entry(entry, signatures.get(entry.name))
+                continue
+            
+            timeout = max(0.0, next_wake - time.monotonic()) if next_wake else None
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _check_entry(self, entry: _PollEntry, signature: Optional[Tuple]) -> None:
+        """Compara a assinatura atual e despacha o evento equivalente ao do observer nativo"""
+        previous = entry.signature
+        now = time.monotonic()
+        
+        # O stat do scandir no Windows traz st_ino = 0; o os.stat, o inode real.
+        # Um arquivo pode alternar entre os dois caminhos (ex.: quando o
+        # diretório passa a ter um só arquivo vencido), então o inode só é
+        # comparado quando os dois lados o conhecem
+        inodes_known = bool(signature and previous and signature[0] and previous[0])
+        if signature == previous or (
+            signature is not None and previous is not None
+            and not inodes_known and signature[1:] == previous[1:]
+        ):
+            if signature is not None and signature[0]:
+                entry.signature = signature
+            # Arquivo ocioso: aumenta o intervalo gradualmente
+            entry.interval = min(entry.interval * self._backoff, entry.max_interval)
+            entry.next_due = now + entry.interval
+            return
+        
+        entry.signature = signature
+        entry.interval = entry.min_interval
+        entry.next_due = now + entry.interval
+        
+        if signature is None:
+            event = FileEvent('deleted', entry.path)
+        elif previous is None:
+            event = FileEvent('created', entry.path)
+        elif inodes_known and signature[0] != previous[0]:
+            # Inode trocado: outro arquivo foi renomeado sobre o alvo
+            event = FileEvent('moved', '', entry.path)
+        else:
+            event = FileEvent('modified', entry.path)
+        
+        try:
+            entry.handler.dispatch(event)
+        except Exception as e:
+            print(f"Erro ao despachar evento de polling: {e}")
+
+_shared_poller = None
+_shared_poller_lock = threading.Lock()
+
+def get_stat_poller() -> StatPoller:
+    """Retorna o poller compartilhado por todos os monitores"""
+    global _shared_poller
+    with _shared_poller_lock:
+        if _shared_poller is None:
+            _shared_poller = StatPoller()
+        return _shared_poller
 
 class XMLFileMonitor:
-    def __init__(self):
-        """Inicializa o monitor de arquivos XML"""
+    def __init__(self, backend: str = 'auto', min_poll_interval: float = 0.1,
+                 max_poll_interval: float = 2.0, debounce_seconds: float = 0.1):
+        """
+        Inicializa o monitor de arquivos XML
+        
+        Args:
+            backend (str): 'native' (watchdog), 'polling' (stat) ou 'auto',
+                que usa polling em compartilhamentos de rede e containers
+            min_poll_interval (float): Intervalo de polling com o arquivo ativo
+            max_poll_interval (float): Intervalo de polling com o arquivo ocioso
+            debounce_seconds (float): Tempo de agrupamento dos eventos de um salvamento
+        """
+        if backend not in ('auto', 'native', 'polling'):
+            raise ValueError(f"Backend de monitoramento inválido: {backend}")
+        self.backend = backend
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.debounce_seconds = debounce_seconds
         self.observer = None
         self.handler = None
+        # Parser do arquivo monitorado, usado pelos consumidores do callback
         self.parser = XMLParser()
+        self._poller = None
         self._is_monitoring = False
         self._current_file = None
         self._lock = threading.Lock()
@@ -221,55 +584,91 @@ class XMLFileMonitor:
             file_path (str): Caminho do arquivo a ser monitorado
             callback (Callable): Função a ser chamada quando houver alterações
         """
+        self.attach_handler(file_path, XMLFileHandler(
+            file_path=os.path.abspath(file_path),
+            callback=callback,
+            debounce_seconds=self.debounce_seconds
+        ))
+
+    def attach_handler(self, file_path: str, handler: Any) -> None:
+        """
+        Inicia o monitoramento entregando os eventos do backend a um handler próprio
+        
+        Args:
+            file_path (str): Caminho do arquivo a ser monitorado
+            handler: Objeto com dispatch(evento) (ex.: XMLFileHandler ou o
+                gravador de cargas de watcher/replay.py)
+        """
         with self._lock:
             if self._is_monitoring:
-                self.stop_monitoring()
+                self._stop_locked()
 
             self._current_file = os.path.abspath(file_path)
-            self.handler = XMLFileHandler(
-                file_path=self._current_file,
-                callback=callback,
-                parser=self.parser
-            )
+            self.handler = handler
             
-            self.observer = Observer()
-            self.observer.schedule(
-                self.handler,
-                path=os.path.dirname(self._current_file),
-                recursive=False
+            use_polling = self.backend == 'polling' or (
+                self.backend == 'auto' and is_network_path(self._current_file)
             )
-            
-            self.observer.start()
+            if use_polling:
+                self._poller = get_stat_poller()
+                self._poller.add(
+                    self._current_file,
+                    self.handler,
+                    min_interval=self.min_poll_interval,
+                    max_interval=self.max_poll_interval
+                )
+            else:
+                from watchdog.observers import Observer
+                self.observer = Observer()
+                self.observer.schedule(
+                    self.handler,
+                    path=os.path.dirname(self._current_file),
+                    recursive=False
+                )
+                self.observer.start()
             self._is_monitoring = True
 
     def stop_monitoring(self) -> None:
         """Para o monitoramento do arquivo"""
         with self._lock:
-            if self.observer:
-                try:
-                    self.observer.stop()
-                    # Define um timeout para evitar bloqueios
-                    self.observer.join(timeout=0.5)
-                    
-                    # Se o observer ainda estiver vivo, force o encerramento
-                    if self.observer.is_alive():
-                        # Em um ambiente de produção, poderíamos logar isso
-                        pass
-                        
-                except Exception:
-                    # Ignora erros ao parar o observer
-                    pass
+            self._stop_locked()
+
+    def _stop_locked(self) -> None:
+        """Para o monitoramento (chamado com o lock adquirido)"""
+        if self._poller and self.handler:
+            self._poller.remove(self._current_file, self.handler)
+        
+        if self.observer:
+            try:
+                self.observer.stop()
+                # Define um timeout para evitar bloqueios
+                self.observer.join(timeout=0.5)
                 
-                # Limpa as referências
-                self.observer = None
-                self.handler = None
-                self._is_monitoring = False
-                self._current_file = None
+                # Se o observer ainda estiver vivo, force o encerramento
+                if self.observer.is_alive():
+                    # Em um ambiente de produção, poderíamos logar isso
+                    pass
+                    
+            except Exception:
+                # Ignora erros ao parar o observer
+                pass
+        
+        # Limpa as referências
+        self.observer = None
+        self._poller = None
+        self.handler = None
+        self._is_monitoring = False
+        self._current_file = None
 
     def is_monitoring(self) -> bool:
         """Retorna True se está monitorando um arquivo"""
         return self._is_monitoring
 
+    @property
+    def uses_polling(self) -> bool:
+        """Retorna True se o arquivo atual é monitorado por polling"""
+        return self._poller is not None
+
     @property
     def current_file(self) -> Optional[str]:
         """Retorna o caminho do arquivo atual sendo monitorado"""
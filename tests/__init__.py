@@ -1 +1,8 @@
-# Sorry, I don't know how to set up a horse project.
\ No newline at end of file
+import os
+import sys
+
+# Os módulos do projeto usam importações absolutas a partir de src
+# (ex.: "from utils.xml_parser import XMLParser"), como em main.py
+_src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
@@ -0,0 +1,142 @@
+import unittest
+import time
+import tempfile
+import shutil
+import threading
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.resource_manager import AsyncLogger, RotatingFileSink, format_log_entry
+
+class TestAsyncLogger(unittest.TestCase):
+    def test_batches_and_fields(self):
+        """Registros chegam em lotes, na ordem, com nível e campos estruturados"""
+        batches = []
+        logger = AsyncLogger(batch_size=50)
+        logger.add_handler(batches.append)
+        for number in range(120):
+            logger.info(f"mensagem {number}", numero=number)
+        logger.shutdown()
+
+        entries = [entry for batch in batches for entry in batch]
+        self.assertEqual([entry['fields']['numero'] for entry in entries], list(range(120)))
+        self.assertTrue(all(len(batch) <= 50 for batch in batches))
+        self.assertEqual(entries[0]['level'], 'INFO')
+        self.assertEqual(logger.dropped, 0)
+
+    def test_min_level(self):
+        batches = []
+        logger = AsyncLogger(level='WARNING')
+        logger.add_handler(batches.append)
+        logger.debug("ignorada")
+        logger.info("ignorada")
+        logger.error("registrada")
+        logger.shutdown()
+        self.assertEqual([entry['message'] for batch in batches for entry in batch], ["registrada"])
+
+    def test_full_queue_drops_and_reports(self):
+        """Com a fila cheia o registro é descartado (sem exceção) e o descarte é informado"""
+        release = threading.Event()
+        batches = []
+
+        def slow_handler(batch):
+            release.wait(2.0)
+            batches.append(batch)
+
+        logger = AsyncLogger(max_queue_size=5, batch_size=1)
+        logger.add_handler(slow_handler)
+        for number in range(50):
+            logger.log(f"mensagem {number}")
+        self.assertGreater(logger.dropped, 0)
+        release.set()
+        logger.shutdown()
+
+        entries = [entry for batch in batches for entry in batch]
+        warnings = [entry for entry in entries if 'dropped' in entry['fields']]
+        self.assertEqual(sum(entry['fields']['dropped'] for entry in warnings), logger.dropped)
+        self.assertEqual(len(entries) - len(warnings) + logger.dropped, 50)
+
+    def test_handler_error_does_not_stop_delivery(self):
+        batches = []
+
+        def broken(batch):
+            raise RuntimeError("falha")
+
+        logger = AsyncLogger()
+        logger.add_handler(broken)
+        logger.add_handler(batches.append)
+        logger.info("ok")
+        logger.shutdown()
+        self.assertEqual(batches[0][0]['message'], "ok")
+
+class TestRotatingFileSink(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'xmlwatcher.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_format(self):
+        line = format_log_entry({'message': 'alterado', 'level': 'INFO', 'timestamp': 0,
+                                 'fields': {'xpath': '/a/b', 'linhas': 2}})
+        self.assertTrue(line.endswith('INFO    alterado xpath="/a/b" linhas=2'))
+
+    def test_writes_through_logger(self):
+        sink = RotatingFileSink(self.path)
+        logger = AsyncLogger()
+        logger.add_handler(sink)
+        logger.info("primeira")
+        logger.warning("segunda", arquivo="dados.xml")
+        logger.shutdown()
+
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('INFO    primeira', lines[0])
+        self.assertIn('WARNING segunda arquivo="dados.xml"', lines[1])
+
+    def test_idle_logger_flushes_last_batch(self):
+        """Sem novos registros, o último lote chega ao arquivo sem esperar o próximo"""
+        sink = RotatingFileSink(self.path, flush_interval=0.2)
+        logger = AsyncLogger()
+        logger.add_handler(sink)
+        try:
+            # O primeiro lote descarrega o buffer; o segundo chega antes de vencer o intervalo
+            time.sleep(0.3)
+            logger.info("primeira")
+            time.sleep(0.05)
+            logger.info("última")
+            deadline = time.time() + 3.0
+            content = ''
+            while 'última' not in content and time.time() < deadline:
+                time.sleep(0.05)
+                with open(self.path, encoding='utf-8') as f:
+                    content = f.read()
+            self.assertIn('INFO    última', content)
+        finally:
+            logger.shutdown()
+
+    def test_rotation_keeps_backup_count(self):
+        sink = RotatingFileSink(self.path, max_bytes=200, backup_count=2)
+        for number in range(40):
+            sink([{'message': f"mensagem {number:03d}", 'level': 'INFO', 'timestamp': 0, 'fields': {}}])
+        sink.close()
+
+        files = sorted(os.listdir(self.temp_dir))
+        self.assertEqual(files, ['xmlwatcher.log', 'xmlwatcher.log.1', 'xmlwatcher.log.2'])
+        self.assertLessEqual(os.path.getsize(self.path + '.1'), 200 + 60)
+
+        # A mensagem mais recente está no arquivo atual (ou acabou de ser rotacionada)
+        with open(self.path, encoding='utf-8') as f:
+            current = f.read()
+        with open(self.path + '.1', encoding='utf-8') as f:
+            previous = f.read()
+        self.assertIn('mensagem 039', current + previous)
+
+if __name__ == '__main__':
+    unittest.main()
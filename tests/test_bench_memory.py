@@ -0,0 +1,46 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Adiciona os diretórios src e benchmarks ao PYTHONPATH
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'benchmarks'))
+
+import bench_memory
+
+class TestBenchMemory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cls.results = bench_memory.run(['flat'], [2000], corpus_dir=temp_dir)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_reports_every_structure(self):
+        structures = {result['structure'] for result in self.results}
+        self.assertTrue(set(bench_memory.STRUCTURES) - set(bench_memory.RSS_STRUCTURES) <= structures)
+        for result in self.results:
+            self.assertEqual(result['elements'], 2000)
+            if result['structure'] not in bench_memory.RSS_STRUCTURES:
+                # Cada estrutura retém ao menos um objeto por elemento
+                self.assertGreater(result['bytes_per_node'], 50, result['structure'])
+
+    def test_within_stored_thresholds(self):
+        """Os limites gravados cobrem a medição atual (regressão de memória falha aqui)"""
+        thresholds = bench_memory.load_thresholds()
+        self.assertIn('flat', thresholds['initial_state'])
+        self.assertEqual(bench_memory.check_thresholds(self.results, thresholds), [])
+
+    def test_regression_is_reported(self):
+        thresholds = bench_memory.updated_thresholds(self.results, {}, margin=0)
+        thresholds['grid_rows']['flat'] /= 2
+        violations = bench_memory.check_thresholds(self.results, thresholds)
+        self.assertEqual(len(violations), 1)
+        self.assertTrue(violations[0].startswith('grid_rows (flat, 2000 nós)'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Adiciona os diretórios src e benchmarks ao PYTHONPATH
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'benchmarks'))
+
+import xml_corpus
+import bench_parser
+from utils.xml_parser import XMLParser
+
+class TestXMLCorpus(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_same_seed_same_document(self):
+        xml_corpus.write_document(self.path('a.xml'), 'wide', 400, seed=7)
+        xml_corpus.write_document(self.path('b.xml'), 'wide', 400, seed=7)
+        xml_corpus.write_document(self.path('c.xml'), 'wide', 400, seed=8)
+        with open(self.path('a.xml'), 'rb') as a, open(self.path('b.xml'), 'rb') as b, \
+                open(self.path('c.xml'), 'rb') as c:
+            first = a.read()
+            self.assertEqual(first, b.read())
+            self.assertNotEqual(first, c.read())
+
+    def test_shapes_parse_to_requested_size(self):
+        """Cada forma gera um XML válido com aproximadamente o número de nós pedido"""
+        for shape in xml_corpus.SHAPES:
+            with self.subTest(shape=shape):
+                path = self.path(f'{shape}.xml')
+                xml_corpus.write_document(path, shape, 2000)
+                elements = XMLParser().parse_file(path)
+                if shape == 'large_text':
+                    expected = 2000 // xml_corpus.LARGE_TEXT_NODE_WEIGHT
+                    self.assertGreaterEqual(len(elements), expected)
+                    self.assertGreater(len(elements[1]['value']), xml_corpus.LARGE_TEXT_SIZE // 2)
+                else:
+                    self.assertGreaterEqual(len(elements), 2000)
+                    self.assertLess(len(elements), 2000 + xml_corpus.DEEP_DEPTH + 1)
+
+    def test_utf16_has_bom(self):
+        path = self.path('utf16.xml')
+        xml_corpus.write_document(path, 'utf16', 100)
+        with open(path, 'rb') as f:
+            self.assertIn(f.read(2), (b'\xff\xfe', b'\xfe\xff'))
+
+    def test_changed_version_differs_only_in_values(self):
+        original = self.path('original.xml')
+        changed = self.path('changed.xml')
+        xml_corpus.write_document(original, 'attributes', 1000, changes=0)
+        xml_corpus.write_document(changed, 'attributes', 1000, changes=0.1)
+        parser = XMLParser()
+        parser.parse_file_and_get_changes(original)
+        data, changes, _ = parser.parse_file_and_get_changes(changed)
+        self.assertGreater(len(changes), 0)
+        self.assertTrue(all(change.get('change_type') == 'modified' for change in changes))
+
+class TestBenchParser(unittest.TestCase):
+    def test_run_reports_every_stage(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            results = bench_parser.run(['flat', 'namespaces'], [300], rounds=1, corpus_dir=temp_dir)
+        finally:
+            shutil.rmtree(temp_dir)
+        self.assertEqual(len(results), 2 * len(bench_parser.STAGES))
+        for result in results:
+            self.assertGreaterEqual(result['median_ms'], 0)
+            self.assertGreaterEqual(result['elements'], 300)
+        self.assertEqual({result['stage'] for result in results}, set(bench_parser.STAGES))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import threading
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.resource_manager import Cache, ResourceManager
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCache(unittest.TestCase):
+    def test_lru_eviction_by_entries(self):
+        cache = Cache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'a' passa a ser o mais recente
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_byte_limit(self):
+        cache = Cache(max_bytes=100, sizeof=len)
+        cache.put('a', 'x' * 40)
+        cache.put('b', 'x' * 40)
+        cache.put('c', 'x' * 40)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.stats()['bytes'], 80)
+
+        # Valor maior que o cache inteiro não é armazenado nem descarta os demais
+        cache.put('d', 'x' * 200)
+        self.assertNotIn('d', cache)
+        self.assertEqual(len(cache), 2)
+
+        # Substituir uma chave ajusta a contagem de bytes
+        cache.put('b', 'x' * 10)
+        self.assertEqual(cache.stats()['bytes'], 50)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = Cache(ttl=1.0, clock=clock)
+        cache.put('a', 1)
+        clock.now = 0.5
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 1.0
+        self.assertIsNone(cache.get('a'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 1, 1))
+
+        cache.put('b', 2)
+        cache.put('c', 3)
+        clock.now = 5.0
+        self.assertEqual(cache.purge_expired(), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_none_is_a_valid_value(self):
+        cache = Cache()
+        calls = []
+        factory = lambda: calls.append(1)  # retorna None
+        cache.get_or_create('a', factory)
+        cache.get_or_create('a', factory)
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_access(self):
+        cache = Cache(max_entries=50)
+
+        def worker(offset):
+            for number in range(2000):
+                key = (offset + number) % 80
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertLessEqual(stats['entries'], 50)
+        self.assertEqual(stats['hits'] + stats['misses'], 8000)
+
+class TestResourceManager(unittest.TestCase):
+    def test_get_resource_does_not_deadlock(self):
+        """A limpeza roda sem segurar o lock do acesso (antes travava)"""
+        class Counter(ResourceManager):
+            def __init__(self):
+                super().__init__(ttl=0)
+                self.created = 0
+
+            def _create_resource(self, key):
+                self.created += 1
+                return key.upper()
+
+        manager = Counter()
+        self.assertEqual(manager.get_resource('a'), 'A')
+        manager._cleanup()
+        self.assertEqual(manager.get_resource('a'), 'A')
+        self.assertEqual(manager.created, 2)
+
+if __name__ == '__main__':
+    unittest.main()
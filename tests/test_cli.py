@@ -0,0 +1,100 @@
+import unittest
+import tempfile
+import shutil
+import subprocess
+import json
+import sys
+import os
+import time
+import threading
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+import cli
+
+class TestHeadlessCLI(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_path = self.write_xml('old.xml', '<root><item><name>A</name><price>1</price></item></root>')
+        self.new_path = self.write_xml('new.xml', '<root><item><name>B</name></item><extra>x</extra></root>')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_xml(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def read_records(self, path):
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_headless_imports(self):
+        """O caminho headless não importa módulos de GUI ou exclusivos do Windows"""
+        code = (
+            "import sys; sys.path.insert(0, 'src'); import cli; "
+            "bad = [m for m in ('tkinter', 'winsound', 'gui') if m in sys.modules]; "
+            "print(','.join(bad))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=project_root,
+            capture_output=True, text=True, timeout=30
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_diff_subcommand(self):
+        """python -m src.cli diff emite uma linha JSON por alteração"""
+        result = subprocess.run(
+            [sys.executable, '-m', 'src.cli', 'diff', self.old_path, self.new_path],
+            cwd=project_root, capture_output=True, text=True, timeout=30
+        )
+        self.assertEqual(result.returncode, 1, result.stderr)
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        by_xpath = {r['xpath']: r for r in records}
+
+        self.assertEqual(by_xpath['/root/item/name']['type'], 'modified')
+        self.assertEqual(by_xpath['/root/item/name']['new_value'], 'B')
+        self.assertEqual(by_xpath['/root/item/price']['type'], 'removed')
+        self.assertEqual(by_xpath['/root/extra']['type'], 'added')
+
+    def test_diff_identical_files(self):
+        """Arquivos iguais não geram registros e retornam código 0"""
+        output = os.path.join(self.temp_dir, 'out.jsonl')
+        self.assertEqual(cli.run_diff(self.old_path, self.old_path, output), 0)
+        self.assertEqual(self.read_records(output), [])
+
+    def test_watch_streams_changes(self):
+        """O modo watch grava as alterações incrementais no arquivo de saída"""
+        output = os.path.join(self.temp_dir, 'out.jsonl')
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=cli.run_watch,
+            args=([self.old_path],),
+            kwargs={'output': output, 'flush_interval': 0.05, 'stop_event': stop_event}
+        )
+        thread.start()
+        try:
+            time.sleep(0.3)
+            self.write_xml('old.xml', '<root><item><name>A</name><price>2</price></item></root>')
+
+            deadline = time.time() + 3.0
+            records = []
+            while time.time() < deadline and not records:
+                time.sleep(0.05)
+                records = self.read_records(output)
+        finally:
+            stop_event.set()
+            thread.join(5.0)
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['xpath'], '/root/item/price')
+        self.assertEqual(records[0]['old_value'], '1')
+        self.assertEqual(records[0]['new_value'], '2')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.config_service import ConfigService, default_settings
+
+class TestConfigService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'settings.ini')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, content, mtime=None):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if mtime is not None:
+            # Garante uma assinatura diferente mesmo com mtime de baixa resolução
+            os.utime(self.path, (mtime, mtime))
+
+    def test_missing_file_uses_defaults(self):
+        """Sem arquivo, o snapshot traz os padrões tipados do esquema"""
+        service = ConfigService(self.path)
+        self.assertIs(service.get('Sound', 'enabled'), True)
+        self.assertEqual(service.get('Sound', 'frequency'), 1000)
+        self.assertEqual(service.get('Log', 'max_lines'), 2000)
+        self.assertEqual(service.get('Watch', 'debounce'), 0.1)
+        self.assertEqual(service.get('Outra', 'opcao', 'x'), 'x')
+
+    def test_typed_values(self):
+        """Valores conhecidos são convertidos; inválidos voltam ao padrão"""
+        self.write("[Sound]\nenabled = false\nfrequency = 440\nduration = abc\n[Extra]\nnome = valor\n")
+        service = ConfigService(self.path)
+        self.assertIs(service.get('Sound', 'enabled'), False)
+        self.assertEqual(service.get('Sound', 'frequency'), 440)
+        self.assertEqual(service.get('Sound', 'duration'), 100)
+        self.assertEqual(service.get('Extra', 'nome'), 'valor')
+
+    def test_reload_once_per_change(self):
+        """O arquivo só é relido quando muda, e os assinantes recebem o snapshot novo"""
+        self.write("[Sound]\nfrequency = 440\n", mtime=1000)
+        service = ConfigService(self.path)
+        received = []
+        unsubscribe = service.subscribe(received.append)
+
+        self.assertFalse(service.reload())
+        self.assertEqual(received, [])
+
+        self.write("[Sound]\nfrequency = 880\n", mtime=2000)
+        self.assertTrue(service.reload())
+        self.assertFalse(service.reload())
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].get('Sound', 'frequency'), 880)
+        self.assertIs(service.snapshot, received[0])
+
+        # Arquivo regravado sem alteração de conteúdo não publica nada
+        self.write("[Sound]\nfrequency = 880\n", mtime=3000)
+        self.assertFalse(service.reload())
+
+        unsubscribe()
+        self.write("[Sound]\nfrequency = 220\n", mtime=4000)
+        self.assertTrue(service.reload())
+        self.assertEqual(len(received), 1)
+
+    def test_snapshot_is_read_only(self):
+        service = ConfigService(self.path)
+        with self.assertRaises(TypeError):
+            service.snapshot.section('Sound')['frequency'] = 1
+
+    def test_watch_options_per_file(self):
+        """Seções [Watch:<padrão>] sobrescrevem a seção [Watch] para os arquivos que casam"""
+        self.write(
+            "[Watch]\ndebounce = 0.2\n"
+            "[Watch:*.xml]\nmax_poll_interval = 5\n"
+            "[Watch:big*.xml]\ndebounce = 1.5\n"
+        )
+        snapshot = ConfigService(self.path).snapshot
+
+        options = snapshot.watch_options(os.path.join('dados', 'big_file.xml'))
+        self.assertEqual(options['debounce'], 1.5)
+        self.assertEqual(options['max_poll_interval'], 5.0)
+        self.assertEqual(options['min_poll_interval'], 0.1)
+
+        options = snapshot.watch_options('outro.txt')
+        self.assertEqual(options['debounce'], 0.2)
+        self.assertEqual(options['max_poll_interval'], 2.0)
+        self.assertIs(snapshot.watch_options('outro.txt'), options)
+
+    def test_save_round_trip(self):
+        """save preserva as demais opções e publica o resultado"""
+        self.write("[Log]\nmax_lines = 50\n")
+        service = ConfigService(self.path)
+        received = []
+        service.subscribe(received.append)
+
+        service.save({'Sound': {'enabled': False, 'frequency': 300}})
+        self.assertEqual(len(received), 1)
+        self.assertIs(service.get('Sound', 'enabled'), False)
+        self.assertEqual(service.get('Sound', 'frequency'), 300)
+        self.assertEqual(service.get('Log', 'max_lines'), 50)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+        # Outro serviço lendo o mesmo arquivo vê os mesmos valores
+        self.assertEqual(ConfigService(self.path).snapshot, service.snapshot)
+
+    def test_as_strings_matches_defaults(self):
+        self.assertEqual(ConfigService(self.path).snapshot.as_strings(), default_settings())
+
+if __name__ == '__main__':
+    unittest.main()
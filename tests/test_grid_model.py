@@ -0,0 +1,171 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.grid_model import GridRowModel, GridDeltaBuilder, ChangesRowSource, MAX_DISPLAY_CHARS
+
+def element(xpath, value, modified=False, initial=None, line=1):
+    data = {'xpath': xpath, 'tag': xpath.rsplit('/', 1)[-1], 'value': value,
+            'parent_number': line, 'modified': modified}
+    if initial is not None:
+        data['initial_value'] = initial
+    return data
+
+class TestGridRowModel(unittest.TestCase):
+    def setUp(self):
+        self.model = GridRowModel()
+        self.model.load([
+            element('/root/a', '1'),
+            element('/root/b', '2', modified=True, initial='1'),
+            element('/root/c', 'x' * (MAX_DISPLAY_CHARS * 2)),
+        ])
+
+    def test_row_values_and_positions(self):
+        """O modelo expõe valores por posição e localiza linhas por xpath"""
+        self.assertEqual(len(self.model), 3)
+        self.assertEqual(self.model.row_values(1), (1, 'b', '1', '2', '/root/b'))
+        self.assertEqual(self.model.position_of('/root/c'), 2)
+        self.assertIsNone(self.model.position_of('/root/z'))
+        self.assertEqual(self.model.changed_positions(), [1])
+
+    def test_long_values_are_truncated(self):
+        """Valores longos são truncados apenas na exibição"""
+        values = self.model.row_values(2)
+        self.assertEqual(len(values[3]), MAX_DISPLAY_CHARS)
+        self.assertEqual(len(self.model.rows[2].current), MAX_DISPLAY_CHARS * 2)
+
+    def test_tags_follow_highlight(self):
+        """Linhas destacadas recebem a tag de resultado de busca"""
+        self.model.highlighted = {'/root/b'}
+        self.assertEqual(self.model.row_tags(1), ('changed', 'search_result'))
+        self.assertEqual(self.model.row_tags(0), ())
+        # Recarregar descarta destaques de linhas que deixaram de existir
+        self.model.highlighted = {'/root/a', '/root/gone'}
+        self.model.load([element('/root/a', '1')])
+        self.assertEqual(self.model.highlighted, {'/root/a'})
+
+class TestGridDelta(unittest.TestCase):
+    def setUp(self):
+        self.initial = [element('/root', ''), element('/root/a', '1'), element('/root/c', '3')]
+        self.model = GridRowModel()
+        self.model.load(self.initial)
+        self.builder = GridDeltaBuilder()
+        self.builder.reset(self.initial)
+
+    def apply(self, data, last_changes):
+        delta, version = self.builder.build(data, last_changes)
+        self.assertIsNotNone(delta)
+        self.model.apply_delta(delta)
+        self.builder.commit(version)
+        return delta
+
+    def test_delta_touches_only_changed_rows(self):
+        """Apenas as linhas do diff são atualizadas; as demais mantêm o objeto"""
+        untouched = self.model.rows[2]
+        data = [element('/root', ''), element('/root/a', '2', modified=True, initial='1'), element('/root/c', '3')]
+        delta = self.apply(data, [{'xpath': '/root/a'}])
+        self.assertEqual(len(delta['upserts']), 1)
+        self.assertIs(self.model.rows[2], untouched)
+        self.assertEqual(self.model.row_values(1)[2:4], ('1', '2'))
+        self.assertEqual(self.model.changed_positions(), [1])
+
+    def test_added_and_removed_rows(self):
+        """Linhas novas entram após o xpath anterior; linhas que somem saem do modelo"""
+        data = [element('/root', ''), element('/root/a', '1'),
+                element('/root/b', '2', modified=True), element('/root/c', '3')]
+        self.apply(data, [{'xpath': '/root/b'}])
+        self.assertEqual([row.xpath for row in self.model.rows], ['/root', '/root/a', '/root/b', '/root/c'])
+        self.assertEqual(self.model.position_of('/root/c'), 3)
+        
+        self.apply(self.initial, [{'xpath': '/root/b'}])
+        self.assertEqual([row.xpath for row in self.model.rows], ['/root', '/root/a', '/root/c'])
+        self.assertEqual(self.model.changed_positions(), [])
+
+    def test_many_inserts_at_same_spot(self):
+        """Inserções repetidas no mesmo ponto renumeram as chaves sem perder a ordem"""
+        data = list(self.initial)
+        for i in range(40):
+            data.insert(2, element(f'/root/n{i}', str(i), modified=True))
+            self.apply(data, [{'xpath': f'/root/n{i}'}])
+        self.assertEqual([row.xpath for row in self.model.rows], [e['xpath'] for e in data])
+        for position, row in enumerate(self.model.rows):
+            self.assertEqual(self.model.position_of(row.xpath), position)
+
+    def test_change_navigation_survives_updates(self):
+        """A navegação continua do ponto atual quando a lista de alterações muda"""
+        data = [element('/root', ''), element('/root/a', '2', modified=True, initial='1'),
+                element('/root/c', '4', modified=True, initial='3')]
+        self.apply(data, [{'xpath': '/root/a'}, {'xpath': '/root/c'}])
+        self.assertEqual(self.model.changed_count(), 2)
+        
+        current = self.model.step_change(None, 'down')
+        self.assertEqual(current.xpath, '/root/a')
+        self.assertEqual(self.model.step_change(current.order, 'down').xpath, '/root/c')
+        self.assertEqual(self.model.step_change(current.order, 'up').xpath, '/root/c')
+        
+        # A alteração atual é revertida: o próximo passo parte da mesma posição
+        data[1] = element('/root/a', '1', initial='1')
+        self.apply(data, [{'xpath': '/root/a'}])
+        self.assertEqual(self.model.changed_count(), 1)
+        self.assertEqual(self.model.step_change(current.order, 'down').xpath, '/root/c')
+        self.assertEqual(self.model.change_number(self.model.index['/root/c']), 0)
+
+    def test_reorder_requires_full_reload(self):
+        """Reordenações que o diff por xpath não enxerga pedem recarga completa"""
+        data = [element('/root', ''), element('/root/c', '3'), element('/root/a', '1')]
+        self.assertIsNone(self.builder.build(data, [])[0])
+
+    def test_deltas_are_cumulative_until_committed(self):
+        """Um delta inclui as versões ainda não aplicadas, que podem ser descartadas"""
+        v1 = [element('/root', ''), element('/root/a', '2', modified=True, initial='1'), element('/root/c', '3')]
+        v2 = [element('/root', ''), element('/root/a', '2', modified=True, initial='1'),
+              element('/root/b', 'x', modified=True), element('/root/c', '3')]
+        self.builder.build(v1, [{'xpath': '/root/a'}])
+        delta, version = self.builder.build(v2, [{'xpath': '/root/b'}])
+        self.assertEqual([e['xpath'] for e, _ in delta['upserts']], ['/root/a', '/root/b'])
+        
+        self.model.apply_delta(delta)
+        self.builder.commit(version)
+        delta, _ = self.builder.build(v2, [])
+        self.assertEqual(delta, {'upserts': [], 'removals': []})
+
+class TestChangesRowSource(unittest.TestCase):
+    def setUp(self):
+        self.initial = [element('/root', ''), element('/root/a', '1'), element('/root/b', '2'), element('/root/c', '3')]
+        self.model = GridRowModel()
+        self.model.load(self.initial)
+        self.builder = GridDeltaBuilder()
+        self.builder.reset(self.initial)
+        self.changes = ChangesRowSource(self.model)
+
+    def apply(self, data, last_changes):
+        delta, version = self.builder.build(data, last_changes)
+        self.model.apply_delta(delta)
+        self.builder.commit(version)
+
+    def test_view_follows_diff(self):
+        """A visão contém só as linhas alteradas, na ordem do documento, e acompanha os deltas"""
+        self.assertEqual(len(self.changes), 0)
+        data = [element('/root', ''), element('/root/a', '1'),
+                element('/root/b', '9', modified=True, initial='2'), element('/root/c', '3'),
+                element('/root/d', '4', modified=True)]
+        self.apply(data, [{'xpath': '/root/b'}, {'xpath': '/root/d'}])
+        self.assertEqual(len(self.changes), 2)
+        self.assertEqual(self.changes.row_values(0), (1, 'b', '2', '9', '/root/b'))
+        self.assertEqual(self.changes.row_values(1)[4], '/root/d')
+        self.assertEqual(self.changes.row_tags(1), ('changed',))
+        self.assertEqual(self.changes.position_of('/root/d'), 1)
+        self.assertIsNone(self.changes.position_of('/root/a'))
+
+        # Reverter uma alteração a retira da visão
+        data[2] = element('/root/b', '2')
+        self.apply(data, [{'xpath': '/root/b'}])
+        self.assertEqual(len(self.changes), 1)
+        self.assertEqual(self.changes.position_of('/root/d'), 0)
+
+if __name__ == '__main__':
+    unittest.main()
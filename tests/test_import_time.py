@@ -0,0 +1,83 @@
+import unittest
+import subprocess
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_path = os.path.join(project_root, 'src')
+
+# Orçamento de importação do caminho headless (cumulativo, em ms).
+# Pode ser ajustado em máquinas lentas via variável de ambiente.
+IMPORT_BUDGET_MS = float(os.environ.get('XMLWATCHER_IMPORT_BUDGET_MS', '100'))
+
+# Módulos que só devem ser carregados no primeiro uso
+DEFERRED_MODULES = ('lxml.etree', 'watchdog.observers', 'watchdog.events', 'tkinter', 'winsound')
+
+def run_python(code, *flags):
+    """Executa um trecho de código em um interpretador novo com src no PYTHONPATH"""
+    return subprocess.run(
+        [sys.executable, *flags, '-c', f"import sys; sys.path.insert(0, {src_path!r}); {code}"],
+        cwd=project_root, capture_output=True, text=True, timeout=60
+    )
+
+def import_time_ms(module, runs=3):
+    """
+    Mede o tempo cumulativo de importação de um módulo com -X importtime
+
+    Returns:
+        float: Menor tempo observado entre as execuções, em milissegundos
+    """
+    best = None
+    for _ in range(runs):
+        result = run_python(f"import {module}", '-X', 'importtime')
+        cumulative = None
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            fields = line.split('|')
+            # A linha sem indentação é a importação de nível mais alto
+            if len(fields) == 3 and fields[2].rstrip() == f" {module}":
+                cumulative = int(fields[1]) / 1000.0
+        if cumulative is None:
+            raise AssertionError(f"Tempo de importação de {module} não encontrado:\n{result.stderr}")
+        best = cumulative if best is None else min(best, cumulative)
+    return best
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_modules_are_deferred(self):
+        """Parser, monitor e CLI não carregam lxml, watchdog nem GUI na importação"""
+        modules = ', '.join(repr(m) for m in DEFERRED_MODULES)
+        result = run_python(
+            "import utils.xml_parser, watcher.xml_monitor, cli; "
+            f"print(','.join(m for m in ({modules}) if m in sys.modules))"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_gui_package_does_not_load_tkinter(self):
+        """Importar o pacote gui não carrega tkinter até que um widget seja usado"""
+        result = run_python("import gui; print('tkinter' in sys.modules)")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_lxml_loaded_on_first_parse(self):
+        """lxml é importado no primeiro parse"""
+        result = run_python(
+            "import tempfile; from utils.xml_parser import XMLParser; "
+            "f = tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False); "
+            "f.write('<root><a>1</a></root>'); f.close(); "
+            "XMLParser().parse_file(f.name); print('lxml.etree' in sys.modules)"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'True')
+
+    def test_headless_import_budget(self):
+        """A importação do caminho headless fica dentro do orçamento"""
+        elapsed = import_time_ms('cli')
+        self.assertLess(
+            elapsed, IMPORT_BUDGET_MS,
+            f"Importar cli levou {elapsed:.1f} ms (orçamento: {IMPORT_BUDGET_MS:.0f} ms)"
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.log_model import LogModel
+
+class TestLogModel(unittest.TestCase):
+    def test_lines_are_flushed_in_one_batch(self):
+        """As linhas acumuladas entre quadros saem em um único bloco de texto"""
+        log = LogModel(max_lines=100)
+        for i in range(3):
+            log.append(f"linha {i}")
+        self.assertTrue(log.has_pending())
+        text, trim = log.take_batch()
+        self.assertEqual(text, "linha 0\nlinha 1\nlinha 2\n")
+        self.assertEqual(trim, 0)
+        self.assertFalse(log.has_pending())
+        self.assertEqual(log.take_batch(), ('', 0))
+
+    def test_ring_buffer_and_bulk_trim(self):
+        """10k linhas em um quadro não passam do limite e o excesso é removido em bloco"""
+        log = LogModel(max_lines=100)
+        for i in range(50):
+            log.append(f"antiga {i}")
+        log.take_batch()
+        
+        for i in range(10000):
+            log.append(f"nova {i}")
+        text, trim = log.take_batch()
+        lines = text.splitlines()
+        self.assertEqual(len(lines), 101)
+        self.assertIn("9900 linha(s) omitida(s)", lines[0])
+        self.assertEqual(lines[-1], "nova 9999")
+        # 50 antigas + 101 novas no widget: remove o necessário para voltar a 100
+        self.assertEqual(trim, 51)
+        self.assertEqual(len(log), 100)
+        self.assertEqual(log.skipped, 9900)
+
+    def test_history_file_keeps_everything(self):
+        """O histórico em arquivo guarda todas as linhas, inclusive as omitidas do widget"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'history.log')
+            log = LogModel(max_lines=10, history_path=path)
+            for i in range(25):
+                log.append(f"linha {i}")
+            log.take_batch()
+            log.clear()
+            log.append("depois")
+            log.take_batch()
+            with open(path, encoding='utf-8') as f:
+                history = f.read().splitlines()
+            self.assertEqual(history, [f"linha {i}" for i in range(25)] + ["depois"])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    def test_multiline_messages_count_each_line(self):
+        """Uma mensagem com várias linhas ocupa várias linhas do limite"""
+        log = LogModel(max_lines=10)
+        log.append("erro\n" + "\n".join(f"  detalhe {i}" for i in range(14)))
+        text, trim = log.take_batch()
+        lines = text.splitlines()
+        self.assertEqual(len(log), 10)
+        self.assertEqual(log.total, 15)
+        self.assertEqual(log.skipped, 5)
+        self.assertIn("5 linha(s) omitida(s)", lines[0])
+        self.assertEqual(lines[1:], [f"  detalhe {i}" for i in range(4, 14)])
+
+    def test_detail_is_computed_only_when_formatted(self):
+        """O complemento só é calculado para linhas que chegam ao widget"""
+        calls = []
+
+        def detail(i):
+            return lambda: calls.append(i) or f"etapa {i}"
+
+        log = LogModel(max_lines=2)
+        for i in range(5):
+            log.append(f"linha {i}", detail(i))
+        self.assertEqual(calls, [])
+        text, _ = log.take_batch()
+        self.assertEqual(calls, [3, 4])
+        self.assertEqual(text.splitlines()[1:], ["linha 3 [etapa 3]", "linha 4 [etapa 4]"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import tempfile
+import shutil
+import urllib.request
+import json
+import gc
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.metrics import MetricsRegistry, MetricsServer, get_registry, process_rss_bytes
+from utils.resource_manager import Cache
+from utils.xml_parser import XMLParser
+
+class StatsSource:
+    def __init__(self, **stats):
+        self.values = stats
+
+    def stats(self):
+        return dict(self.values)
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_with_labels(self):
+        counter = self.registry.counter('test_events_total', "Eventos")
+        counter.inc(type='modified')
+        counter.inc(2, type='modified')
+        counter.inc(type='created')
+        self.assertIs(self.registry.counter('test_events_total', "Eventos"), counter)
+        self.assertEqual(counter.value(type='modified'), 3)
+        self.assertEqual(self.registry.snapshot()['test_events_total'], {
+            '{type="created"}': 1, '{type="modified"}': 3
+        })
+
+    def test_prometheus_text(self):
+        self.registry.counter('test_total', "Total").inc(5)
+        histogram = self.registry.histogram('test_seconds', "Duração", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+        self.registry.gauge('test_depth', "Fila", lambda: {(('queue', 'a"b'),): 7})
+        lines = self.registry.render_prometheus().splitlines()
+        self.assertIn('# TYPE test_total counter', lines)
+        self.assertIn('test_total 5', lines)
+        self.assertIn('# TYPE test_seconds histogram', lines)
+        # Contagens cumulativas por limite
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count 3', lines)
+        self.assertIn('test_seconds_sum 3.55', lines)
+        self.assertIn('test_depth{queue="a\\"b"} 7', lines)
+
+    def test_stats_sources_are_summed_and_weak(self):
+        first = StatsSource(hits=3, misses=1, name='ignorado')
+        second = StatsSource(hits=1, misses=3)
+        self.registry.register_stats('cache', first, cache='elements')
+        self.registry.register_stats('cache', second, cache='elements')
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['xmlwatcher_cache_hits_total'], {'{cache="elements"}': 4})
+        self.assertEqual(snapshot['xmlwatcher_cache_hit_ratio'], {'{cache="elements"}': 0.5})
+        self.assertNotIn('xmlwatcher_cache_name', snapshot)
+
+        del first, second
+        gc.collect()
+        self.assertNotIn('xmlwatcher_cache_hits_total', self.registry.snapshot())
+
+    def test_stats_sources_types_and_help(self):
+        """Totais monotônicos viram contadores _total e tamanhos viram gauges, todos com HELP"""
+        source = StatsSource(hits=1, misses=1, entries=2, custom=3)
+        self.registry.register_stats('cache', source)
+        lines = self.registry.render_prometheus().splitlines()
+        self.assertIn('# TYPE xmlwatcher_cache_hits_total counter', lines)
+        self.assertIn('xmlwatcher_cache_hits_total 1', lines)
+        self.assertIn('# TYPE xmlwatcher_cache_entries gauge', lines)
+        self.assertIn('# TYPE xmlwatcher_cache_hit_ratio gauge', lines)
+        self.assertIn('# TYPE xmlwatcher_cache_custom gauge', lines)
+        types = [line.split()[2] for line in lines if line.startswith('# TYPE')]
+        helps = [line.split()[2] for line in lines if line.startswith('# HELP')]
+        self.assertEqual(types, helps)
+
+    def test_failing_gauge_is_skipped(self):
+        self.registry.gauge('test_broken', "Falha", lambda: 1 / 0)
+        self.assertEqual(self.registry.snapshot()['test_broken'], {})
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'data.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, value):
+        with open(self.file_path, 'w') as f:
+            f.write(f'<?xml version="1.0"?><root><a>{value}</a><b>x</b></root>')
+
+    def test_parser_metrics(self):
+        registry = get_registry()
+        parses = registry.counter('xmlwatcher_parses_total', '')
+        parse_bytes = registry.counter('xmlwatcher_parse_bytes_total', '')
+        before = (parses.value(), parse_bytes.value())
+
+        parser = XMLParser()
+        self.write(1)
+        parser.parse_file_and_get_changes(self.file_path)
+        self.write(2)
+        parser.parse_file_and_get_changes(self.file_path)
+
+        self.assertEqual(parses.value() - before[0], 2)
+        self.assertEqual(parse_bytes.value() - before[1], 2 * os.path.getsize(self.file_path))
+        snapshot = registry.snapshot()
+        self.assertGreaterEqual(snapshot['xmlwatcher_diff_changes']['']['count'], 1)
+        self.assertIn('{cache="elements"}', snapshot['xmlwatcher_cache_entries'])
+
+    def test_process_rss(self):
+        rss = process_rss_bytes()
+        if rss is None:
+            self.skipTest("RSS indisponível nesta plataforma")
+        self.assertGreater(rss, 1024 * 1024)
+
+class TestMetricsServer(unittest.TestCase):
+    def test_endpoint(self):
+        registry = MetricsRegistry()
+        registry.counter('test_requests_total', "Requisições").inc(4)
+        cache = Cache(max_entries=2)
+        cache.get('ausente')
+        registry.register_stats('cache', cache, cache='search')
+
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            self.assertNotEqual(server.port, 0)
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+                text = response.read().decode('utf-8')
+            self.assertIn('test_requests_total 4', text)
+            self.assertIn('xmlwatcher_cache_misses_total{cache="search"} 1', text)
+
+            with urllib.request.urlopen(server.url + '.json', timeout=5) as response:
+                self.assertEqual(json.loads(response.read())['test_requests_total'], 4)
+        finally:
+            server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import tempfile
+import shutil
+import pstats
+import threading
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.profiling import (
+    CycleProfiler, parse_modes, profile_options,
+    PROFILE_ENV, PROFILE_EVERY_ENV, PROFILE_DIR_ENV
+)
+
+def allocate():
+    return [str(number) * 10 for number in range(5000)]
+
+class TestProfileOptions(unittest.TestCase):
+    def test_parse_modes(self):
+        self.assertEqual(parse_modes(''), ())
+        self.assertEqual(parse_modes('off'), ())
+        self.assertEqual(parse_modes('1'), ('cpu',))
+        self.assertEqual(parse_modes('memory, cpu'), ('cpu', 'memory'))
+        self.assertEqual(parse_modes('all'), ('cpu', 'memory'))
+        with self.assertRaises(ValueError):
+            parse_modes('cpu,disk')
+
+    def test_environment_overrides_settings(self):
+        settings = {'mode': 'cpu', 'every': 50, 'cycles': 3, 'directory': '/tmp/a'}
+        options = profile_options(settings, {PROFILE_ENV: 'memory', PROFILE_EVERY_ENV: '5', PROFILE_DIR_ENV: '/tmp/b'})
+        self.assertEqual(options, {'modes': ('memory',), 'every': 5, 'cycles': 3, 'directory': '/tmp/b'})
+
+    def test_invalid_value_disables(self):
+        self.assertEqual(profile_options({'mode': 'cpu'}, {PROFILE_EVERY_ENV: 'x'}), {'modes': ()})
+
+class TestCycleProfiler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def files(self, extension):
+        return sorted(name for name in os.listdir(self.temp_dir) if name.endswith(extension)) \
+            if os.path.isdir(self.temp_dir) else []
+
+    def test_disabled_writes_nothing(self):
+        profiler = CycleProfiler(directory=self.temp_dir)
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(profiler.run('data.xml', lambda: 42), 42)
+        self.assertEqual(profiler.seen, 0)
+        self.assertEqual(self.files('.txt'), [])
+
+    def test_samples_one_in_every_k_up_to_limit(self):
+        profiler = CycleProfiler(modes=('cpu',), every=3, cycles=2, directory=self.temp_dir)
+        for _ in range(12):
+            profiler.run('data.xml', allocate)
+        # Ciclos 3 e 6 medidos; depois do limite o profiler para de contar
+        self.assertEqual(profiler.captured, 2)
+        self.assertEqual(profiler.seen, 6)
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(len(self.files('.prof')), 2)
+        self.assertEqual(len(self.files('.txt')), 2)
+
+        stats = pstats.Stats(os.path.join(self.temp_dir, self.files('.prof')[0]))
+        self.assertTrue(any(name == 'allocate' for _, _, name in stats.stats))
+
+    def test_memory_report(self):
+        profiler = CycleProfiler(modes=('memory',), every=1, cycles=1, directory=self.temp_dir)
+        with profiler.cycle('big file.xml'):
+            kept = allocate()
+        self.assertEqual(self.files('.prof'), [])
+        [report] = self.files('.txt')
+        self.assertTrue(report.endswith('-big_file.xml.txt'))
+        with open(os.path.join(self.temp_dir, report), encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('tracemalloc', text)
+        self.assertIn('test_profiling.py', text)
+        self.assertEqual(len(kept), 5000)
+
+    def test_exception_still_dumps_and_propagates(self):
+        profiler = CycleProfiler(modes=('cpu',), every=1, cycles=0, directory=self.temp_dir)
+        with self.assertRaises(RuntimeError):
+            with profiler.cycle('data.xml'):
+                raise RuntimeError("falha")
+        self.assertEqual(len(self.files('.txt')), 1)
+        # O próximo ciclo pode ser medido normalmente
+        profiler.run('data.xml', allocate)
+        self.assertEqual(len(self.files('.txt')), 2)
+
+    def test_one_cycle_at_a_time(self):
+        """Ciclos concorrentes sorteados enquanto outro é medido não são medidos"""
+        profiler = CycleProfiler(modes=('cpu',), every=1, cycles=0, directory=self.temp_dir)
+        inside = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            inside.set()
+            release.wait(5.0)
+
+        thread = threading.Thread(target=profiler.run, args=('a.xml', slow))
+        thread.start()
+        self.assertTrue(inside.wait(5.0))
+        profiler.run('b.xml', allocate)
+        release.set()
+        thread.join()
+        self.assertEqual(profiler.captured, 1)
+        self.assertEqual(len(self.files('.txt')), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import threading
+import tempfile
+import shutil
+from types import SimpleNamespace
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.render_scheduler import RenderScheduler
+from gui.grid_view import XMLGridView
+from gui.view_model import GridViewModel
+from utils.tracing import TracedSubmitter
+from utils.worker_pool import WorkerPool
+from utils.xml_parser import XMLParser
+
+class FakeWidget:
+    """Registra as chamadas a after sem depender de um display"""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, ident):
+        pass
+
+    def run(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, func in scheduled:
+            func()
+
+class TestRenderScheduler(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.rendered = []
+        self.scheduler = RenderScheduler(
+            self.widget,
+            lambda update, versions: self.rendered.append((update, versions)),
+            merge=lambda pending, update: pending + update,
+            max_fps=30
+        )
+
+    def test_updates_between_frames_are_folded(self):
+        """Várias versões entre dois quadros geram um único render"""
+        threads = [threading.Thread(target=self.scheduler.submit, args=([i],)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(self.widget.scheduled), 1)
+        self.widget.run()
+        self.assertEqual(len(self.rendered), 1)
+        update, versions = self.rendered[0]
+        self.assertEqual(versions, 20)
+        self.assertEqual(sorted(update), list(range(20)))
+        self.assertEqual(self.scheduler.stats(), {'frames': 1, 'folded': 19, 'pending': 0})
+
+    def test_frame_rate_is_bounded(self):
+        """O quadro seguinte respeita o intervalo mínimo entre quadros"""
+        self.scheduler.submit([1])
+        self.assertEqual(self.widget.scheduled[0][0], 0)
+        self.widget.run()
+        
+        self.scheduler.submit([2])
+        delay = self.widget.scheduled[0][0]
+        self.assertGreater(delay, 0)
+        self.assertLessEqual(delay, 34)
+
+    def test_cancel_discards_pending(self):
+        """cancel descarta a atualização pendente"""
+        self.scheduler.submit([1])
+        self.scheduler.cancel()
+        self.assertFalse(self.scheduler.flush())
+        self.widget.run()
+        self.assertEqual(self.rendered, [])
+
+def grid_update(data, delta=None, version=None, last_changes=(), generation=1):
+    return {'generation': generation, 'data': data, 'delta': delta, 'version': version,
+            'last_changes': list(last_changes), 'messages': [], 'processing_info': None}
+
+class TestGridUpdateMerge(unittest.TestCase):
+    def merge(self, pending, update):
+        # _merge_updates não depende do estado da janela
+        return XMLGridView._merge_updates(None, pending, update)
+
+    def test_pending_reload_stays_full(self):
+        """Um delta sobre uma recarga pendente vira recarga completa com os dados mais novos"""
+        reload = grid_update(['v1'])
+        delta = grid_update(['v2'], delta={'upserts': [], 'removals': []}, version=3, last_changes=[{'xpath': '/a'}])
+        merged = self.merge(reload, delta)
+        self.assertIsNone(merged['delta'])
+        self.assertEqual(merged['data'], ['v2'])
+        self.assertEqual(merged['version'], 3)
+        self.assertEqual(merged['last_changes'], [{'xpath': '/a'}])
+
+    def test_newer_delta_replaces_pending_delta(self):
+        first = grid_update(['v1'], delta={'upserts': [1]}, version=1, last_changes=[{'xpath': '/a'}])
+        second = grid_update(['v2'], delta={'upserts': [1, 2]}, version=2)
+        merged = self.merge(first, second)
+        self.assertEqual(merged['delta'], {'upserts': [1, 2]})
+        self.assertEqual(merged['last_changes'], [{'xpath': '/a'}])
+
+class TestGridReload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'data.xml')
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><a>1</a></root>')
+        self.pool = WorkerPool(max_workers=1)
+        self.updates = []
+        self.threads = []
+
+        def submit(update):
+            self.threads.append(threading.current_thread())
+            self.updates.append(update)
+
+        self.view = SimpleNamespace(
+            view_model=GridViewModel(),
+            xml_parser=XMLParser(),
+            _submitter=TracedSubmitter(self.pool),
+            _render_scheduler=SimpleNamespace(submit=submit),
+            bridge=SimpleNamespace(post=lambda fn, *args: fn(*args)),
+            log_message=lambda message, info=None: self.updates.append(message),
+            _reload_pending=set(),
+        )
+
+    def tearDown(self):
+        self.pool.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_reload_runs_on_the_pool_as_full_reload(self):
+        """A releitura roda no pool, redefine o parser e entrega uma recarga completa"""
+        parser = self.view.xml_parser
+        parser.parse_file_and_get_changes(self.file_path)
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><a>2</a></root>')
+        XMLGridView._submit_reload(self.view, self.file_path, "Estado redefinido", "Erro")
+        self.assertIn(self.file_path, self.view._reload_pending)
+        self.assertTrue(self.pool.wait_idle(5.0))
+
+        self.assertEqual(self.view._reload_pending, set())
+        self.assertIsNot(self.threads[0], threading.current_thread())
+        update = self.updates[0]
+        self.assertIsNone(update['delta'])
+        self.assertEqual(update['messages'], ["Estado redefinido"])
+        self.assertEqual([e['value'] for e in update['data'] if e['tag'] == 'a'], ['2'])
+        # O estado relido é a nova linha de base
+        self.assertEqual([e['value'] for e in parser.initial_state if e['tag'] == 'a'], ['2'])
+
+    def test_reload_error_is_logged(self):
+        XMLGridView._submit_reload(self.view, os.path.join(self.temp_dir, 'ausente.xml'), None, "Erro ao abrir arquivo")
+        self.assertTrue(self.pool.wait_idle(5.0))
+        self.assertTrue(self.updates[0].startswith("Erro ao abrir arquivo: "))
+        self.assertIsNone(self.view.xml_parser.initial_state)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import tempfile
+import shutil
+import json
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from watcher.clock import VirtualClock
+from watcher.replay import (
+    MANIFEST_NAME, WorkloadRecorder, WorkloadReplayer, load_workload, write_workload
+)
+from watcher.xml_monitor import FileEvent, XMLFileHandler
+
+def document(value):
+    return f'<?xml version="1.0"?><root><a>{value}</a><b>x</b></root>'.encode()
+
+class TestVirtualClock(unittest.TestCase):
+    def test_timers_fire_in_order_when_advanced(self):
+        clock = VirtualClock(follow_real_time=False)
+        start = clock.monotonic_ns()
+        fired = []
+        clock.call_later(0.2, lambda: fired.append(('b', clock.monotonic_ns() - start)))
+        clock.call_later(0.1, lambda: fired.append(('a', clock.monotonic_ns() - start)))
+        cancelled = clock.call_later(0.15, lambda: fired.append('cancelado'))
+        cancelled.cancel()
+
+        self.assertEqual(clock.advance_to(start + 150_000_000), 1)
+        self.assertEqual(fired, [('a', 100_000_000)])
+        self.assertEqual(clock.monotonic_ns() - start, 150_000_000)
+        self.assertEqual(clock.run_pending(), 1)
+        self.assertEqual(fired[-1], ('b', 200_000_000))
+        self.assertEqual(clock.pending, 0)
+
+    def test_sleep_skips_ahead(self):
+        clock = VirtualClock(follow_real_time=False)
+        start_ns, start_wall = clock.monotonic_ns(), clock.time()
+        clock.sleep(3600)
+        self.assertEqual(clock.monotonic_ns() - start_ns, 3600 * 10**9)
+        self.assertAlmostEqual(clock.time() - start_wall, 3600, places=3)
+
+    def test_handler_debounce_on_virtual_clock(self):
+        """Rajadas são agrupadas pelo debounce sem espera real"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'data.xml')
+            with open(path, 'wb') as f:
+                f.write(document(0))
+            clock = VirtualClock(follow_real_time=False)
+            received = []
+            handler = XMLFileHandler(path, lambda data, info: received.append(info), 0.5, clock=clock)
+            with open(path, 'wb') as f:
+                f.write(document(1) + b' ')
+            for _ in range(3):
+                handler.dispatch(FileEvent('modified', path))
+            clock.run_pending()
+            self.assertEqual(len(received), 1)
+            self.assertEqual(received[0]['events_coalesced'], 3)
+            # Debounce exato no relógio virtual
+            self.assertEqual(received[0]['trace'].durations_ms()['debounce'], 500.0)
+        finally:
+            shutil.rmtree(temp_dir)
+
+class TestWorkload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.workload_dir = os.path.join(self.temp_dir, 'workload')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_recorder_captures_new_versions(self):
+        path = os.path.join(self.temp_dir, 'data.xml')
+        with open(path, 'wb') as f:
+            f.write(document(0))
+        recorder = WorkloadRecorder(path, self.workload_dir)
+        with open(path, 'wb') as f:
+            f.write(document(1))
+        recorder.dispatch(FileEvent('modified', path))
+        # Evento repetido sem conteúdo novo e evento de outro arquivo
+        recorder.dispatch(FileEvent('modified', path))
+        recorder.dispatch(FileEvent('modified', os.path.join(self.temp_dir, 'outro.xml')))
+        recorder.dispatch(FileEvent('moved', path, path + '.bak'))
+        recorder.save()
+
+        manifest = load_workload(self.workload_dir)
+        self.assertEqual(manifest['initial'], 'v00000.xml')
+        self.assertEqual(
+            [(step['event'], step['version']) for step in manifest['steps']],
+            [('modified', 'v00001.xml'), ('modified', None), ('deleted', None)]
+        )
+        with open(os.path.join(self.workload_dir, 'v00001.xml'), 'rb') as f:
+            self.assertEqual(f.read(), document(1))
+
+    def test_invalid_workload(self):
+        write_workload(self.workload_dir, [document(0), document(1)], 1.0)
+        manifest_path = os.path.join(self.workload_dir, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['steps'][0]['event'] = 'renamed'
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        with self.assertRaises(Exception):
+            load_workload(self.workload_dir)
+
+    def test_fast_replay_is_deterministic(self):
+        """Sem espera real, cada salvamento gera uma notificação, com salvamentos atômicos e rajadas"""
+        versions = [document(value) for value in range(30)]
+        write_workload(self.workload_dir, versions, interval=1.0, events_per_save=3, event='moved')
+        summaries = [
+            WorkloadReplayer(self.workload_dir, os.path.join(self.temp_dir, f'run{run}', 'data.xml')).run()
+            for run in range(2)
+        ]
+        for summary in summaries:
+            self.assertEqual(summary['mode'], 'virtual')
+            self.assertEqual(summary['notifications'], 29)
+            self.assertEqual(summary['changes'], 29)
+            self.assertEqual(summary['errors'], 0)
+            # 29 s de carga reproduzidos sem esperar o debounce nem os intervalos
+            self.assertLess(summary['wall_seconds'], 10)
+            self.assertGreaterEqual(summary['latency_ms']['debounce']['p50'], 100)
+        self.assertEqual(summaries[0]['changes'], summaries[1]['changes'])
+
+    def test_saves_faster_than_debounce_are_coalesced(self):
+        # Menos eventos que o buffer do handler (que dispara cheio, sem esperar o debounce)
+        versions = [document(value) for value in range(5)]
+        write_workload(self.workload_dir, versions, interval=0.01)
+        summary = WorkloadReplayer(
+            self.workload_dir, os.path.join(self.temp_dir, 'run', 'data.xml'), debounce_seconds=0.5
+        ).run()
+        self.assertEqual(summary['notifications'], 1)
+
+    def test_real_speed_replay(self):
+        versions = [document(value) for value in range(4)]
+        write_workload(self.workload_dir, versions, interval=0.4)
+        summary = WorkloadReplayer(
+            self.workload_dir, os.path.join(self.temp_dir, 'run', 'data.xml'), speed=2.0
+        ).run()
+        self.assertEqual(summary['mode'], '2x')
+        self.assertEqual(summary['notifications'], 3)
+        self.assertGreaterEqual(summary['wall_seconds'], 0.6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import re
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.search_index import SearchIndex, MAX_GRAM_TERM
+
+def element(xpath, value, modified=False):
+    return {'xpath': xpath, 'tag': xpath.rsplit('/', 1)[-1].split('[')[0], 'value': value, 'modified': modified}
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.load([
+            element('/root', ''),
+            element('/root/Item[1]', 'Alpha'),
+            element('/root/Item[2]', 'beta', modified=True),
+            element('/root/price', '10.50'),
+            element('/root/note', 'x' * MAX_GRAM_TERM + 'needle'),
+        ])
+
+    def test_substring_search_by_field(self):
+        """A busca ignora maiúsculas e respeita o campo escolhido"""
+        self.assertEqual(self.index.search('ite'), {'/root/Item[1]', '/root/Item[2]'})
+        self.assertEqual(self.index.search('alp', fields=('value',)), {'/root/Item[1]'})
+        self.assertEqual(self.index.search('item[2', fields=('xpath',)), {'/root/Item[2]'})
+        self.assertEqual(self.index.search('needle', fields=('value',)), {'/root/note'})
+        self.assertEqual(self.index.search('zzz', fields=('tag', 'value', 'xpath')), set())
+
+    def test_regex_and_changed_only(self):
+        """Expressões regulares e o filtro de alterados"""
+        self.assertEqual(self.index.search(r'^\d+\.\d+$', fields=('value',), regex=True), {'/root/price'})
+        self.assertEqual(self.index.search('item', changed_only=True), {'/root/Item[2]'})
+        with self.assertRaises(re.error):
+            self.index.search('(', regex=True)
+
+    def test_delta_updates(self):
+        """O índice acompanha os deltas do grid sem recarga"""
+        version = self.index.version
+        self.index.apply_delta({
+            'upserts': [(element('/root/price', '12.00', modified=True), '/root/Item[2]'),
+                        (element('/root/extra', 'gamma', modified=True), '/root/price')],
+            'removals': ['/root/Item[1]'],
+        })
+        self.assertGreater(self.index.version, version)
+        self.assertEqual(self.index.search('10.5', fields=('value',)), set())
+        self.assertEqual(self.index.search('12.0', fields=('value',)), {'/root/price'})
+        self.assertEqual(self.index.search('alpha', fields=('value',)), set())
+        self.assertEqual(self.index.search('', fields=('value',)), set())
+        self.assertEqual(self.index.search('mm', fields=('value',), changed_only=True), {'/root/extra'})
+        self.assertEqual(len(self.index), 5)
+
+    def test_repeated_search_uses_cache(self):
+        """A mesma consulta é servida do cache até o índice mudar"""
+        first = self.index.search('item')
+        first.clear()  # O resultado devolvido pode ser alterado sem afetar o cache
+        self.assertEqual(self.index.search('item'), {'/root/Item[1]', '/root/Item[2]'})
+        self.assertEqual(self.index._results.stats()['hits'], 1)
+
+        self.index.apply_delta({'upserts': [], 'removals': ['/root/Item[1]']})
+        self.assertEqual(self.index.search('item'), {'/root/Item[2]'})
+
+    def test_result_cache_is_bounded_in_bytes(self):
+        """Resultados que casam quase o documento inteiro não ficam retidos no cache"""
+        index = SearchIndex(result_cache_bytes=64 * 1024)
+        index.load([element(f'/root/item[{i}]', f'v{i}') for i in range(20_000)])
+        self.assertEqual(len(index.search('item')), 20_000)
+        self.assertEqual(index.search('v12345', fields=('value',)), {'/root/item[12345]'})
+        stats = index._results.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertLessEqual(stats['bytes'], 64 * 1024)
+        self.assertEqual(stats['evictions'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.text_diff import diff_sequences, diff_text, DiffBudget, DiffCancelled, DEFAULT_LINE_WIDTH
+
+def apply_opcodes(a, b, opcodes):
+    """Reconstrói b a partir dos opcodes, conferindo os trechos iguais"""
+    result = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+        result.extend(b[j1:j2])
+    return result
+
+def lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+class TestDiffSequences(unittest.TestCase):
+    def test_opcodes_are_minimal(self):
+        """Os opcodes reconstroem o destino e mantêm a maior subsequência comum"""
+        rng = random.Random(7)
+        for _ in range(500):
+            a = [rng.choice('abc') for _ in range(rng.randint(0, 12))]
+            b = [rng.choice('abc') for _ in range(rng.randint(0, 12))]
+            opcodes = diff_sequences(a, b)
+            self.assertEqual(apply_opcodes(a, b, opcodes), b)
+            equal = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == 'equal')
+            self.assertEqual(equal, lcs_length(a, b))
+
+    def test_opcode_tags(self):
+        """Trechos sem igualdade são agrupados em replace/insert/delete"""
+        self.assertEqual(diff_sequences('abc', 'axc'),
+                         [('equal', 0, 1, 0, 1), ('replace', 1, 2, 1, 2), ('equal', 2, 3, 2, 3)])
+        self.assertEqual(diff_sequences('', 'ab'), [('insert', 0, 0, 0, 2)])
+        self.assertEqual(diff_sequences('ab', ''), [('delete', 0, 2, 0, 0)])
+
+    def test_cancellation(self):
+        """O diff é interrompido quando o callback de cancelamento retorna True"""
+        rng = random.Random(3)
+        a = [rng.random() for _ in range(2000)]
+        b = [rng.random() for _ in range(2000)]
+        with self.assertRaises(DiffCancelled):
+            diff_sequences(a, b, cancelled=lambda: True)
+
+    def test_budget_falls_back_to_replace(self):
+        """Com o budget esgotado, o trecho não resolvido vira um único replace"""
+        rng = random.Random(11)
+        a = ['p'] + [rng.random() for _ in range(3000)] + ['s']
+        b = ['p'] + [rng.random() for _ in range(3000)] + ['s']
+        budget = DiffBudget(max_work=1000)
+        opcodes = diff_sequences(a, b, budget=budget)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('replace', 1, 3001, 1, 3001), ('equal', 3001, 3002, 3001, 3002)])
+        self.assertEqual(apply_opcodes(a, b, opcodes), b)
+
+class TestDiffText(unittest.TestCase):
+    def test_line_and_char_level(self):
+        """Linhas substituídas trazem os trechos de caracteres alterados"""
+        rows = diff_text('a\nvalor=10\nc', 'a\nvalor=12\nc\nd')
+        self.assertEqual([row.kind for row in rows], ['equal', 'replace', 'equal', 'insert'])
+        self.assertEqual(rows[1].old_spans, [(7, 8)])
+        self.assertEqual(rows[1].new_spans, [(7, 8)])
+        self.assertEqual(rows[3].new, 'd')
+
+    def test_unchanged_regions_are_collapsed(self):
+        """Linhas iguais longe das alterações viram um único marcador"""
+        old = '\n'.join(f'linha {i}' for i in range(1000))
+        new = old.replace('linha 500', 'linha quinhentos')
+        rows = diff_text(old, new, context=2)
+        self.assertEqual([row.kind for row in rows],
+                         ['skip', 'equal', 'equal', 'replace', 'equal', 'equal', 'skip'])
+        self.assertEqual(rows[0].skipped, 498)
+        self.assertEqual(rows[-1].skipped, 497)
+
+    def test_long_single_line_value(self):
+        """Um valor de uma linha só, com megabytes, é quebrado em pedaços e só o trecho alterado é comparado"""
+        rng = random.Random(5)
+        old = ''.join(rng.choice('ABCDEFGH0123456789+/') for _ in range(2_000_000))
+        new = old[:1_000_000] + '==' + old[1_000_005:]
+        rows = diff_text(old, new)
+        changed = [row for row in rows if row.kind != 'equal' and row.kind != 'skip']
+        self.assertEqual(len(changed), 1)
+        self.assertTrue(all(len(row.old or '') <= DEFAULT_LINE_WIDTH for row in rows))
+        self.assertEqual(changed[0].old_spans, [(1_000_000 % DEFAULT_LINE_WIDTH, 1_000_000 % DEFAULT_LINE_WIDTH + 5)])
+
+    def test_different_values_are_bounded(self):
+        """Valores totalmente diferentes terminam dentro do budget, com todas as linhas marcadas"""
+        rng = random.Random(13)
+        old = '\n'.join(''.join(rng.choice('abcdef') for _ in range(40)) for _ in range(5000))
+        new = '\n'.join(''.join(rng.choice('uvwxyz') for _ in range(40)) for _ in range(5000))
+        budget = DiffBudget(max_work=50_000)
+        rows = diff_text(old, new, budget=budget)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(len(rows), 5000)
+        self.assertTrue(all(row.kind == 'replace' and row.old_spans == [(0, 40)] for row in rows))
+
+    def test_identical_values(self):
+        """Valores iguais não produzem linhas alteradas"""
+        rows = diff_text('x\ny', 'x\ny')
+        self.assertTrue(all(row.kind == 'equal' for row in rows))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.tk_bridge import TkBridge
+
+class FakeWidget:
+    """Registra as chamadas a after sem depender de um display"""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, ident):
+        self.scheduled = [entry for i, entry in enumerate(self.scheduled, 1) if f"after#{i}" != ident]
+
+    def run_one(self):
+        ms, func = self.scheduled.pop(0)
+        func()
+        return ms
+
+class TestTkBridge(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.bridge = TkBridge(self.widget, budget_ms=50, min_batch=8, max_batch=64)
+        self.bridge.start()
+
+    def test_posts_from_threads_run_on_poll(self):
+        """Chamadas publicadas por várias threads rodam no poll, na ordem de cada thread"""
+        calls = []
+        def producer(n):
+            for i in range(10):
+                self.bridge.post(calls.append, (n, i))
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [])
+        
+        while self.bridge.queue_depth:
+            self.widget.run_one()
+        self.assertEqual(len(calls), 40)
+        for n in range(4):
+            self.assertEqual([i for m, i in calls if m == n], list(range(10)))
+
+    def test_batch_adapts_to_budget(self):
+        """O lote cresce enquanto há folga no orçamento e diminui quando estoura"""
+        for _ in range(1000):
+            self.bridge.post(lambda: None)
+        delays = [self.widget.run_one() for _ in range(4)]
+        self.assertEqual(self.bridge.batch_size, 64)
+        # Com a fila cheia o próximo poll é imediato
+        self.assertEqual(delays[1:], [1, 1, 1])
+        
+        for _ in range(20):
+            self.bridge.post(time.sleep, 0.01)
+        self.bridge.drain(limit=1000)
+        self.widget.run_one()
+        self.assertLess(self.bridge.batch_size, 64)
+
+    def test_errors_do_not_stop_the_queue(self):
+        """Uma chamada com erro não impede as seguintes"""
+        calls = []
+        self.bridge.post(lambda: 1 / 0)
+        self.bridge.post(calls.append, 'ok')
+        self.assertEqual(self.bridge.drain(), 2)
+        self.assertEqual(calls, ['ok'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import tempfile
+import shutil
+import threading
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.tracing import ChangeTrace, LatencyTracker, TracedSubmitter, record_coalesced
+from utils.worker_pool import WorkerPool
+from utils.xml_parser import XMLParser
+from watcher.xml_monitor import XMLFileHandler
+
+MS = 1_000_000
+
+def make_trace(**marks_ms):
+    trace = ChangeTrace()
+    for name, value in marks_ms.items():
+        trace.mark(name, int(value * MS))
+    return trace
+
+class TestChangeTrace(unittest.TestCase):
+    def test_durations_between_present_marks(self):
+        """Cada etapa vai do marco anterior presente até o seu; ausentes são pulados"""
+        trace = make_trace(fs_event=0, debounce=100, read=102, extract=110, apply=125)
+        self.assertEqual(trace.durations_ms(), {
+            'debounce': 100.0, 'read': 2.0, 'extract': 8.0, 'apply': 15.0, 'total': 125.0
+        })
+        self.assertTrue(trace.summary().startswith('debounce 100.0 ms, read 2.0 ms'))
+
+    def test_single_mark_has_no_durations(self):
+        self.assertEqual(make_trace(fs_event=5).durations_ms(), {})
+
+    def test_coalesced_trace_has_no_total(self):
+        """Uma versão descartada termina em 'coalesced' e não entra no total das aplicadas"""
+        trace = make_trace(fs_event=0, debounce=100, diff=110, coalesced=140)
+        self.assertEqual(trace.durations_ms(), {'debounce': 100.0, 'diff': 10.0, 'coalesced': 30.0})
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_rolling_percentiles(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 201):
+            tracker.record(make_trace(fs_event=0, debounce=value))
+        stats = tracker.percentiles()['debounce']
+        self.assertEqual(stats['count'], 200)
+        self.assertEqual(stats['window'], 100)
+        # Só as últimas 100 amostras (101..200) entram nos percentis
+        self.assertEqual(stats['p50'], 151.0)
+        self.assertEqual(stats['max'], 200.0)
+        self.assertEqual(len(tracker.recent()), 100)
+
+    def test_over_budget(self):
+        tracker = LatencyTracker()
+        for _ in range(10):
+            tracker.record(make_trace(fs_event=0, debounce=100, read=150, parse=151))
+        self.assertEqual(tracker.over_budget({'debounce': 200, 'read': 20, 'parse': 5}), {'read': 50.0})
+
+    def test_concurrent_record(self):
+        tracker = LatencyTracker()
+
+        def worker():
+            for _ in range(500):
+                tracker.record(make_trace(fs_event=0, debounce=1))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(tracker.percentiles()['debounce']['count'], 2000)
+
+class TestTracedSubmitter(unittest.TestCase):
+    def test_superseded_job_trace_is_recorded(self):
+        """O trace do job pendente substituído no pool é registrado como 'coalesced'"""
+        tracker = LatencyTracker()
+        pool = WorkerPool(max_workers=1)
+        submitter = TracedSubmitter(pool, tracker)
+        started, release = threading.Event(), threading.Event()
+        ran = []
+
+        def job(name):
+            started.set()
+            release.wait(5.0)
+            ran.append(name)
+
+        try:
+            traces = [make_trace(fs_event=0, debounce=value) for value in (10, 20, 30)]
+            self.assertTrue(submitter.submit('f', traces[0], job, 'a'))
+            self.assertTrue(started.wait(5.0))
+            # 'b' fica pendente enquanto 'a' roda e é substituído por 'c'
+            self.assertTrue(submitter.submit('f', traces[1], job, 'b'))
+            self.assertFalse(submitter.submit('f', traces[2], job, 'c'))
+            release.set()
+            self.assertTrue(pool.wait_idle(5.0))
+        finally:
+            pool.shutdown()
+        self.assertEqual(ran, ['a', 'c'])
+        self.assertIn('coalesced', traces[1].marks)
+        self.assertNotIn('coalesced', traces[0].marks)
+        self.assertNotIn('coalesced', traces[2].marks)
+        self.assertEqual(tracker.percentiles()['coalesced']['count'], 1)
+
+    def test_record_coalesced(self):
+        tracker = LatencyTracker()
+        record_coalesced(make_trace(fs_event=0, debounce=100), tracker)
+        self.assertEqual(tracker.percentiles()['debounce']['count'], 1)
+        self.assertNotIn('total', tracker.percentiles())
+
+class TestPipelineMarks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'data.xml')
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>1</test></root>')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_handler_and_parser_marks(self):
+        """O handler marca evento, debounce e leitura; o parser marca parse, extração e diff"""
+        received = []
+        done = threading.Event()
+
+        def callback(data, info):
+            received.append(info)
+            done.set()
+
+        parser = XMLParser()
+        parser.parse_file_and_get_changes(self.file_path)
+        handler = XMLFileHandler(self.file_path, callback, debounce_seconds=0.05)
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>2</test></root>')
+        handler._add_event('modified')
+        self.assertTrue(done.wait(5.0))
+
+        trace = received[0]['trace']
+        self.assertEqual(list(trace.marks), ['fs_event', 'debounce', 'read'])
+        parser.parse_file_and_get_changes(self.file_path, trace)
+        trace.mark('apply')
+        durations = trace.durations_ms()
+        self.assertEqual(list(durations), ['debounce', 'read', 'parse', 'extract', 'diff', 'apply', 'total'])
+        self.assertGreaterEqual(durations['debounce'], 40)
+        self.assertTrue(all(value >= 0 for value in durations.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from gui.grid_model import GridRowModel, GridDeltaBuilder
+from gui.tree_model import TreeRowSource
+
+def element(xpath, value='', modified=False, initial=None):
+    data = {'xpath': xpath, 'tag': xpath.rsplit('/', 1)[-1], 'value': value,
+            'parent_number': 1, 'modified': modified}
+    if initial is not None:
+        data['initial_value'] = initial
+    return data
+
+class TestTreeRowSource(unittest.TestCase):
+    def setUp(self):
+        self.initial = [
+            element('/root'),
+            element('/root/a'),
+            element('/root/a/x', '1'),
+            element('/root/a/y', '2', modified=True, initial='1'),
+            element('/root/b'),
+            element('/root/b/@id', '7'),
+        ]
+        self.model = GridRowModel()
+        self.model.load(self.initial)
+        self.builder = GridDeltaBuilder()
+        self.builder.reset(self.initial)
+        self.tree = TreeRowSource(self.model)
+        self.tree.rebuild()
+
+    def visible(self):
+        return [self.tree.xpath_at(i) for i in range(len(self.tree))]
+
+    def apply(self, data, last_changes):
+        delta, version = self.builder.build(data, last_changes)
+        self.assertIsNotNone(delta)
+        self.model.apply_delta(delta)
+        self.tree.apply_delta(delta)
+        self.builder.commit(version)
+
+    def test_starts_with_top_level_only(self):
+        """Apenas o nível superior é materializado ao abrir o documento"""
+        self.assertEqual(self.visible(), ['/root'])
+        self.assertTrue(self.tree.is_expandable('/root'))
+        self.assertFalse(self.tree.is_expandable('/root/a/x'))
+
+    def test_expand_and_collapse(self):
+        """Expandir insere só os filhos diretos; recolher remove toda a subárvore visível"""
+        self.tree.toggle(0)
+        self.assertEqual(self.visible(), ['/root', '/root/a', '/root/b'])
+        self.tree.expand('/root/a')
+        self.assertEqual(self.visible(), ['/root', '/root/a', '/root/a/x', '/root/a/y', '/root/b'])
+        self.tree.toggle(0)
+        self.assertEqual(self.visible(), ['/root'])
+        # Reabrir restaura os nós que já estavam expandidos
+        self.tree.toggle(0)
+        self.assertEqual(len(self.tree), 5)
+
+    def test_changed_descendants_bubble_up(self):
+        """Ancestrais recolhidos indicam quantos descendentes foram alterados"""
+        self.assertEqual(self.tree.changed_below, {'/root': 1, '/root/a': 1})
+        self.assertIn('changed_below', self.tree.row_tags(0))
+        self.assertIn('(1 alteração(ões))', self.tree.row_values(0)[1])
+        self.tree.expand('/root')
+        self.assertNotIn('changed_below', self.tree.row_tags(0))
+
+    def test_reveal_expands_ancestors(self):
+        """reveal abre os ancestrais e retorna a posição do nó"""
+        self.assertIsNone(self.tree.position_of('/root/a/y'))
+        self.assertEqual(self.tree.reveal('/root/a/y'), 3)
+        self.assertEqual(self.tree.xpath_at(3), '/root/a/y')
+        self.assertIsNone(self.tree.reveal('/root/z'))
+
+    def test_positions_follow_expand_and_collapse(self):
+        """position_of acompanha as mudanças da lista visível"""
+        self.assertEqual(self.tree.position_of('/root'), 0)
+        self.assertIsNone(self.tree.position_of('/root/b'))
+        self.tree.expand('/root')
+        self.tree.expand('/root/a')
+        self.assertEqual(self.tree.position_of('/root/b'), 4)
+        self.tree.collapse('/root/a')
+        self.assertEqual(self.tree.position_of('/root/b'), 2)
+        self.assertIsNone(self.tree.position_of('/root/a/x'))
+        for position in range(len(self.tree)):
+            self.assertEqual(self.tree.position_of(self.tree.xpath_at(position)), position)
+
+    def test_delta_updates_hierarchy(self):
+        """Deltas inserem nós entre os irmãos e ajustam as contagens"""
+        self.tree.expand('/root')
+        self.tree.expand('/root/b')
+        data = list(self.initial)
+        data[3] = element('/root/a/y', '1')
+        data.insert(5, element('/root/b/c', '3', modified=True))
+        self.apply(data, [{'xpath': '/root/a/y'}, {'xpath': '/root/b/c'}])
+        self.assertEqual(self.visible(), ['/root', '/root/a', '/root/b', '/root/b/c', '/root/b/@id'])
+        self.assertEqual(self.tree.changed_below, {'/root': 1, '/root/b': 1})
+
+        self.apply(self.initial, [{'xpath': '/root/b/c'}, {'xpath': '/root/a/y'}])
+        self.assertEqual(self.visible(), ['/root', '/root/a', '/root/b', '/root/b/@id'])
+        self.assertEqual(self.tree.changed_below, {'/root': 1, '/root/a': 1})
+
+    def test_namespaced_root(self):
+        """A raiz '/nfeProc' agrupa os filhos escritos pelo getpath como '/*/...'"""
+        data = [
+            element('/nfeProc'),
+            element('/nfeProc/@versao', '4.00'),
+            element('/*/*[1]'),
+            element('/*/*[1]/*[1]', '1', modified=True, initial='0'),
+            element('/*/*[2]', '2'),
+        ]
+        model = GridRowModel()
+        model.load(data)
+        tree = TreeRowSource(model)
+        tree.rebuild()
+        visible = lambda: [tree.xpath_at(i) for i in range(len(tree))]
+        self.assertEqual(visible(), ['/nfeProc'])
+        self.assertEqual(tree.changed_below, {'/nfeProc': 1, '/*/*[1]': 1})
+
+        tree.expand('/nfeProc')
+        self.assertEqual(visible(), ['/nfeProc', '/nfeProc/@versao', '/*/*[1]', '/*/*[2]'])
+        tree.expand('/*/*[1]')
+        self.assertEqual(len(tree), 5)
+        tree.collapse('/nfeProc')
+        self.assertEqual(visible(), ['/nfeProc'])
+        self.assertEqual(tree.reveal('/*/*[1]/*[1]'), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'benchmarks'))
+
+from gui.view_model import GridViewModel, VIEW_MODE_TREE, VIEW_MODE_CHANGES
+
+def element(xpath, value='', modified=False, initial=None):
+    data = {'xpath': xpath, 'tag': xpath.rsplit('/', 1)[-1], 'value': value,
+            'parent_number': 1, 'modified': modified}
+    if initial is not None:
+        data['initial_value'] = initial
+    return data
+
+class TestGridViewModel(unittest.TestCase):
+    def setUp(self):
+        self.initial = [element('/root'), element('/root/a', '1'), element('/root/b', '2'), element('/root/c', '3')]
+        self.model = GridViewModel()
+        self.model.load(self.initial)
+        self.model.delta_builder.reset(self.initial)
+
+    def update(self, data, last_changes):
+        delta, version = self.model.delta_builder.build(data, last_changes)
+        self.model.apply_delta(delta)
+        self.model.delta_builder.commit(version)
+
+    def test_navigation_and_target(self):
+        """Navegação circular entre alterações e alvo de rolagem após o delta"""
+        data = [element('/root'), element('/root/a', '9', True, '1'), element('/root/b', '2'),
+                element('/root/c', '8', True, '3')]
+        self.update(data, [{'xpath': '/root/a'}, {'xpath': '/root/c'}])
+        self.assertEqual(self.model.change_target([{'xpath': '/root/c'}]), 3)
+        self.assertEqual(self.model.step_change('down').xpath, '/root/a')
+        self.assertEqual(self.model.step_change('down').xpath, '/root/c')
+        self.assertEqual(self.model.step_change('down').xpath, '/root/a')
+        self.model.reset_navigation()
+        self.assertEqual(self.model.step_change('up').xpath, '/root/c')
+
+    def test_view_modes_share_rows(self):
+        """Os modos de visualização leem o mesmo modelo e mantêm as posições coerentes"""
+        data = [element('/root'), element('/root/a', '1'), element('/root/b', '5', True, '2'), element('/root/c', '3')]
+        self.update(data, [{'xpath': '/root/b'}])
+        self.assertTrue(self.model.set_view_mode(VIEW_MODE_CHANGES))
+        self.assertEqual(len(self.model.source), 1)
+        self.assertEqual(self.model.xpath_at(0), '/root/b')
+        self.assertTrue(self.model.set_view_mode(VIEW_MODE_TREE))
+        self.assertEqual(len(self.model.source), 1)
+        self.assertEqual(self.model.reveal('/root/b'), 2)
+        self.assertFalse(self.model.set_view_mode(VIEW_MODE_TREE))
+
+    def test_search_state(self):
+        """A busca destaca o resultado atual e continua dele após atualizações"""
+        options = {'fields': ('xpath',)}
+        self.assertEqual(self.model.search('/root/', 'down', options), 3)
+        self.assertEqual(self.model.current_search_result, '/root/a')
+        self.assertEqual(self.model.rows.highlighted, {'/root/a'})
+        self.assertEqual(self.model.search('/root/', 'down', options), 3)
+        self.assertEqual(self.model.current_search_result, '/root/b')
+
+        data = [element('/root'), element('/root/a', '1'), element('/root/b', '2'),
+                element('/root/c', '3'), element('/root/d', '4', True)]
+        self.update(data, [{'xpath': '/root/d'}])
+        self.assertEqual(self.model.search('/root/', 'down', options), 4)
+        self.assertEqual(self.model.current_search_result, '/root/c')
+        self.assertIsNone(self.model.search('(', 'live', {'regex': True}))
+        self.model.clear_search()
+        self.assertEqual(self.model.rows.highlighted, set())
+
+    def test_render_window(self):
+        """A janela visível traz os valores e tags que o grid escreveria"""
+        self.model.rows.highlighted = {'/root/b'}
+        window = self.model.render_window(1, 2)
+        self.assertEqual([values[4] for values, _ in window], ['/root/a', '/root/b'])
+        self.assertEqual(window[1][1], ('search_result',))
+
+    def test_clear_invalidates_generation(self):
+        """Limpar o grid invalida deltas calculados na geração anterior"""
+        generation = self.model.generation
+        self.model.clear()
+        self.assertNotEqual(self.model.generation, generation)
+        self.assertEqual(len(self.model.rows), 0)
+
+class TestViewModelBenchmark(unittest.TestCase):
+    def test_benchmark_runs_headless(self):
+        """O benchmark roda sem display e reporta o custo de cada tamanho de diff"""
+        import bench_view_model
+        results = bench_view_model.run(300, [1, 20], rounds=2, mode=VIEW_MODE_TREE)
+        self.assertEqual([result['changes'] for result in results], [1, 20])
+        self.assertTrue(all(result['apply_median_ms'] >= 0 for result in results))
+
+if __name__ == '__main__':
+    unittest.main()
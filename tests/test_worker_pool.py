@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.worker_pool import WorkerPool
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_latest_wins(self):
+        """Envios superados enquanto o job está em execução são descartados"""
+        started = threading.Event()
+        release = threading.Event()
+        executed = []
+
+        def job(version):
+            if version == 0:
+                started.set()
+                release.wait(2.0)
+            executed.append(version)
+
+        self.pool.submit('a.xml', job, 0)
+        self.assertTrue(started.wait(2.0))
+        for version in range(1, 6):
+            self.pool.submit('a.xml', job, version)
+
+        self.assertEqual(self.pool.queue_depth, 1)
+        release.set()
+        self.assertTrue(self.pool.wait_idle(2.0))
+
+        self.assertEqual(executed, [0, 5])
+        stats = self.pool.stats()
+        self.assertEqual(stats['dropped'], 4)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_per_key_serialization(self):
+        """Jobs da mesma chave nunca executam em paralelo"""
+        active = {'count': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                active['count'] += 1
+                active['max'] = max(active['max'], active['count'])
+            time.sleep(0.005)
+            with lock:
+                active['count'] -= 1
+
+        for _ in range(50):
+            self.pool.submit('a.xml', job)
+            time.sleep(0.001)
+
+        self.assertTrue(self.pool.wait_idle(2.0))
+        self.assertEqual(active['max'], 1)
+
+    def test_bounded_workers_under_burst(self):
+        """Produtor a 50 escritas/s em vários arquivos não cria threads extras"""
+        processed = []
+
+        def job(key, version):
+            time.sleep(0.03)
+            processed.append((key, version))
+
+        start = time.time()
+        for version in range(25):
+            for key in ('a.xml', 'b.xml', 'c.xml'):
+                self.pool.submit(key, job, key, version)
+            time.sleep(0.02)
+
+        self.assertTrue(self.pool.wait_idle(2.0))
+        elapsed = time.time() - start
+        stats = self.pool.stats()
+
+        self.assertLessEqual(stats['workers'], 2)
+        self.assertEqual(stats['submitted'], stats['completed'] + stats['dropped'])
+        # A última versão de cada arquivo sempre é processada
+        for key in ('a.xml', 'b.xml', 'c.xml'):
+            self.assertIn((key, 24), processed)
+        self.assertLess(elapsed, 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+import time
+import threading
+
+# Adiciona o diretório src ao PYTHONPATH (mesmo layout usado por main.py)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from watchdog.events import FileSystemEventHandler
+from watcher.xml_monitor import XMLFileMonitor, StatPoller, _PollEntry
+
+class TestAtomicSave(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'data.xml')
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>1</test></root>')
+        self.monitor = XMLFileMonitor()
+        self.calls = []
+        self.event = threading.Event()
+
+    def tearDown(self):
+        self.monitor.stop_monitoring()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def callback(self, data, info=None):
+        self.calls.append(info)
+        self.event.set()
+
+    def wait_calls(self, timeout=2.0):
+        self.event.wait(timeout)
+        # Janela extra para eventos atrasados do mesmo salvamento
+        time.sleep(0.5)
+
+    def test_replace_by_rename(self):
+        """Arquivo temporário renomeado sobre o alvo gera uma única notificação"""
+        self.monitor.start_monitoring(self.file_path, self.callback)
+        time.sleep(0.1)
+
+        tmp_path = os.path.join(self.temp_dir, '.data.xml.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>2</test></root>')
+        os.replace(tmp_path, self.file_path)
+
+        self.wait_calls()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.calls[0]['event_type'], 'replaced')
+        self.assertTrue(self.calls[0]['replaced'])
+
+    def test_delete_and_recreate(self):
+        """Exclusão seguida de recriação é tratada como um único salvamento"""
+        self.monitor.start_monitoring(self.file_path, self.callback)
+        time.sleep(0.1)
+
+        os.remove(self.file_path)
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>3</test></root>')
+
+        self.wait_calls()
+        self.assertEqual(len(self.calls), 1)
+
+    def test_unrelated_files_ignored(self):
+        """Eventos de outros arquivos do diretório não disparam o callback"""
+        self.monitor.start_monitoring(self.file_path, self.callback)
+        time.sleep(0.1)
+
+        with open(os.path.join(self.temp_dir, 'other.xml'), 'w') as f:
+            f.write('<root/>')
+
+        self.wait_calls(timeout=0.3)
+        self.assertEqual(self.calls, [])
+
+class TestStatPoller(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'data.xml')
+        with open(self.file_path, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>1</test></root>')
+        self.calls = []
+        self.event = threading.Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def callback(self, data, info=None):
+        self.calls.append(info)
+        self.event.set()
+
+    def test_polling_backend_feeds_handler(self):
+        """O backend de polling dispara o mesmo callback do observer nativo"""
+        monitor = XMLFileMonitor(backend='polling', min_poll_interval=0.05)
+        monitor.start_monitoring(self.file_path, self.callback)
+        try:
+            self.assertTrue(monitor.uses_polling)
+            time.sleep(0.1)
+            with open(self.file_path, 'w') as f:
+                f.write('<?xml version="1.0"?><root><test>22</test></root>')
+            self.assertTrue(self.event.wait(2.0))
+            self.assertEqual(self.calls[0]['event_type'], 'modified')
+        finally:
+            monitor.stop_monitoring()
+
+    def test_idle_interval_backoff(self):
+        """O intervalo cresce enquanto o arquivo está ocioso e volta ao mínimo ao mudar"""
+        poller = StatPoller(backoff=2.0)
+        events = []
+
+        class Handler(FileSystemEventHandler):
+            def on_modified(self, event):
+                events.append(event)
+
+        handler = Handler()
+        poller.add(self.file_path, handler, min_interval=0.01, max_interval=0.08)
+        try:
+            time.sleep(0.4)
+            entry = next(iter(poller._entries.values()))
+            self.assertEqual(entry.interval, 0.08)
+
+            with open(self.file_path, 'a') as f:
+                f.write('<!-- changed -->')
+            deadline = time.time() + 2.0
+            while not events and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(events), 1)
+            self.assertLess(entry.interval, 0.08)
+        finally:
+            poller.remove(self.file_path, handler)
+
+    def test_scandir_and_stat_signatures_mix(self):
+        """Assinaturas sem inode (scandir no Windows) e com inode (os.stat) não geram eventos falsos"""
+        poller = StatPoller(backoff=2.0)
+        events = []
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                events.append(event.event_type)
+
+        entry = _PollEntry(self.file_path, Handler(), min_interval=0.01, max_interval=0.08)
+        entry.signature = poller._stat_signature(self.file_path)
+        st = os.stat(self.file_path)
+        for signature in ((0, st.st_size, st.st_mtime_ns), poller._stat_signature(self.file_path),
+                          (0, st.st_size, st.st_mtime_ns)):
+            poller._check_entry(entry, signature)
+        self.assertEqual(events, [])
+        self.assertEqual(entry.interval, 0.08)
+
+        # Troca de inode com os dois lados conhecidos continua sendo detectada
+        replacement = self.file_path + '.tmp'
+        with open(replacement, 'w') as f:
+            f.write('<?xml version="1.0"?><root><test>2</test></root>')
+        os.replace(replacement, self.file_path)
+        poller._check_entry(entry, poller._stat_signature(self.file_path))
+        self.assertEqual(events, ['moved'])
+        self.assertEqual(entry.interval, 0.01)
+
+    def test_many_idle_files(self):
+        """Milhares de arquivos ociosos são varridos sem manter a thread ocupada"""
+        poller = StatPoller()
+        handler = FileSystemEventHandler()
+        paths = []
+        for i in range(2000):
+            path = os.path.join(self.temp_dir, f'f{i}.xml')
+            with open(path, 'w') as f:
+                f.write('<root/>')
+            paths.append(path)
+            poller.add(path, handler, min_interval=0.05, max_interval=1.0)
+
+        try:
+            time.sleep(0.5)
+            sweeps_start = poller.sweeps
+            cpu_start = time.process_time()
+            time.sleep(1.0)
+            cpu_used = time.process_time() - cpu_start
+            # Sweeps ficam espaçados à medida que os intervalos crescem
+            self.assertLess(poller.sweeps - sweeps_start, 20)
+            self.assertLess(cpu_used, 0.3)
+        finally:
+            for path in paths:
+                poller.remove(path, handler)
+
+if __name__ == '__main__':
+    unittest.main()
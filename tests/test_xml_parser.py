@@ -147,6 +147,28 @@ class TestXMLParser(unittest.TestCase):
         finally:
             Path(file_path).unlink()
 
+    def test_xpaths_match_getpath(self):
+        """Os xpaths montados na extração são os mesmos do getpath do lxml, inclusive com namespaces"""
+        from lxml import etree
+        namespaced_xml = """<?xml version="1.0" encoding="UTF-8"?>
+        <root xmlns="urn:padrao" xmlns:p="urn:p" xmlns:q="urn:p">
+            <a/><p:a/><q:a/><b/>
+            <p:a><c/><c/></p:a>
+            <a xmlns=""><d/><d/><p:d/></a>
+            <a xmlns=""/>
+        </root>
+        """
+        file_path = self.create_temp_xml(namespaced_xml)
+        
+        try:
+            data, _ = self.parser.parse_file_and_get_changes(file_path)
+            tree = etree.parse(file_path)
+            expected = [tree.getpath(element) for element in tree.getroot().iterdescendants()]
+            xpaths = [elem['xpath'] for elem in data[1:] if '/@' not in elem['xpath']]
+            self.assertEqual(xpaths, expected)
+        finally:
+            Path(file_path).unlink()
+
 class TestXMLMonitor(unittest.TestCase):
     def setUp(self):
         self.monitor = XMLFileMonitor()
@@ -204,6 +226,9 @@ class TestGridView(unittest.TestCase):
         test_message = "Teste de mensagem"
         self.grid.log_message(test_message)
         
+        # O log é escrito no widget no próximo quadro
+        self.grid._log_scheduler.flush()
+        
         # Habilita a área de log para leitura
         self.grid.log_area.configure(state='normal')
         log_content = self.grid.log_area.get("1.0", tk.END)